@@ -0,0 +1,133 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.models import User
+
+ROLE_CLAIMS = ('role', 'is_staff', 'is_superuser')
+
+
+def get_role_flags_key(user_id) -> str:
+    return f'auth:role-flags:{user_id}'
+
+
+def get_role_flags(user_id) -> tuple:
+    """
+    Return the current ``(role, is_staff, is_superuser, is_active,
+    username)`` of a user, cached for ``AUTH_ROLE_FLAGS_TTL`` seconds and
+    forgotten whenever the user is saved. Returns ``None`` for unknown users.
+    """
+
+    key = get_role_flags_key(user_id)
+    flags = cache.get(key)
+    if flags is None:
+        flags = (
+            User.objects.filter(pk=user_id)
+            .values_list(*ROLE_CLAIMS, 'is_active', 'username')
+            .first()
+        )
+        if flags is not None:
+            cache.set(key, flags, timeout=settings.AUTH_ROLE_FLAGS_TTL)
+    return flags
+
+
+def forget_role_flags(user_id) -> None:
+    cache.delete(get_role_flags_key(user_id))
+
+
+def get_request_user(request) -> User:
+    """Return the ``User`` row behind the (possibly stateless) request user."""
+
+    if isinstance(request.user, User):
+        return request.user
+    return get_object_or_404(User, pk=request.user.pk)
+
+
+def get_author(request) -> User:
+    """
+    Return a ``User`` to set as the author of new content. For stateless
+    request users it is built from the user id and the current username
+    checked by ``StatelessRoleJWTAuthentication``, without a query.
+    """
+
+    if isinstance(request.user, User):
+        return request.user
+    return User.from_db(
+        DEFAULT_DB_ALIAS,
+        ('id', 'username'),
+        (request.user.pk, request.user.username),
+    )
+
+
+class RoleAccessToken(AccessToken):
+    """Access token carrying the username and role flags as claims."""
+
+    @classmethod
+    def for_user(cls, user: User) -> 'RoleAccessToken':
+        token = super().for_user(user)
+        token['username'] = user.username
+        for claim in ROLE_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class TokenRoleUser(TokenUser):
+    """
+    Lightweight user built from the claims of a ``RoleAccessToken``,
+    exposing the same role helpers as ``User``.
+    """
+
+    @cached_property
+    def role(self) -> str:
+        return self.token['role']
+
+    @property
+    def is_admin(self) -> bool:
+        return any(
+            (self.role == User.Role.ADMIN, self.is_superuser, self.is_staff)
+        )
+
+    @property
+    def is_moderator(self) -> bool:
+        return self.role == User.Role.MODERATOR
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, User):
+            return self.pk == other.pk
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        return super().__hash__()
+
+
+class StatelessRoleJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the role claims of the token instead of
+    loading the user row on every request.
+
+    The claims are checked against the user's current role flags, which are
+    cached for a short time, so a role change or deactivation takes effect
+    within ``AUTH_ROLE_FLAGS_TTL`` seconds. Tokens without role claims or
+    with outdated ones fall back to the regular database lookup. The
+    username claim of a renamed user is replaced with the current one.
+    """
+
+    def get_user(self, validated_token) -> User:
+        if not all(claim in validated_token for claim in ROLE_CLAIMS):
+            return super().get_user(validated_token)
+
+        user = TokenRoleUser(validated_token)
+        flags = get_role_flags(user.pk)
+        if flags is None or flags[:-1] != (
+            *(validated_token[claim] for claim in ROLE_CLAIMS),
+            True,
+        ):
+            return super().get_user(validated_token)
+        user.username = flags[-1]
+        return user
@@ -0,0 +1,136 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from reviews.models import Category, Genre
+
+
+class TitleRenderCache:
+    """
+    Cache of serialized title representations.
+
+    Entries are keyed by title id and a version number shared by all titles;
+    a single title is invalidated by deleting its entry, while changes that
+    affect many titles at once (renaming a genre or a category) bump the
+    version instead.
+    """
+
+    key_prefix = 'title-render'
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def version_key(self) -> str:
+        return f'{self.key_prefix}:version'
+
+    def get_version(self) -> int:
+        return cache.get_or_set(self.version_key, 1, timeout=None)
+
+    def make_key(self, title_id: int, version: int) -> str:
+        return f'{self.key_prefix}:{version}:{title_id}'
+
+    def get_many(self, title_ids) -> dict:
+        """Return the cached representations found for the given ids."""
+
+        version = self.get_version()
+        keys = {self.make_key(pk, version): pk for pk in title_ids}
+        found = {
+            keys[key]: data for key, data in cache.get_many(keys).items()
+        }
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, representations: dict) -> None:
+        version = self.get_version()
+        cache.set_many(
+            {
+                self.make_key(pk, version): data
+                for pk, data in representations.items()
+            },
+            timeout=settings.TITLE_RENDER_CACHE_TIMEOUT,
+        )
+
+    def invalidate(self, *title_ids: int) -> None:
+        version = self.get_version()
+        cache.delete_many([self.make_key(pk, version) for pk in title_ids])
+
+    def invalidate_all(self) -> None:
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, 1, timeout=None)
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'version': self.get_version(),
+        }
+
+
+title_render_cache = TitleRenderCache()
+
+
+class SlugCache:
+    """
+    Process-local map of slugs to the rows of a small, rarely changing
+    table, such as genres or categories.
+
+    The whole table is loaded at once and reloaded when it is invalidated
+    by a save or delete in this process, when a slug is missing, or after
+    ``SLUG_CACHE_TIMEOUT`` seconds to pick up changes made by other
+    processes.
+    """
+
+    field_names = ('id', 'name', 'slug')
+
+    def __init__(self, model) -> None:
+        self.model = model
+        self._rows = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_rows(self, reload: bool = False) -> dict:
+        rows = self._rows
+        expired = (
+            time.monotonic() - self._loaded_at > settings.SLUG_CACHE_TIMEOUT
+        )
+        if rows is None or expired or reload:
+            with self._lock:
+                rows = {
+                    values[2]: values
+                    for values in self.model.objects.values_list(
+                        *self.field_names
+                    )
+                }
+                self._rows = rows
+                self._loaded_at = time.monotonic()
+        return rows
+
+    def get_many(self, slugs) -> dict:
+        """Return model instances for those of the slugs that exist."""
+
+        rows = self.get_rows()
+        if any(slug not in rows for slug in slugs):
+            rows = self.get_rows(reload=True)
+        return {
+            slug: self.model.from_db(
+                DEFAULT_DB_ALIAS, self.field_names, rows[slug]
+            )
+            for slug in slugs
+            if slug in rows
+        }
+
+    def invalidate(self) -> None:
+        self._rows = None
+
+
+slug_caches = {model: SlugCache(model) for model in (Genre, Category)}
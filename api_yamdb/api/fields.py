@@ -0,0 +1,51 @@
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+from api.cache import slug_caches
+
+
+class CachedSlugManyRelatedField(serializers.ManyRelatedField):
+    """Many-to-many slug field resolving the whole list in one lookup."""
+
+    def to_internal_value(self, data) -> list:
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        return self.child_relation.to_internal_values(data)
+
+
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """
+    Slug field resolving genres and categories through the process-local
+    slug cache instead of querying the database for every slug.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(slug_field='slug', **kwargs)
+
+    @classmethod
+    def many_init(cls, *args, **kwargs) -> CachedSlugManyRelatedField:
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return CachedSlugManyRelatedField(**list_kwargs)
+
+    def to_internal_value(self, data):
+        return self.to_internal_values([data])[0]
+
+    def to_internal_values(self, data) -> list:
+        for slug in data:
+            if not isinstance(slug, (str, int)) or isinstance(slug, bool):
+                self.fail('invalid')
+        slugs = [str(slug) for slug in data]
+
+        model = self.get_queryset().model
+        found = slug_caches[model].get_many(slugs)
+        for slug in slugs:
+            if slug not in found:
+                self.fail(
+                    'does_not_exist', slug_name=self.slug_field, value=slug
+                )
+        return [found[slug] for slug in slugs]
@@ -1,5 +1,10 @@
+from django.db.models import Count, QuerySet
+
 from django_filters.rest_framework import CharFilter, FilterSet
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter, SearchFilter
 
+from reviews import search
 from reviews.models import Title
 
 
@@ -13,3 +18,101 @@ class TitleFilter(FilterSet):
     class Meta:
         model = Title
         fields = ('name', 'category', 'genre', 'year')
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    Search filter backed by the SQLite FTS5 indexes, ranking results by
+    relevance. Every term must match the start of a word, so unlike
+    ``icontains`` a term found inside a word does not match. Models without
+    an index fall back to ``icontains`` search.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if (
+            not search_terms
+            or not self.get_search_fields(view, request)
+            or not search.is_indexed(queryset.model)
+        ):
+            return super().filter_queryset(request, queryset, view)
+
+        results = search.search(queryset, search_terms)
+        if results is None:
+            return super().filter_queryset(request, queryset, view)
+        return results
+
+
+class StableOrderingFilter(OrderingFilter):
+    """Ordering filter breaking ties by primary key for stable pages."""
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and not {'pk', '-pk', 'id', '-id'} & set(ordering):
+            ordering = (*ordering, 'pk')
+        return ordering
+
+
+TITLE_FACETS = ('genre', 'category', 'year')
+
+
+def get_facet_names(request) -> tuple:
+    """The facets asked for with ``?facets=genre,category,year``."""
+
+    names = tuple(
+        name.strip()
+        for name in request.query_params.get('facets', '').split(',')
+        if name.strip()
+    )
+    unknown = set(names) - set(TITLE_FACETS)
+    if unknown:
+        raise ValidationError(
+            {
+                'facets': [
+                    f'Unknown facets: {", ".join(sorted(unknown))}. '
+                    f'Choose from {", ".join(TITLE_FACETS)}.'
+                ]
+            }
+        )
+    return names
+
+
+def get_facet_counts(titles: QuerySet, names) -> dict:
+    """
+    Number of the given titles per genre, category or year, with one
+    grouped query per facet.
+    """
+
+    title_ids = titles.order_by().values('pk')
+    facets = {}
+    if 'genre' in names:
+        facets['genre'] = [
+            {'name': name, 'slug': slug, 'count': count}
+            for name, slug, count in (
+                Title.genre.through.objects.filter(title__in=title_ids)
+                .values_list('genre__name', 'genre__slug')
+                .annotate(count=Count('title'))
+                .order_by('-count', 'genre__slug')
+            )
+        ]
+    if 'category' in names:
+        facets['category'] = [
+            {'name': name, 'slug': slug, 'count': count}
+            for name, slug, count in (
+                Title.objects.filter(pk__in=title_ids, category__isnull=False)
+                .values_list('category__name', 'category__slug')
+                .annotate(count=Count('pk'))
+                .order_by('-count', 'category__slug')
+            )
+        ]
+    if 'year' in names:
+        facets['year'] = [
+            {'year': year, 'count': count}
+            for year, count in (
+                Title.objects.filter(pk__in=title_ids)
+                .values_list('year')
+                .annotate(count=Count('pk'))
+                .order_by('-year')
+            )
+        ]
+    return facets
@@ -0,0 +1,168 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import QuerySet
+
+from rest_framework.test import APIRequestFactory
+
+from api.pagination import OptionalCursorPagination
+from api.views import (
+    CategoryViewSet,
+    CommentViewSet,
+    GenreViewSet,
+    ReviewViewSet,
+    TitleViewSet,
+    UserViewSet,
+)
+
+request_factory = APIRequestFactory()
+
+
+def get_view(viewset, action: str, query: dict = None, **kwargs):
+    """A viewset set up for a GET request of an action."""
+
+    view = viewset(
+        action_map={'get': action}, args=(), kwargs=kwargs, format_kwarg=None
+    )
+    view.request = view.initialize_request(
+        request_factory.get('/', query or {})
+    )
+    return view
+
+
+def get_list_queryset(viewset, query: dict = None, **kwargs) -> QuerySet:
+    """The page query of a list request, filtered and paginated."""
+
+    view = get_view(viewset, 'list', query, **kwargs)
+    queryset = view.filter_queryset(view.get_queryset())
+    paginator = view.paginator
+    if isinstance(
+        paginator, OptionalCursorPagination
+    ) and paginator.is_cursor_requested(view.request):
+        cursor_paginator = paginator.cursor_pagination_class()
+        return queryset.order_by(*cursor_paginator.ordering)[
+            :cursor_paginator.get_page_size(view.request) + 1
+        ]
+    return queryset[:paginator.get_page_size(view.request)]
+
+
+def get_detail_queryset(viewset, lookup, **kwargs) -> QuerySet:
+    """The query of a detail request, as ``get_object()`` builds it."""
+
+    view = get_view(viewset, 'retrieve', **kwargs)
+    return view.filter_queryset(view.get_queryset()).filter(
+        **{view.lookup_field: lookup}
+    )
+
+
+def get_querysets() -> tuple:
+    """Querysets built by the API viewsets for typical requests."""
+
+    review_kwargs = {'title_id': 1}
+    comment_kwargs = {'title_id': 1, 'review_id': 1}
+    return (
+        ('TitleViewSet.list', get_list_queryset(TitleViewSet)),
+        (
+            'TitleViewSet.list?year=',
+            get_list_queryset(TitleViewSet, {'year': 2000}),
+        ),
+        (
+            'TitleViewSet.list?category=',
+            get_list_queryset(TitleViewSet, {'category': 'x'}),
+        ),
+        (
+            'TitleViewSet.list?genre=',
+            get_list_queryset(TitleViewSet, {'genre': 'x'}),
+        ),
+        (
+            'TitleViewSet.list?search=',
+            get_list_queryset(TitleViewSet, {'search': 'x'}),
+        ),
+        (
+            'TitleViewSet.list?ordering=-weighted_rating',
+            get_list_queryset(TitleViewSet, {'ordering': '-weighted_rating'}),
+        ),
+        (
+            'TitleViewSet.list?category=&ordering=-category_weighted_rating',
+            get_list_queryset(
+                TitleViewSet,
+                {'category': 'x', 'ordering': '-category_weighted_rating'},
+            ),
+        ),
+        ('TitleViewSet.retrieve', get_detail_queryset(TitleViewSet, 1)),
+        ('GenreViewSet.list', get_list_queryset(GenreViewSet)),
+        ('CategoryViewSet.list', get_list_queryset(CategoryViewSet)),
+        ('UserViewSet.list', get_list_queryset(UserViewSet)),
+        (
+            'ReviewViewSet.list',
+            get_list_queryset(ReviewViewSet, **review_kwargs),
+        ),
+        (
+            'ReviewViewSet.list?pagination=cursor',
+            get_list_queryset(
+                ReviewViewSet, {'pagination': 'cursor'}, **review_kwargs
+            ),
+        ),
+        (
+            'ReviewViewSet.retrieve',
+            get_detail_queryset(ReviewViewSet, 1, **review_kwargs),
+        ),
+        (
+            'CommentViewSet.list',
+            get_list_queryset(CommentViewSet, **comment_kwargs),
+        ),
+        (
+            'CommentViewSet.list?pagination=cursor',
+            get_list_queryset(
+                CommentViewSet, {'pagination': 'cursor'}, **comment_kwargs
+            ),
+        ),
+        (
+            'CommentViewSet.retrieve',
+            get_detail_queryset(CommentViewSet, 1, **comment_kwargs),
+        ),
+    )
+
+
+def get_full_scans(plan: str) -> list:
+    """Return the steps of an SQLite query plan that scan a whole table."""
+
+    full_scans = []
+    for row in plan.splitlines():
+        detail = row.split(maxsplit=3)[-1]
+        if (
+            detail.startswith('SCAN ')
+            and ' USING ' not in detail
+            and 'VIRTUAL TABLE' not in detail
+        ):
+            full_scans.append(detail)
+    return full_scans
+
+
+class Command(BaseCommand):
+    """Check that the API querysets are served by indexes."""
+
+    help = (
+        'Run EXPLAIN QUERY PLAN on the querysets of the API viewsets and '
+        'fail if any of them scans a whole table.'
+    )
+
+    def handle(self, *args, **options) -> None:
+        if connection.vendor != 'sqlite':
+            raise CommandError('Query plans can only be checked on SQLite.')
+
+        failed = []
+        for label, queryset in get_querysets():
+            plan = queryset.explain()
+            full_scans = get_full_scans(plan)
+            style = self.style.ERROR if full_scans else self.style.SUCCESS
+            self.stdout.write(style(label))
+            for row in plan.splitlines():
+                self.stdout.write(f'    {row.split(maxsplit=3)[-1]}')
+            if full_scans:
+                failed.append(label)
+
+        if failed:
+            raise CommandError(
+                'Full table scans in: {}'.format(', '.join(failed))
+            )
+        self.stdout.write(self.style.SUCCESS('No full table scans found.'))
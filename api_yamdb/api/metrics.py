@@ -0,0 +1,132 @@
+import bisect
+import threading
+from collections import defaultdict
+
+from api.cache import title_render_cache
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class RouteMetrics:
+    """Counters collected for one route."""
+
+    def __init__(self) -> None:
+        self.requests = defaultdict(int)
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency_sum = 0.0
+        self.latency_count = 0
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+class MetricsRegistry:
+    """
+    Per-process request metrics exported in the Prometheus text format.
+
+    Every worker process keeps its own registry, so each process has to be
+    scraped separately.
+    """
+
+    def __init__(self) -> None:
+        self.routes = defaultdict(RouteMetrics)
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        route: str,
+        method: str,
+        status: int,
+        duration: float,
+        queries: int,
+        query_seconds: float,
+    ) -> None:
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, duration)
+        with self._lock:
+            metrics = self.routes[route]
+            metrics.requests[method, status] += 1
+            if bucket < len(LATENCY_BUCKETS):
+                metrics.latency_buckets[bucket] += 1
+            metrics.latency_sum += duration
+            metrics.latency_count += 1
+            metrics.queries += queries
+            metrics.query_seconds += query_seconds
+
+    def render(self) -> str:
+        lines = [
+            '# HELP http_requests_total Requests handled per route.',
+            '# TYPE http_requests_total counter',
+        ]
+        with self._lock:
+            routes = sorted(self.routes.items())
+            for route, metrics in routes:
+                for (method, status), count in sorted(
+                    metrics.requests.items()
+                ):
+                    lines.append(
+                        f'http_requests_total{{route="{route}",'
+                        f'method="{method}",status="{status}"}} {count}'
+                    )
+
+            lines += [
+                '# HELP http_request_duration_seconds Request latency per '
+                'route.',
+                '# TYPE http_request_duration_seconds histogram',
+            ]
+            for route, metrics in routes:
+                cumulative = 0
+                for bound, count in zip(
+                    LATENCY_BUCKETS, metrics.latency_buckets
+                ):
+                    cumulative += count
+                    lines.append(
+                        'http_request_duration_seconds_bucket'
+                        f'{{route="{route}",le="{bound}"}} {cumulative}'
+                    )
+                lines += [
+                    'http_request_duration_seconds_bucket'
+                    f'{{route="{route}",le="+Inf"}} {metrics.latency_count}',
+                    'http_request_duration_seconds_sum'
+                    f'{{route="{route}"}} {metrics.latency_sum}',
+                    'http_request_duration_seconds_count'
+                    f'{{route="{route}"}} {metrics.latency_count}',
+                ]
+
+            lines += [
+                '# HELP db_queries_total SQL queries executed per route.',
+                '# TYPE db_queries_total counter',
+            ]
+            lines += [
+                f'db_queries_total{{route="{route}"}} {metrics.queries}'
+                for route, metrics in routes
+            ]
+            lines += [
+                '# HELP db_query_duration_seconds_total Time spent in SQL '
+                'queries per route.',
+                '# TYPE db_query_duration_seconds_total counter',
+            ]
+            lines += [
+                f'db_query_duration_seconds_total{{route="{route}"}} '
+                f'{metrics.query_seconds}'
+                for route, metrics in routes
+            ]
+
+        cache_stats = title_render_cache.stats()
+        lines += [
+            '# HELP title_render_cache_hits_total Title render cache hits.',
+            '# TYPE title_render_cache_hits_total counter',
+            f'title_render_cache_hits_total {cache_stats["hits"]}',
+            '# HELP title_render_cache_misses_total Title render cache '
+            'misses.',
+            '# TYPE title_render_cache_misses_total counter',
+            f'title_render_cache_misses_total {cache_stats["misses"]}',
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        with self._lock:
+            self.routes.clear()
+
+
+metrics_registry = MetricsRegistry()
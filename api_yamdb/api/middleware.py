@@ -0,0 +1,62 @@
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+from api.metrics import metrics_registry
+
+
+class QueryCollector:
+    """Database execute wrapper counting queries and their duration."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+
+def get_route_name(request) -> str:
+    """Name the view that handled the request, e.g. ``TitleViewSet.list``."""
+
+    match = request.resolver_match
+    if match is None:
+        return 'unmatched'
+
+    view_class = getattr(match.func, 'cls', None)
+    if view_class is None:
+        return match.view_name
+    actions = getattr(match.func, 'actions', None) or {}
+    action = actions.get(request.method.lower(), request.method.lower())
+    return f'{view_class.__name__}.{action}'
+
+
+class QueryMetricsMiddleware:
+    """Record latency and SQL query metrics for every request."""
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        collector = QueryCollector()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(collector))
+            response = self.get_response(request)
+
+        metrics_registry.record(
+            get_route_name(request),
+            request.method,
+            response.status_code,
+            time.perf_counter() - started,
+            collector.count,
+            collector.seconds,
+        )
+        return response
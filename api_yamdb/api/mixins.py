@@ -1,6 +1,58 @@
-from rest_framework import filters, mixins, viewsets
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 
+from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .cache import slug_caches
+from .filters import FullTextSearchFilter
 from .permissions import IsAdminOrReadOnly
+from .serializers import render_leaderboard
+from reviews.leaderboards import get_scope_field
+from reviews.models import LeaderboardEntry
+
+
+class NestedViewSetMixin:
+    """
+    Mixin for viewsets nested under a parent object of the URL.
+
+    The parent is loaded at most once per request. Querysets filter by the
+    parent's URL kwargs directly, so detail and list requests only load it
+    to tell an empty page from an unknown parent.
+
+    ``parent_lookups`` maps fields of ``parent_model`` to the URL kwargs
+    identifying the parent, and only ``parent_fields`` are loaded.
+    """
+
+    parent_model = None
+    parent_lookups = {}
+    parent_fields = ('id',)
+
+    def get_parent_queryset(self):
+        return self.parent_model.objects.only(*self.parent_fields)
+
+    def get_parent(self):
+        return get_object_or_404(
+            self.get_parent_queryset(),
+            **{
+                field: self.kwargs.get(kwarg)
+                for field, kwarg in self.parent_lookups.items()
+            },
+        )
+
+    @cached_property
+    def parent(self):
+        return self.get_parent()
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            # An empty page of an unknown parent is a 404.
+            self.parent
+        return page
 
 
 class GenreCategoryBaseViewSet(
@@ -12,6 +64,18 @@ class GenreCategoryBaseViewSet(
     """Mixin class for genre, category viewsets."""
 
     lookup_field = 'slug'
-    filter_backends = (filters.SearchFilter,)
+    filter_backends = (FullTextSearchFilter,)
     search_fields = ['name']
     permission_classes = [IsAdminOrReadOnly]
+
+    @action(detail=True, methods=['GET'])
+    def leaderboard(self, request: Request, slug: str = None) -> Response:
+        """Best titles of the genre or category, precomputed."""
+
+        scope = slug_caches[self.get_queryset().model].get_many([slug])
+        if slug not in scope:
+            raise Http404
+        entries = LeaderboardEntry.objects.filter(
+            **{get_scope_field(scope[slug]): scope[slug].pk}
+        ).order_by('position')
+        return Response(render_leaderboard(entries))
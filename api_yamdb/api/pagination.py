@@ -0,0 +1,129 @@
+from collections import OrderedDict
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    PageNumberPagination,
+)
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from reviews.constants import CHANGES_MAX_PAGE_SIZE, CHANGES_PAGE_SIZE
+
+
+class PubDateCursorPagination(CursorPagination):
+    """
+    Cursor pagination over ``(-pub_date, id)`` without a total count.
+
+    DRF keeps only the first ordering field in the cursor: pages start with
+    ``pub_date < position`` and rows sharing the position's ``pub_date`` are
+    skipped with an offset. ``id`` just makes the order stable. Deep pages
+    are cheap as long as few rows share a ``pub_date``; bulk-imported rows
+    with equal dates are read and skipped before every page.
+    """
+
+    ordering = ('-pub_date', 'id')
+
+
+class OptionalCursorPagination(PageNumberPagination):
+    """
+    Page number pagination that switches to keyset pagination when the
+    client asks for it with ``?pagination=cursor`` or passes a cursor.
+    """
+
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    cursor_pagination_class = PubDateCursorPagination
+
+    cursor_paginator = None
+
+    def is_cursor_requested(self, request) -> bool:
+        return (
+            request.query_params.get(self.mode_query_param)
+            == self.cursor_mode
+            or self.cursor_pagination_class.cursor_query_param
+            in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.is_cursor_requested(request):
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor_paginator:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
+
+
+class ChangeFeedPagination(BasePagination):
+    """
+    Pagination of the change log by event id.
+
+    ``?since=<cursor>`` returns the events after the cursor; the response
+    carries the cursor to pass next time, even when there were no events.
+    """
+
+    since_query_param = 'since'
+    limit_query_param = 'limit'
+    page_size = CHANGES_PAGE_SIZE
+    max_page_size = CHANGES_MAX_PAGE_SIZE
+
+    def get_int_param(self, request, name: str, default: int) -> int:
+        value = request.query_params.get(name, default)
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            value = -1
+        if value < 0:
+            raise ValidationError(
+                {name: ['Expected a non-negative integer.']}
+            )
+        return value
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.cursor = self.get_int_param(request, self.since_query_param, 0)
+        limit = min(
+            self.get_int_param(
+                request, self.limit_query_param, self.page_size
+            ),
+            self.max_page_size,
+        ) or self.page_size
+        events = list(
+            queryset.filter(pk__gt=self.cursor).order_by('pk')[: limit + 1]
+        )
+        self.has_more = len(events) > limit
+        events = events[:limit]
+        if events:
+            self.cursor = events[-1].pk
+        return events
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                (
+                    ('cursor', self.cursor),
+                    ('has_more', self.has_more),
+                    (
+                        'next',
+                        replace_query_param(
+                            self.request.build_absolute_uri(),
+                            self.since_query_param,
+                            self.cursor,
+                        ),
+                    ),
+                    ('results', data),
+                )
+            )
+        )
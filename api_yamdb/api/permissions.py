@@ -15,21 +15,32 @@ class IsAdminOrReadOnly(permissions.BasePermission):
         )
 
 
+def is_moderator(user) -> bool:
+    """Whether the user may edit or delete anyone's content."""
+
+    return user.is_authenticated and (user.is_moderator or user.is_admin)
+
+
+def is_author(user, obj) -> bool:
+    """Compare author ids, so the author row is never loaded."""
+
+    return user.is_authenticated and obj.author_id == user.pk
+
+
 class IsModeratorOrReadOnly(permissions.BasePermission):
     """
     Permission that allows moderators to edit or delete any content.
     Non-moderator users can only perform read operations.
+
+    Role flags are checked first and the author by id, so no user rows are
+    fetched per checked object.
     """
 
     def has_object_permission(self, request, view, obj) -> bool:
         if request.method in SAFE_METHODS:
             return True
 
-        return request.user.is_authenticated and (
-            request.user == obj.author
-            or request.user.is_moderator
-            or request.user.is_admin
-        )
+        return is_moderator(request.user) or is_author(request.user, obj)
 
 
 class IsSuperuserOrAdmin(permissions.BasePermission):
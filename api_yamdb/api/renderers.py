@@ -0,0 +1,33 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer encoding with orjson.
+
+    Values orjson does not handle itself (datetimes, decimals, lazy
+    strings, querysets) go through DRF's encoder, so the output matches
+    ``JSONRenderer``. Indented and ASCII-only output is left to it.
+    """
+
+    default = staticmethod(JSONEncoder().default)
+
+    def render(
+        self, data, accepted_media_type=None, renderer_context=None
+    ) -> bytes:
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.default, option=ORJSON_OPTIONS)
+        # Keep the output a strict javascript subset, as JSONRenderer does.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+            b'\xe2\x80\xa9', b'\\u2029'
+        )
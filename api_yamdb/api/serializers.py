@@ -2,12 +2,25 @@ from typing import OrderedDict
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
+from django.db import IntegrityError, connection, models, transaction
 from django.shortcuts import get_object_or_404
 
 from rest_framework import serializers
 
+from api.cache import title_render_cache
+from api.fields import CachedSlugRelatedField
 from api.utils import send_confirmation_email
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.constants import TITLE_BULK_BATCH_SIZE
+from reviews.models import (
+    Category,
+    ChangeEvent,
+    Comment,
+    Genre,
+    Review,
+    Title,
+)
+from reviews.utils import record_changes
+from users.bloom import user_bloom_filter
 from users.constants import MAX_EMAIL_LENGTH, MAX_USERNAME_LENGTH
 from users.validators import validate_username
 
@@ -50,19 +63,126 @@ class TitleReadSerializer(serializers.ModelSerializer):
         )
 
 
+def render_titles(titles) -> list:
+    """Represent titles, reusing and filling the render cache."""
+
+    rendered = title_render_cache.get_many(title.pk for title in titles)
+    missing = {
+        title.pk: TitleReadSerializer(title).data
+        for title in titles
+        if title.pk not in rendered
+    }
+    if missing:
+        title_render_cache.set_many(missing)
+        rendered.update(missing)
+    return [rendered[title.pk] for title in titles]
+
+
+def render_leaderboard(entries) -> list:
+    """
+    Represent leaderboard entries, loading only the titles missing from
+    the render cache.
+    """
+
+    entries = list(entries)
+    title_ids = [entry.title_id for entry in entries]
+    rendered = title_render_cache.get_many(title_ids)
+    missing = [pk for pk in title_ids if pk not in rendered]
+    if missing:
+        titles = list(
+            Title.objects.select_related('category')
+            .prefetch_related('genre')
+            .filter(pk__in=missing)
+        )
+        rendered.update(
+            zip((title.pk for title in titles), render_titles(titles))
+        )
+    return [
+        {
+            'position': entry.position,
+            'weighted_rating': entry.weighted_rating,
+            'title': rendered[entry.title_id],
+        }
+        for entry in entries
+        if entry.title_id in rendered
+    ]
+
+
+class TitleListSerializer(serializers.ListSerializer):
+    """
+    List serializer assembling titles from cached representations and
+    creating titles in bulk.
+    """
+
+    def to_representation(self, data) -> list:
+        if isinstance(data, models.Manager):
+            data = data.all()
+        return render_titles(list(data))
+
+    def create(self, validated_data) -> list:
+        """
+        Insert titles and their genres in bulk, where the database returns
+        the ids of bulk-inserted rows or they can be read back.
+        """
+
+        titles = [
+            Title(**{
+                field: value
+                for field, value in item.items()
+                if field != 'genre'
+            })
+            for item in validated_data
+        ]
+        with transaction.atomic():
+            if connection.features.can_return_rows_from_bulk_insert:
+                Title.objects.bulk_create(
+                    titles, batch_size=TITLE_BULK_BATCH_SIZE
+                )
+                # bulk_create sends no signals, so log the new titles here.
+                record_changes(ChangeEvent.Action.CREATED, titles)
+            elif connection.vendor == 'sqlite':
+                Title.objects.bulk_create(
+                    titles, batch_size=TITLE_BULK_BATCH_SIZE
+                )
+                # SQLite holds the write lock from the first insert until
+                # the commit, so the new titles got the highest ids, in
+                # order.
+                ids = list(
+                    Title.objects.order_by('-pk').values_list(
+                        'pk', flat=True
+                    )[:len(titles)]
+                )
+                for title, pk in zip(titles, reversed(ids)):
+                    title.pk = pk
+                record_changes(ChangeEvent.Action.CREATED, titles)
+            else:
+                # Other writers may take ids between ours, so each title
+                # gets the id of its own insert.
+                for title in titles:
+                    title.save(force_insert=True)
+
+            Title.genre.through.objects.bulk_create(
+                [
+                    Title.genre.through(title_id=title.pk, genre_id=genre.pk)
+                    for title, item in zip(titles, validated_data)
+                    for genre in set(item['genre'])
+                ],
+                batch_size=TITLE_BULK_BATCH_SIZE,
+            )
+        models.prefetch_related_objects(titles, 'genre')
+        return titles
+
+
 class TitleSerializer(serializers.ModelSerializer):
     """Serializer for Title."""
 
-    genre = serializers.SlugRelatedField(
-        slug_field='slug',
+    genre = CachedSlugRelatedField(
         queryset=Genre.objects.all(),
         many=True,
         allow_null=False,
         allow_empty=False,
     )
-    category = serializers.SlugRelatedField(
-        slug_field='slug', queryset=Category.objects.all()
-    )
+    category = CachedSlugRelatedField(queryset=Category.objects.all())
 
     class Meta:
         model = Title
@@ -74,11 +194,12 @@ class TitleSerializer(serializers.ModelSerializer):
             'genre',
             'category',
         )
+        list_serializer_class = TitleListSerializer
 
     def to_representation(self, instance) -> OrderedDict:
         """Custom representation to intercept and modify output."""
 
-        return TitleReadSerializer(instance).data
+        return render_titles([instance])[0]
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -101,11 +222,13 @@ class ReviewSerializer(serializers.ModelSerializer):
         if request.method != 'POST':
             return data
 
-        title_id = self.context['view'].kwargs.get('title_id')
-
-        if Review.objects.filter(
-            title__id=title_id, author=request.user
-        ).exists():
+        title = self.context['view'].get_title()
+        is_reviewed = getattr(title, 'is_reviewed', None)
+        if is_reviewed is None:
+            is_reviewed = Review.objects.filter(
+                title=title, author_id=request.user.pk
+            ).exists()
+        if is_reviewed:
             raise serializers.ValidationError(
                 'You have already left a review about this work.'
             )
@@ -125,6 +248,43 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'pub_date')
 
 
+class ChangeEventSerializer(serializers.ModelSerializer):
+    """Change log event Serializer."""
+
+    class Meta:
+        model = ChangeEvent
+        fields = ('id', 'entity', 'action', 'key', 'created_at')
+
+
+def get_signup_user(username: str, email: str):
+    """
+    Return the user registered with both the username and the email, or
+    ``None`` if neither is taken, with a single query. Raise a validation
+    error if either belongs to another user.
+    """
+
+    users = list(
+        User.objects.filter(
+            models.Q(username=username) | models.Q(email=email)
+        )[:2]
+    )
+    if len(users) == 1 and (
+        users[0].username == username and users[0].email == email
+    ):
+        return users[0]
+
+    validation_errors = {}
+    if any(user.username == username for user in users):
+        validation_errors['username'] = 'This username is already registered'
+    if any(user.email == email for user in users):
+        validation_errors['email'] = (
+            'This email is already registered with a different username.'
+        )
+    if validation_errors:
+        raise serializers.ValidationError(validation_errors)
+    return None
+
+
 class UserSignUpSerializer(serializers.Serializer):
     """A base class for user properties and methods."""
 
@@ -140,52 +300,83 @@ class UserSignUpSerializer(serializers.Serializer):
         Validates the provided username and email against existing users.
         """
 
-        username = data.get('username')
-        email = data.get('email')
+        username, email = data.get('username'), data.get('email')
+        if any(user_bloom_filter.might_exist(username, email).values()):
+            self.user = get_signup_user(username, email)
+        else:
+            # Both are new to this process; a user registered elsewhere
+            # since the last rebuild is caught by the unique constraints.
+            self.user = None
+        return data
 
-        user_by_username = User.objects.filter(username=username).first()
-        user_by_email = User.objects.filter(email=email).first()
+    def create(self, validated_data):
+        user = self.user
+        with transaction.atomic():
+            if user is None:
+                # The unique constraints catch a user registered after the
+                # lookup in validate().
+                try:
+                    with transaction.atomic():
+                        user = User.objects.create(
+                            username=validated_data.get('username'),
+                            email=validated_data.get('email'),
+                        )
+                except IntegrityError:
+                    user = get_signup_user(
+                        validated_data.get('username'),
+                        validated_data.get('email'),
+                    )
+                    if user is None:
+                        raise
+            confirmation_code = default_token_generator.make_token(user)
+            send_confirmation_email(user, confirmation_code)
+        return user
 
-        validation_errors = {}
 
-        # Check if both username and email belong to the same user
-        if (
-            user_by_username
-            and user_by_email
-            and user_by_username.id == user_by_email.id
-        ):
-            return data
+class UserAvailabilitySerializer(serializers.Serializer):
+    """Username and email, at least one of them, to check availability of."""
 
-        # Check if the username exists
-        if user_by_username:
-            validation_errors.update(
-                {'username': 'This username is already registered'}
-            )
+    email = serializers.EmailField(
+        required=False, max_length=MAX_EMAIL_LENGTH
+    )
+    username = serializers.CharField(
+        required=False,
+        validators=[validate_username],
+        max_length=MAX_USERNAME_LENGTH,
+    )
 
-        # Check if the email is registered
-        if user_by_email:
-            validation_errors.update(
-                {
-                    'email': (
-                        'This email is already registered '
-                        'with a different username.'
-                    )
-                }
+    def validate(self, data: OrderedDict) -> OrderedDict:
+        if not data:
+            raise serializers.ValidationError(
+                'Pass a username, an email or both.'
             )
-
-        if validation_errors:
-            raise serializers.ValidationError(validation_errors)
-
         return data
 
-    def create(self, validated_data):
-        user, _ = User.objects.get_or_create(
-            username=validated_data.get('username'),
-            email=validated_data.get('email'),
-        )
-        confirmation_code = default_token_generator.make_token(user)
-        send_confirmation_email(user, confirmation_code)
-        return user
+    def get_availability(self) -> dict:
+        """
+        Map each checked field to whether it is free. The database is only
+        queried for values the Bloom filter possibly contains.
+        """
+
+        data = self.validated_data
+        might_exist = user_bloom_filter.might_exist(**data)
+        taken = {field: False for field in might_exist}
+        lookups = [
+            models.Q(**{field: data[field]})
+            for field, found in might_exist.items()
+            if found
+        ]
+        if lookups:
+            query = lookups[0]
+            for lookup in lookups[1:]:
+                query |= lookup
+            for username, email in User.objects.filter(query).values_list(
+                'username', 'email'
+            ):
+                for field, value in (('username', username), ('email', email)):
+                    if field in taken and data[field] == value:
+                        taken[field] = True
+        return {field: not value for field, value in taken.items()}
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -0,0 +1,64 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.authentication import forget_role_flags
+from api.cache import slug_caches, title_render_cache
+from reviews.models import Category, Genre, Title
+from reviews.utils import titles_updated
+from users.bloom import user_bloom_filter
+from users.models import User
+
+
+# Caches are cleared once the change commits: cleared earlier, they could
+# be filled again with the old rows before the commit, and a rollback would
+# clear them for nothing.
+
+
+def invalidate_titles(*title_ids: int) -> None:
+    transaction.on_commit(lambda: title_render_cache.invalidate(*title_ids))
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def title_changed(sender, instance: Title, **kwargs) -> None:
+    invalidate_titles(instance.pk)
+
+
+@receiver(titles_updated)
+def titles_updated_in_bulk(sender, title_ids, **kwargs) -> None:
+    invalidate_titles(*title_ids)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        invalidate_titles(instance.pk)
+    elif pk_set:
+        invalidate_titles(*pk_set)
+    else:
+        # A genre was cleared of all its titles.
+        transaction.on_commit(title_render_cache.invalidate_all)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def genre_or_category_changed(sender, **kwargs) -> None:
+    transaction.on_commit(slug_caches[sender].invalidate)
+    transaction.on_commit(title_render_cache.invalidate_all)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance: User, **kwargs) -> None:
+    user_id = instance.pk
+    transaction.on_commit(lambda: forget_role_flags(user_id))
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance: User, **kwargs) -> None:
+    user_bloom_filter.add(instance.username, instance.email)
@@ -4,12 +4,19 @@ from rest_framework.routers import DefaultRouter
 
 from .views import (
     CategoryViewSet,
+    ChangeEventViewSet,
     CommentViewSet,
     GenreViewSet,
     ReviewViewSet,
     TitleViewSet,
 )
-from api.views import UserViewSet, get_jwt_token, signup
+from api.views import (
+    UserViewSet,
+    check_availability,
+    get_jwt_token,
+    metrics,
+    signup,
+)
 
 app_name = 'api'
 
@@ -18,6 +25,7 @@ router_v1.register('users', UserViewSet, basename='users')
 router_v1.register('genres', GenreViewSet, basename='genres')
 router_v1.register('categories', CategoryViewSet, basename='categories')
 router_v1.register('titles', TitleViewSet, basename='titles')
+router_v1.register('changes', ChangeEventViewSet, basename='changes')
 router_v1.register(
     r'titles/(?P<title_id>\d+)/reviews', ReviewViewSet, basename='reviews'
 )
@@ -31,4 +39,6 @@ urlpatterns = [
     path('v1/', include(router_v1.urls)),
     path('v1/auth/signup/', signup, name='register'),
     path('v1/auth/token/', get_jwt_token, name='token'),
+    path('v1/auth/check/', check_availability, name='check'),
+    path('v1/metrics/', metrics, name='metrics'),
 ]
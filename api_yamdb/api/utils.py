@@ -1,16 +1,12 @@
-from django.conf import settings
-from django.core.mail import send_mail
-
 from users.models import User
+from users.outbox import queue_email
 
 
 def send_confirmation_email(user: User, confirmation_code: str) -> None:
-    """Send email with confirmation code to user."""
+    """Queue email with confirmation code to user."""
 
-    send_mail(
+    queue_email(
+        user.email,
         'API_YAMDB. Confirmation code',
         f'Your confirmation code: {confirmation_code}',
-        settings.DEFAULT_FROM_EMAIL,
-        [user.email],
-        fail_silently=False,
     )
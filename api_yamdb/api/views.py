@@ -1,33 +1,57 @@
 from django.contrib.auth import get_user_model
-from django.db.models import Avg
+from django.db.models import Exists, OuterRef
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import status, viewsets
-from rest_framework.decorators import action, api_view
-from rest_framework.filters import SearchFilter
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import (
+    action,
+    api_view,
+    permission_classes,
+)
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import (
     IsAuthenticated,
     IsAuthenticatedOrReadOnly,
 )
 from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
 
-from .filters import TitleFilter
-from .mixins import GenreCategoryBaseViewSet
+from .authentication import RoleAccessToken, get_author, get_request_user
+from .cache import title_render_cache
+from .filters import (
+    FullTextSearchFilter,
+    StableOrderingFilter,
+    TitleFilter,
+    get_facet_counts,
+    get_facet_names,
+)
+from .metrics import metrics_registry
+from .mixins import GenreCategoryBaseViewSet, NestedViewSetMixin
+from .pagination import ChangeFeedPagination, OptionalCursorPagination
 from .permissions import IsSuperuserOrAdmin
 from .serializers import (
     CategorySerializer,
+    ChangeEventSerializer,
     CommentSerializer,
     GenreSerializer,
     ReviewSerializer,
     TitleSerializer,
+    UserAvailabilitySerializer,
     UserSignUpSerializer,
 )
 from api.permissions import IsAdminOrReadOnly, IsModeratorOrReadOnly
 from api.serializers import UserAccessTokenSerializer, UserSerializer
-from reviews.models import Category, Genre, Review, Title
+from reviews.constants import TITLE_BULK_MAX_ITEMS
+from reviews.models import (
+    Category,
+    ChangeEvent,
+    Comment,
+    Genre,
+    Review,
+    Title,
+)
 
 User = get_user_model()
 
@@ -43,6 +67,13 @@ def signup(request: Request) -> Response:
     )
 
 
+@api_view(['GET'])
+def check_availability(request: Request) -> Response:
+    serializer = UserAvailabilitySerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    return Response(serializer.get_availability(), status=status.HTTP_200_OK)
+
+
 @api_view(['POST'])
 def get_jwt_token(request: Request) -> Response:
     serializer = UserAccessTokenSerializer(data=request.data)
@@ -51,11 +82,20 @@ def get_jwt_token(request: Request) -> Response:
     username = serializer.validated_data['username']
     user = get_object_or_404(User, username=username)
 
-    token = AccessToken.for_user(user)
+    token = RoleAccessToken.for_user(user)
 
     return Response({'token': str(token)}, status=status.HTTP_200_OK)
 
 
+@api_view(['GET'])
+@permission_classes([IsSuperuserOrAdmin])
+def metrics(request: Request) -> HttpResponse:
+    return HttpResponse(
+        metrics_registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
+
 class UserViewSet(viewsets.ModelViewSet):
     """User viewset."""
 
@@ -73,14 +113,13 @@ class UserViewSet(viewsets.ModelViewSet):
         permission_classes=[IsAuthenticated],
     )
     def me(self, request: Request) -> Response:
+        user = get_request_user(request)
         if request.method == 'GET':
-            serializer = UserSerializer(self.request.user)
+            serializer = UserSerializer(user)
         else:
-            serializer = UserSerializer(
-                self.request.user, data=request.data, partial=True
-            )
+            serializer = UserSerializer(user, data=request.data, partial=True)
             serializer.is_valid(raise_exception=True)
-            serializer.save(role=request.user.role)
+            serializer.save(role=user.role)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -103,54 +142,151 @@ class TitleViewSet(viewsets.ModelViewSet):
     """Title viewset."""
 
     queryset = (
-        Title.objects.all()
+        Title.objects.select_related('category')
+        .prefetch_related('genre')
         .order_by('name')
-        .annotate(rating=Avg('reviews__score'))
     )
     permission_classes = [IsAdminOrReadOnly]
     filterset_class = TitleFilter
     serializer_class = TitleSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filter_backends = [
+        DjangoFilterBackend,
+        FullTextSearchFilter,
+        StableOrderingFilter,
+    ]
+    search_fields = ('name',)
+    ordering_fields = (
+        'name',
+        'year',
+        'weighted_rating',
+        'category_weighted_rating',
+    )
     http_method_names = ('get', 'post', 'patch', 'delete')
 
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        """List titles, adding counts per facet value when asked to."""
+
+        facets = get_facet_names(request)
+        response = super().list(request, *args, **kwargs)
+        if facets:
+            response.data['facets'] = get_facet_counts(
+                self.filter_queryset(self.get_queryset()), facets
+            )
+        return response
+
+    @action(
+        detail=False,
+        url_path='cache-stats',
+        methods=['GET'],
+        permission_classes=[IsSuperuserOrAdmin],
+    )
+    def cache_stats(self, request: Request) -> Response:
+        return Response(title_render_cache.stats(), status=status.HTTP_200_OK)
 
-class CommentViewSet(viewsets.ModelViewSet):
+    @action(detail=False, url_path='bulk', methods=['POST'])
+    def bulk(self, request: Request) -> Response:
+        """Create a list of titles; errors are reported per item."""
+
+        if not isinstance(request.data, list):
+            raise ValidationError(
+                {'non_field_errors': ['Expected a list of titles.']}
+            )
+        if len(request.data) > TITLE_BULK_MAX_ITEMS:
+            raise ValidationError(
+                {
+                    'non_field_errors': [
+                        f'No more than {TITLE_BULK_MAX_ITEMS} titles can be '
+                        'created at once.'
+                    ]
+                }
+            )
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class CommentViewSet(NestedViewSetMixin, viewsets.ModelViewSet):
     """Comment viewset."""
 
     serializer_class = CommentSerializer
     permission_classes = [IsModeratorOrReadOnly, IsAuthenticatedOrReadOnly]
+    pagination_class = OptionalCursorPagination
     http_method_names = ('get', 'post', 'patch', 'delete')
     search_fields = ('text',)
+    parent_model = Review
+    parent_lookups = {'id': 'review_id', 'title_id': 'title_id'}
+    parent_fields = ('id', 'title_id')
 
     def get_queryset(self):
-        return self.get_review().comments.order_by('-pub_date')
+        return (
+            Comment.objects.filter(
+                review_id=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id'),
+            )
+            .select_related('author')
+            .order_by('-pub_date')
+        )
 
     def get_review(self) -> Review:
-        return get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id'),
-            title_id=self.kwargs.get('title_id'),
-        )
+        return self.parent
 
     def perform_create(self, serializer: CommentSerializer) -> None:
         review = self.get_review()
         serializer.save(
-            title=review.title, review=review, author=self.request.user
+            title_id=review.title_id,
+            review=review,
+            author=get_author(self.request),
         )
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(NestedViewSetMixin, viewsets.ModelViewSet):
     """Review viewset."""
 
     serializer_class = ReviewSerializer
     permission_classes = [IsModeratorOrReadOnly, IsAuthenticatedOrReadOnly]
+    pagination_class = OptionalCursorPagination
     http_method_names = ('get', 'post', 'patch', 'delete')
+    parent_model = Title
+    parent_lookups = {'id': 'title_id'}
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return Review.objects.filter(
+            title_id=self.kwargs.get('title_id')
+        ).select_related('author')
+
+    def get_parent_queryset(self):
+        """
+        Titles annotated with whether the current user has reviewed them
+        already, so that a review POST needs a single lookup.
+        """
+
+        return (
+            super()
+            .get_parent_queryset()
+            .annotate(
+                is_reviewed=Exists(
+                    Review.objects.filter(
+                        title=OuterRef('pk'), author_id=self.request.user.pk
+                    )
+                )
+            )
+        )
 
     def get_title(self) -> Title:
-        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
+        return self.parent
 
     def perform_create(self, serializer: ReviewSerializer) -> None:
-        serializer.save(author=self.request.user, title=self.get_title())
+        serializer.save(
+            author=get_author(self.request), title=self.get_title()
+        )
+
+
+class ChangeEventViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Feed of catalog changes made after the ``since`` cursor."""
+
+    queryset = ChangeEvent.objects.all()
+    serializer_class = ChangeEventSerializer
+    pagination_class = ChangeFeedPagination
+    filter_backends = ()
@@ -0,0 +1,25 @@
+from django.db.backends.sqlite3 import base
+
+
+def get_pragma_statements(pragmas: dict) -> list:
+    """Build the ``PRAGMA`` statements for a mapping of pragma values."""
+
+    return [f'PRAGMA {name} = {value}' for name, value in pragmas.items()]
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite backend applying the ``pragmas`` mapping from ``OPTIONS``
+    to every new connection.
+    """
+
+    def get_connection_params(self) -> dict:
+        conn_params = super().get_connection_params()
+        self.pragmas = conn_params.pop('pragmas', {})
+        return conn_params
+
+    def get_new_connection(self, conn_params: dict):
+        conn = super().get_new_connection(conn_params)
+        for statement in get_pragma_statements(self.pragmas):
+            conn.execute(statement)
+        return conn
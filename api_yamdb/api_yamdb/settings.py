@@ -38,6 +38,7 @@ INSTALLED_APPS = [
 # fmt: on
 
 MIDDLEWARE = [
+    'api.middleware.QueryMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -74,13 +75,39 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'api_yamdb.db',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'pragmas': {
+                'journal_mode': 'wal',
+                'synchronous': 'normal',
+                'mmap_size': 256 * 1024 * 1024,
+                'cache_size': -64 * 1024,
+                'busy_timeout': 5000,
+                'temp_store': 'memory',
+            },
+        },
     }
 }
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# The default cache is local to each process, which only clears the titles
+# it changed itself; this bounds how long other processes serve a changed
+# title. Raise it together with a shared backend (e.g. Redis).
+TITLE_RENDER_CACHE_TIMEOUT = 60
+
+# Seconds a process trusts its genre and category slug cache
+SLUG_CACHE_TIMEOUT = 60
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -124,12 +151,21 @@ AUTH_USER_MODEL = 'users.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessRoleJWTAuthentication',
     ),
     'DEFAULT_FILTER_BACKENDS': (
-        'rest_framework.filters.SearchFilter',
+        'api.filters.FullTextSearchFilter',
         'django_filters.rest_framework.DjangoFilterBackend',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 100,
 }
@@ -141,6 +177,12 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=365),
 }
 
+# Seconds the role flags checked against token claims are cached for
+AUTH_ROLE_FLAGS_TTL = 60
+
+# Seconds before the Bloom filter of usernames and emails is rebuilt
+USERS_BLOOM_FILTER_TTL = 5 * 60
+
 # User 2nd factor authentication
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
@@ -148,3 +190,7 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 DEFAULT_FROM_EMAIL = 'yamdb@ya.ru'
+
+# How queued emails are delivered: 'worker' (send_emails command only),
+# 'thread' (background thread after commit) or 'immediate' (after commit)
+EMAIL_OUTBOX_DELIVERY = 'thread'
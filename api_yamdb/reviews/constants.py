@@ -4,6 +4,34 @@ MAX_TEXT_LENGTH = 50
 
 MAX_NAME_LENGTH = 256
 
+MAX_ENTITY_LENGTH = 32
+
 MAX_NUMB = 10
 
 MIN_NUMB = 1
+
+RATING_BATCH_SIZE = 1000
+
+IMPORT_BATCH_SIZE = 1000
+
+IMPORT_LOOKUP_BATCH_SIZE = 500
+
+TITLE_BULK_MAX_ITEMS = 5000
+
+TITLE_BULK_BATCH_SIZE = 500
+
+CHANGES_PAGE_SIZE = 100
+
+CHANGES_MAX_PAGE_SIZE = 1000
+
+# Number of average votes a title's mean score is pulled towards
+BAYESIAN_PRIOR_WEIGHT = 10
+
+RANKING_BATCH_SIZE = 1000
+
+LEADERBOARD_SIZE = 100
+
+# Number of titles above which a rating refresh reranks every title instead
+RATING_REFRESH_MAX_TITLES = 500
+
+BENCHMARK_BULK_TITLES = 100
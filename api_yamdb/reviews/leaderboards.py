@@ -0,0 +1,314 @@
+import logging
+import threading
+from collections import defaultdict
+from typing import Optional
+
+from django.db import transaction
+from django.db.models import Q
+
+from reviews.constants import LEADERBOARD_SIZE, RATING_REFRESH_MAX_TITLES
+from reviews.models import (
+    Category,
+    Genre,
+    GenreRating,
+    LeaderboardEntry,
+    Title,
+)
+from reviews.ranking import get_weighted_ratings, rank_titles
+
+logger = logging.getLogger(__name__)
+
+SCOPE_MODELS = {'category': Category, 'genre': Genre}
+
+
+class PendingRefresh(threading.local):
+    """Titles and leaderboards to refresh once the transaction commits."""
+
+    def __init__(self) -> None:
+        self.title_ids = set()
+        self.scopes = set()
+
+
+pending_refresh = PendingRefresh()
+
+
+def get_scope_field(scope) -> str:
+    return 'category' if isinstance(scope, Category) else 'genre'
+
+
+def get_scope_rating(
+    scope_sum: int, scope_count: int, rating_sum: int, rating_count: int
+) -> Optional[float]:
+    """Weighted rating of a title within a category or a genre."""
+
+    if not rating_count or not scope_count:
+        return None
+    return get_weighted_ratings(
+        rating_sum, rating_count, scope_sum / scope_count
+    )
+
+
+def get_top_titles(field: str, scope_id: int) -> list:
+    """``(title_id, weighted_rating)`` of the best titles of a scope."""
+
+    if field == 'category':
+        rows = (
+            Title.objects.filter(
+                category=scope_id, category_weighted_rating__isnull=False
+            )
+            .order_by('-category_weighted_rating', 'pk')
+            .values_list('pk', 'category_weighted_rating')
+        )
+    else:
+        rows = (
+            GenreRating.objects.filter(genre=scope_id)
+            .order_by('-weighted_rating', 'title_id')
+            .values_list('title', 'weighted_rating')
+        )
+    return list(rows[:LEADERBOARD_SIZE])
+
+
+def build_leaderboard(field: str, scope_id: int) -> list:
+    return [
+        LeaderboardEntry(
+            **{f'{field}_id': scope_id},
+            position=position,
+            title_id=title_id,
+            weighted_rating=weighted_rating,
+        )
+        for position, (title_id, weighted_rating) in enumerate(
+            get_top_titles(field, scope_id), start=1
+        )
+    ]
+
+
+def get_scopes_filter(scopes) -> Q:
+    """Leaderboard entries of the given ``(field, scope_id)`` scopes."""
+
+    scope_ids = defaultdict(list)
+    for field, scope_id in scopes:
+        scope_ids[field].append(scope_id)
+    condition = Q(pk__in=[])
+    for field, ids in scope_ids.items():
+        condition |= Q(**{f'{field}__in': ids})
+    return condition
+
+
+def rebuild_leaderboards(scopes=None) -> int:
+    """
+    Rebuild the leaderboards of the given ``(field, scope_id)`` scopes, or
+    of all categories and genres.
+    """
+
+    if scopes is None:
+        scopes = [
+            (field, scope_id)
+            for field, model in SCOPE_MODELS.items()
+            for scope_id in model.objects.values_list('pk', flat=True)
+        ]
+        entries = LeaderboardEntry.objects.all()
+    else:
+        entries = LeaderboardEntry.objects.filter(get_scopes_filter(scopes))
+    new_entries = [
+        entry
+        for field, scope_id in scopes
+        for entry in build_leaderboard(field, scope_id)
+    ]
+    entries.delete()
+    LeaderboardEntry.objects.bulk_create(new_entries)
+    return len(new_entries)
+
+
+def get_entry_key(entry: tuple) -> tuple:
+    """Sort key of ``(title_id, weighted_rating)`` in leaderboard order."""
+
+    title_id, weighted_rating = entry
+    return -weighted_rating, title_id
+
+
+def merge_leaderboard(entries: list, title_ratings: dict) -> Optional[list]:
+    """
+    New ``(title_id, weighted_rating)`` entries of a leaderboard, given in
+    position order, once some titles get new weighted ratings. Returns
+    ``None`` when titles missing from a full leaderboard may take the
+    place of a listed title falling behind, so it has to be read again.
+    """
+
+    board = dict(entries)
+    listed = set(board)
+    for title_id, weighted_rating in title_ratings.items():
+        board.pop(title_id, None)
+        if weighted_rating is not None:
+            board[title_id] = weighted_rating
+    if len(entries) >= LEADERBOARD_SIZE:
+        last = get_entry_key(entries[-1])
+        for title_id in listed.intersection(title_ratings):
+            if title_id not in board or (
+                get_entry_key((title_id, board[title_id])) > last
+            ):
+                return None
+    return sorted(board.items(), key=get_entry_key)[:LEADERBOARD_SIZE]
+
+
+def store_leaderboards(entries: dict, leaderboards: dict) -> None:
+    """
+    Write new ``(title_id, weighted_rating)`` leaderboards of scopes over
+    their stored ``(pk, title_id, weighted_rating)`` entries, touching only
+    the positions whose title or rating changed.
+    """
+
+    changed, created, deleted = [], [], []
+    for (field, scope_id), leaderboard in leaderboards.items():
+        stored = entries[field, scope_id]
+        for position, (title_id, weighted_rating) in enumerate(
+            leaderboard, start=1
+        ):
+            if position > len(stored):
+                created.append(
+                    LeaderboardEntry(
+                        **{f'{field}_id': scope_id},
+                        position=position,
+                        title_id=title_id,
+                        weighted_rating=weighted_rating,
+                    )
+                )
+            elif stored[position - 1][1:] != (title_id, weighted_rating):
+                changed.append(
+                    LeaderboardEntry(
+                        pk=stored[position - 1][0],
+                        title_id=title_id,
+                        weighted_rating=weighted_rating,
+                    )
+                )
+        deleted.extend(pk for pk, _, _ in stored[len(leaderboard):])
+    if deleted:
+        LeaderboardEntry.objects.filter(pk__in=deleted).delete()
+    LeaderboardEntry.objects.bulk_update(
+        changed, ('title', 'weighted_rating')
+    )
+    LeaderboardEntry.objects.bulk_create(created)
+
+
+def refresh_titles(title_ids, scopes=()) -> None:
+    """
+    Recompute the weighted ratings of titles within their category and
+    genres from the stored rating totals, and move them in the leaderboards
+    of these scopes. The leaderboards of ``(field, scope_id)`` scopes given
+    explicitly (e.g. ones a title has left) are read again.
+
+    Many titles are reranked at once with ``rank_titles``. Otherwise the
+    prior means of the scopes move with every review, while the ratings of
+    the other titles are only recomputed by ``rank_titles``, so the
+    leaderboards are exact again after every ranking run.
+    """
+
+    if len(title_ids) > RATING_REFRESH_MAX_TITLES:
+        rank_titles()
+        rebuild_leaderboards()
+        return
+
+    ratings = defaultdict(dict)
+    changed = []
+    totals = {}
+    for (
+        title_id,
+        category_id,
+        rating_sum,
+        rating_count,
+        stored_rating,
+        category_sum,
+        category_count,
+    ) in Title.objects.filter(pk__in=title_ids).values_list(
+        'pk',
+        'category_id',
+        'rating_sum',
+        'rating_count',
+        'category_weighted_rating',
+        'category__rating_sum',
+        'category__rating_count',
+    ):
+        totals[title_id] = (rating_sum, rating_count)
+        weighted_rating = None
+        if category_id is not None:
+            weighted_rating = get_scope_rating(
+                category_sum, category_count, rating_sum, rating_count
+            )
+            ratings['category', category_id][title_id] = weighted_rating
+        if weighted_rating != stored_rating:
+            changed.append(
+                Title(pk=title_id, category_weighted_rating=weighted_rating)
+            )
+
+    genre_ratings = []
+    for title_id, genre_id, genre_sum, genre_count in (
+        Title.genre.through.objects.filter(title_id__in=totals).values_list(
+            'title_id', 'genre_id', 'genre__rating_sum', 'genre__rating_count'
+        )
+    ):
+        weighted_rating = get_scope_rating(
+            genre_sum, genre_count, *totals[title_id]
+        )
+        ratings['genre', genre_id][title_id] = weighted_rating
+        if weighted_rating is not None:
+            genre_ratings.append(
+                GenreRating(
+                    title_id=title_id,
+                    genre_id=genre_id,
+                    weighted_rating=weighted_rating,
+                )
+            )
+
+    Title.objects.bulk_update(changed, ('category_weighted_rating',))
+    GenreRating.objects.filter(title_id__in=totals).delete()
+    GenreRating.objects.bulk_create(genre_ratings)
+
+    entries = defaultdict(list)
+    for pk, category_id, genre_id, title_id, weighted_rating in (
+        LeaderboardEntry.objects.filter(get_scopes_filter([*ratings, *scopes]))
+        .order_by('position')
+        .values_list(
+            'pk', 'category_id', 'genre_id', 'title_id', 'weighted_rating'
+        )
+    ):
+        scope = (
+            ('category', category_id) if category_id else ('genre', genre_id)
+        )
+        entries[scope].append((pk, title_id, weighted_rating))
+    leaderboards = {}
+    for scope in {*ratings, *scopes}:
+        leaderboard = None
+        if scope not in scopes:
+            leaderboard = merge_leaderboard(
+                [entry[1:] for entry in entries[scope]], ratings[scope]
+            )
+        if leaderboard is None:
+            leaderboard = get_top_titles(*scope)
+        leaderboards[scope] = leaderboard
+    store_leaderboards(entries, leaderboards)
+
+
+def refresh_pending() -> None:
+    title_ids, scopes = pending_refresh.title_ids, pending_refresh.scopes
+    if not title_ids and not scopes:
+        return
+    pending_refresh.title_ids, pending_refresh.scopes = set(), set()
+    try:
+        with transaction.atomic():
+            refresh_titles(title_ids, scopes)
+    except Exception:
+        # The change itself is committed already; the next ``rank_titles``
+        # run brings the weighted ratings and leaderboards up to date.
+        logger.exception('Refreshing the ratings of titles failed')
+
+
+def schedule_refresh(title_ids=(), scopes=()) -> None:
+    """
+    Refresh the weighted ratings and leaderboards of titles once the
+    current transaction commits, so writes only pay for their rating
+    totals, and titles changed many times in a transaction are refreshed
+    once.
+    """
+
+    pending_refresh.title_ids.update(title_ids)
+    pending_refresh.scopes.update(scopes)
+    transaction.on_commit(refresh_pending)
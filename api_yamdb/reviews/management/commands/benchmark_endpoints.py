@@ -0,0 +1,354 @@
+import itertools
+import json
+import random
+import statistics
+import time
+
+from django.contrib.auth.tokens import default_token_generator
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from reviews.constants import BENCHMARK_BULK_TITLES
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+API_URL = '/api/v1'
+
+
+def get_percentile(values: list, percent: int) -> float:
+    """Nearest-rank percentile of a sorted list."""
+
+    rank = max(round(percent / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def get_random_row(model, rng: random.Random, *fields) -> dict:
+    """A random stored row, found by id without scanning the table."""
+
+    last_id = model.objects.aggregate(last_id=Max('id'))['last_id']
+    if last_id is None:
+        raise CommandError(
+            f'No {model._meta.verbose_name_plural} stored, '
+            'run generate_dataset first.'
+        )
+    return (
+        model.objects.filter(pk__gte=rng.randint(1, last_id))
+        .order_by('pk')
+        .values('pk', *fields)
+        .first()
+        or model.objects.order_by('pk').values('pk', *fields).first()
+    )
+
+
+def get_routes(rng: random.Random, users: dict) -> dict:
+    """
+    Map route names to the role sending the requests (``'anonymous'``,
+    ``'user'`` or ``'admin'``) and a function building a random
+    ``(method, url, data)`` request of the route.
+    """
+
+    counter = itertools.count()
+
+    def get(url: str) -> tuple:
+        return 'GET', url, None
+
+    def title_url() -> str:
+        return f'{API_URL}/titles/{get_random_row(Title, rng)["pk"]}/'
+
+    def review_url() -> str:
+        review = get_random_row(Review, rng, 'title_id')
+        return f'{API_URL}/titles/{review["title_id"]}/reviews/{review["pk"]}/'
+
+    def comment_url() -> str:
+        comment = get_random_row(Comment, rng, 'title_id', 'review_id')
+        return (
+            f'{API_URL}/titles/{comment["title_id"]}/reviews/'
+            f'{comment["review_id"]}/comments/{comment["pk"]}/'
+        )
+
+    def parent_url(url: str) -> str:
+        return url.rsplit('/', 2)[0] + '/'
+
+    def title_data() -> dict:
+        return {
+            'name': f'Benchmark title {next(counter)}',
+            'year': rng.randint(1900, 2000),
+            'description': 'Benchmark',
+            'genre': [get_random_row(Genre, rng, 'slug')['slug']],
+            'category': get_random_row(Category, rng, 'slug')['slug'],
+        }
+
+    def signup_data() -> dict:
+        username = f'benchmark_signup_{next(counter)}'
+        return {'username': username, 'email': f'{username}@example.com'}
+
+    user = users['user']
+    title_pages = max(Title.objects.count() // 100, 1)
+    return {
+        'TitleViewSet.list': ('anonymous', lambda: get(f'{API_URL}/titles/')),
+        'TitleViewSet.list?page=': ('anonymous', lambda: get(
+            f'{API_URL}/titles/?page={rng.randint(1, title_pages)}'
+        )),
+        'TitleViewSet.list?genre=': ('anonymous', lambda: get(
+            f'{API_URL}/titles/?genre='
+            f'{get_random_row(Genre, rng, "slug")["slug"]}'
+        )),
+        'TitleViewSet.list?category=': ('anonymous', lambda: get(
+            f'{API_URL}/titles/?category='
+            f'{get_random_row(Category, rng, "slug")["slug"]}'
+        )),
+        'TitleViewSet.list?facets=': ('anonymous', lambda: get(
+            f'{API_URL}/titles/?facets=genre,category,year'
+        )),
+        'TitleViewSet.retrieve': ('anonymous', lambda: get(title_url())),
+        'TitleViewSet.create': ('admin', lambda: (
+            'POST', f'{API_URL}/titles/', title_data()
+        )),
+        'TitleViewSet.partial_update': ('admin', lambda: (
+            'PATCH', title_url(), {'name': f'Renamed {next(counter)}'}
+        )),
+        'TitleViewSet.destroy': ('admin', lambda: (
+            'DELETE', title_url(), None
+        )),
+        'TitleViewSet.bulk': ('admin', lambda: (
+            'POST',
+            f'{API_URL}/titles/bulk/',
+            [title_data() for _ in range(BENCHMARK_BULK_TITLES)],
+        )),
+        'GenreViewSet.list': ('anonymous', lambda: get(f'{API_URL}/genres/')),
+        'GenreViewSet.leaderboard': ('anonymous', lambda: get(
+            f'{API_URL}/genres/'
+            f'{get_random_row(Genre, rng, "slug")["slug"]}/leaderboard/'
+        )),
+        'CategoryViewSet.list': ('anonymous', lambda: get(
+            f'{API_URL}/categories/'
+        )),
+        'CategoryViewSet.leaderboard': ('anonymous', lambda: get(
+            f'{API_URL}/categories/'
+            f'{get_random_row(Category, rng, "slug")["slug"]}/leaderboard/'
+        )),
+        'ReviewViewSet.list': ('anonymous', lambda: get(
+            parent_url(review_url())
+        )),
+        'ReviewViewSet.list?pagination=cursor': ('anonymous', lambda: get(
+            parent_url(review_url()) + '?pagination=cursor'
+        )),
+        'ReviewViewSet.retrieve': ('anonymous', lambda: get(review_url())),
+        'ReviewViewSet.create': ('user', lambda: (
+            'POST',
+            title_url() + 'reviews/',
+            {'text': 'Benchmark review', 'score': rng.randint(1, 10)},
+        )),
+        'ReviewViewSet.partial_update': ('admin', lambda: (
+            'PATCH', review_url(), {'score': rng.randint(1, 10)}
+        )),
+        'ReviewViewSet.destroy': ('admin', lambda: (
+            'DELETE', review_url(), None
+        )),
+        'CommentViewSet.list': ('anonymous', lambda: get(
+            parent_url(comment_url())
+        )),
+        'CommentViewSet.list?pagination=cursor': ('anonymous', lambda: get(
+            parent_url(comment_url()) + '?pagination=cursor'
+        )),
+        'CommentViewSet.retrieve': ('anonymous', lambda: get(comment_url())),
+        'CommentViewSet.create': ('user', lambda: (
+            'POST', review_url() + 'comments/', {'text': 'Benchmark comment'}
+        )),
+        'CommentViewSet.partial_update': ('admin', lambda: (
+            'PATCH', comment_url(), {'text': 'Edited benchmark comment'}
+        )),
+        'CommentViewSet.destroy': ('admin', lambda: (
+            'DELETE', comment_url(), None
+        )),
+        'ChangeEventViewSet.list': ('anonymous', lambda: get(
+            f'{API_URL}/changes/?since=0'
+        )),
+        'UserViewSet.me': ('user', lambda: get(f'{API_URL}/users/me/')),
+        'UserViewSet.me (PATCH)': ('user', lambda: (
+            'PATCH', f'{API_URL}/users/me/', {'bio': 'Benchmark'}
+        )),
+        'signup': ('anonymous', lambda: (
+            'POST', f'{API_URL}/auth/signup/', signup_data()
+        )),
+        'get_jwt_token': ('anonymous', lambda: (
+            'POST',
+            f'{API_URL}/auth/token/',
+            {
+                'username': user.username,
+                'confirmation_code': default_token_generator.make_token(user),
+            },
+        )),
+        'check_availability': ('anonymous', lambda: get(
+            f'{API_URL}/auth/check/?username=benchmark_{next(counter)}'
+            f'&email=benchmark_{next(counter)}@example.com'
+        )),
+    }
+
+
+def send(client: Client, request: tuple):
+    method, url, data = request
+    return client.generic(
+        method,
+        url,
+        json.dumps(data) if data is not None else '',
+        content_type='application/json',
+    )
+
+
+class Command(BaseCommand):
+    """
+    Measure the latency and the number of SQL queries of API routes against
+    the configured database: reads as anonymous, writes as a throwaway user
+    and admin, and the signup and token routes.
+
+    The whole run happens in one transaction that is rolled back, and every
+    request runs in its own savepoint that is rolled back too, so writes
+    leave the dataset unchanged and can be repeated. Commit costs and
+    ``on_commit`` work are therefore not measured.
+    """
+
+    help = 'Benchmark API routes and save the results as JSON.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=100,
+            help='Number of measured requests per route.',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=5,
+            help='Number of unmeasured requests per route.',
+        )
+        parser.add_argument(
+            '--route',
+            action='append',
+            help='Only benchmark the given route; can be repeated.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the results to this JSON file.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Seed of the random generator picking the objects.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        rows = {
+            model._meta.model_name: model.objects.count()
+            for model in (Category, Genre, Title, Review, Comment)
+        }
+        with transaction.atomic():
+            users = {
+                role: User.objects.create(
+                    username=f'benchmark_{role}',
+                    email=f'benchmark_{role}@example.com',
+                    role=role,
+                )
+                for role in (User.Role.USER, User.Role.ADMIN)
+            }
+            results = self.run(users, options)
+            transaction.set_rollback(True)
+
+        if options['output']:
+            report = {
+                'created_at': timezone.now().isoformat(),
+                'requests': options['requests'],
+                'rows': rows,
+                'routes': results,
+            }
+            with open(options['output'], 'w') as file:
+                json.dump(report, file, indent=2)
+            self.stdout.write(
+                self.style.SUCCESS(f'Results saved to {options["output"]}')
+            )
+
+    def run(self, users: dict, options: dict) -> dict:
+        routes = get_routes(random.Random(options['seed']), users)
+        names = options['route'] or list(routes)
+        unknown = set(names) - set(routes)
+        if unknown:
+            raise CommandError(f'Unknown routes: {", ".join(sorted(unknown))}')
+
+        clients = {'anonymous': Client()}
+        for role, user in users.items():
+            clients[role] = self.get_client(clients['anonymous'], user)
+
+        results = {}
+        for name in names:
+            role, build_request = routes[name]
+            for _ in range(options['warmup']):
+                self.measure_request(clients[role], build_request())
+            results[name] = self.measure(
+                clients[role], build_request, options['requests']
+            )
+            self.stdout.write(
+                f'{name}: p50 {results[name]["p50_ms"]:.1f} ms, '
+                f'p95 {results[name]["p95_ms"]:.1f} ms, '
+                f'p99 {results[name]["p99_ms"]:.1f} ms, '
+                f'{results[name]["queries"]:.1f} queries'
+            )
+        return results
+
+    def get_client(self, anonymous_client: Client, user: User) -> Client:
+        """A client sending the JWT the API issues to the user."""
+
+        response = send(anonymous_client, (
+            'POST',
+            f'{API_URL}/auth/token/',
+            {
+                'username': user.username,
+                'confirmation_code': default_token_generator.make_token(user),
+            },
+        ))
+        if response.status_code >= 400:
+            raise CommandError(f'Could not get a token for {user}.')
+        return Client(HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}')
+
+    def measure_request(self, client: Client, request: tuple) -> tuple:
+        """
+        Send a request in a savepoint that is rolled back afterwards and
+        return its response, latency and SQL queries.
+        """
+
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = send(client, request)
+                elapsed = (time.perf_counter() - started) * 1000
+            transaction.set_rollback(True)
+        return response, elapsed, len(captured)
+
+    def measure(self, client: Client, build_request, requests: int) -> dict:
+        """Latency percentiles and average query count of a route."""
+
+        timings = []
+        queries = []
+        errors = 0
+        for _ in range(requests):
+            response, elapsed, query_count = self.measure_request(
+                client, build_request()
+            )
+            timings.append(elapsed)
+            queries.append(query_count)
+            errors += response.status_code >= 400
+
+        timings.sort()
+        return {
+            'p50_ms': get_percentile(timings, 50),
+            'p95_ms': get_percentile(timings, 95),
+            'p99_ms': get_percentile(timings, 99),
+            'mean_ms': statistics.mean(timings),
+            'queries': statistics.mean(queries),
+            'errors': errors,
+        }
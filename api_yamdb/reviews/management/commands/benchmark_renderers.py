@@ -0,0 +1,105 @@
+import timeit
+from collections import OrderedDict
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+
+
+def get_title_page(size: int) -> OrderedDict:
+    """A paginated title list shaped like the ``/api/v1/titles/`` output."""
+
+    return OrderedDict(
+        (
+            ('count', size * 10),
+            ('next', 'http://testserver/api/v1/titles/?page=2'),
+            ('previous', None),
+            (
+                'results',
+                [
+                    OrderedDict(
+                        (
+                            ('id', pk),
+                            ('name', f'Произведение {pk}'),
+                            ('year', 1900 + pk % 120),
+                            ('rating', pk % 10 + 1 if pk % 3 else None),
+                            ('description', 'Описание произведения. ' * 5),
+                            (
+                                'genre',
+                                [
+                                    OrderedDict(
+                                        (
+                                            ('name', f'Жанр {genre}'),
+                                            ('slug', f'genre-{genre}'),
+                                        )
+                                    )
+                                    for genre in range(pk % 3 + 1)
+                                ],
+                            ),
+                            (
+                                'category',
+                                OrderedDict(
+                                    (
+                                        ('name', 'Фильм'),
+                                        ('slug', 'movie'),
+                                    )
+                                ),
+                            ),
+                        )
+                    )
+                    for pk in range(1, size + 1)
+                ],
+            ),
+        )
+    )
+
+
+class Command(BaseCommand):
+    """Compare the stdlib and orjson renderers and parsers on a title page."""
+
+    help = 'Benchmark JSON rendering and parsing of a page of titles.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=100,
+            help='Number of titles on the page.',
+        )
+        parser.add_argument(
+            '--number',
+            type=int,
+            default=1000,
+            help='Number of times to render and parse the page.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        page = get_title_page(options['page_size'])
+        number = options['number']
+
+        content = JSONRenderer().render(page)
+        if ORJSONRenderer().render(page) != content:
+            self.stderr.write(
+                self.style.WARNING('Renderers produce different output.')
+            )
+
+        for name, renderer, parser in (
+            ('json', JSONRenderer(), JSONParser()),
+            ('orjson', ORJSONRenderer(), ORJSONParser()),
+        ):
+            render_time = timeit.timeit(
+                lambda: renderer.render(page), number=number
+            )
+            parse_time = timeit.timeit(
+                lambda: parser.parse(BytesIO(content)), number=number
+            )
+            self.stdout.write(
+                f'{name}: render {render_time / number * 1e6:.0f} µs, '
+                f'parse {parse_time / number * 1e6:.0f} µs '
+                f'({len(content)} bytes)'
+            )
@@ -0,0 +1,178 @@
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api_yamdb.db.base import get_pragma_statements
+
+SCHEMA = (
+    'CREATE TABLE title (id INTEGER PRIMARY KEY, name TEXT NOT NULL)',
+    'CREATE TABLE review ('
+    'id INTEGER PRIMARY KEY, title_id INTEGER NOT NULL, '
+    'text TEXT NOT NULL, score INTEGER NOT NULL, pub_date REAL NOT NULL)',
+    'CREATE INDEX review_title_pub_date_idx '
+    'ON review (title_id, pub_date DESC, id)',
+)
+
+READ_QUERY = (
+    'SELECT id, text, score, pub_date FROM review '
+    'WHERE title_id = ? ORDER BY pub_date DESC, id LIMIT 10'
+)
+
+WRITE_QUERY = (
+    'INSERT INTO review (title_id, text, score, pub_date) VALUES (?, ?, ?, ?)'
+)
+
+
+def connect(path: str, pragmas: dict) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, isolation_level=None)
+    for statement in get_pragma_statements(pragmas):
+        conn.execute(statement)
+    return conn
+
+
+def create_database(path: str, pragmas: dict, titles: int) -> None:
+    conn = connect(path, pragmas)
+    for statement in SCHEMA:
+        conn.execute(statement)
+    with conn:
+        conn.execute('BEGIN')
+        conn.executemany(
+            'INSERT INTO title (id, name) VALUES (?, ?)',
+            ((pk, f'Title {pk}') for pk in range(1, titles + 1)),
+        )
+        conn.executemany(
+            WRITE_QUERY,
+            (
+                (pk % titles + 1, 'Review', pk % 10 + 1, pk)
+                for pk in range(titles * 10)
+            ),
+        )
+    conn.close()
+
+
+def run_worker(
+    path, pragmas, titles, writer, start, duration, results
+) -> None:
+    """Run reads or single-row write transactions for ``duration``."""
+
+    conn = connect(path, pragmas)
+    operations = errors = 0
+    # Every worker starts the clock once all of them are connected.
+    start.wait()
+    deadline = time.time() + duration
+    while time.time() < deadline:
+        title_id = operations % titles + 1
+        try:
+            if writer:
+                conn.execute('BEGIN IMMEDIATE')
+                conn.execute(WRITE_QUERY, (title_id, 'Review', 5, time.time()))
+                conn.execute('COMMIT')
+            else:
+                conn.execute(READ_QUERY, (title_id,)).fetchall()
+        except sqlite3.OperationalError:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            errors += 1
+        else:
+            operations += 1
+    conn.close()
+    results.put((writer, operations, errors))
+
+
+class Command(BaseCommand):
+    """
+    Compare read/write throughput of concurrent worker processes with
+    SQLite's default settings and with the pragmas from ``DATABASES``.
+    """
+
+    help = 'Benchmark SQLite pragmas under concurrent worker processes.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--readers',
+            type=int,
+            default=4,
+            help='Number of reading processes.',
+        )
+        parser.add_argument(
+            '--writers',
+            type=int,
+            default=2,
+            help='Number of writing processes.',
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=5,
+            help='Seconds to run each profile for.',
+        )
+        parser.add_argument(
+            '--titles',
+            type=int,
+            default=1000,
+            help='Number of titles to seed (ten reviews each).',
+        )
+
+    def handle(self, *args, **options) -> None:
+        tuned = settings.DATABASES['default'].get('OPTIONS', {}).get(
+            'pragmas', {}
+        )
+        profiles = (
+            # Django's stock backend waits up to 5 seconds on a locked file.
+            ('default', {'busy_timeout': 5000}),
+            ('tuned', tuned),
+        )
+        for name, pragmas in profiles:
+            reads, writes, errors = self.run_profile(pragmas, options)
+            duration = options['duration']
+            self.stdout.write(
+                f'{name}: {reads / duration:.0f} reads/s, '
+                f'{writes / duration:.0f} writes/s, {errors} errors'
+            )
+
+    def run_profile(self, pragmas: dict, options: dict) -> tuple:
+        context = multiprocessing.get_context('spawn')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'benchmark.sqlite3')
+            create_database(path, pragmas, options['titles'])
+
+            workers_count = options['readers'] + options['writers']
+            start = context.Barrier(workers_count + 1)
+            results = context.Queue()
+            workers = [
+                context.Process(
+                    target=run_worker,
+                    args=(
+                        path,
+                        pragmas,
+                        options['titles'],
+                        writer,
+                        start,
+                        options['duration'],
+                        results,
+                    ),
+                )
+                for writer in (
+                    [False] * options['readers'] + [True] * options['writers']
+                )
+            ]
+            for worker in workers:
+                worker.start()
+            start.wait()
+
+            reads = writes = errors = 0
+            for _ in workers:
+                writer, operations, worker_errors = results.get()
+                if writer:
+                    writes += operations
+                else:
+                    reads += operations
+                errors += worker_errors
+            for worker in workers:
+                worker.join()
+        return reads, writes, errors
@@ -0,0 +1,212 @@
+import itertools
+import math
+import random
+import time
+from typing import Iterable, Iterator
+
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+
+from reviews.constants import IMPORT_BATCH_SIZE, MAX_NUMB, MIN_NUMB
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.ratings import recalculate_ratings
+from users.models import User
+
+WORDS = (
+    'great', 'story', 'music', 'plot', 'actor', 'classic', 'boring', 'fun',
+    'sound', 'ending', 'scene', 'book', 'movie', 'song', 'author', 'rhythm',
+)
+
+
+def get_next_id(model) -> int:
+    return (model.objects.aggregate(last_id=Max('id'))['last_id'] or 0) + 1
+
+
+def iter_batches(objects: Iterable, batch_size: int) -> Iterator[list]:
+    objects = iter(objects)
+    while batch := list(itertools.islice(objects, batch_size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    """
+    Fill the database with a synthetic catalog of a given size.
+
+    Rows get explicit ids following the largest stored ones, so the command
+    can be run on a non-empty database and foreign keys can be computed
+    instead of read back. Every batch is committed separately.
+    """
+
+    help = 'Generate a synthetic dataset with bulk inserts.'
+
+    def add_arguments(self, parser) -> None:
+        for name, default in (
+            ('categories', 10),
+            ('genres', 30),
+            ('titles', 1000),
+            ('reviews', 10000),
+            ('comments', 30000),
+        ):
+            parser.add_argument(
+                f'--{name}',
+                type=int,
+                default=default,
+                help=f'Number of {name} to create.',
+            )
+        parser.add_argument(
+            '--users',
+            type=int,
+            help='Number of users to create. Defaults to the smallest number '
+            'allowing one review per user and title.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Number of rows per bulk_create batch.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Seed of the random generator.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        titles, reviews = options['titles'], options['reviews']
+        if titles and not options['categories']:
+            raise CommandError('Titles need at least one category.')
+        if reviews and not titles:
+            raise CommandError('Reviews need at least one title.')
+        if options['comments'] and not reviews:
+            raise CommandError('Comments need at least one review.')
+        min_users = math.ceil(reviews / titles) if titles else 0
+        if options['users'] is None:
+            options['users'] = max(min_users, 1)
+        elif options['users'] < max(min_users, 1):
+            raise CommandError(
+                f'{reviews} reviews of {titles} titles need at least '
+                f'{max(min_users, 1)} users.'
+            )
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+
+        self.categories = self.insert(
+            Category, options['categories'], self.build_category
+        )
+        self.genres = self.insert(Genre, options['genres'], self.build_genre)
+        self.titles = self.insert(Title, titles, self.build_title)
+        if self.genres:
+            self.insert(
+                Title.genre.through,
+                titles,
+                self.build_title_genres,
+                flat=True,
+            )
+        self.users = self.insert(User, options['users'], self.build_user)
+        self.reviews = self.insert(Review, reviews, self.build_review)
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            # bulk_create skips the signals maintaining the ratings.
+            recalculate_ratings(
+                Title.objects.filter(
+                    pk__gte=self.titles.start, pk__lt=self.titles.stop
+                )
+            )
+        self.report('ratings', titles, started)
+
+        self.insert(Comment, options['comments'], self.build_comment)
+
+    def insert(self, model, count: int, build, flat: bool = False) -> range:
+        """
+        Insert ``count`` objects made by ``build(number, pk)`` in batches.
+
+        Returns the range of the ids given to the objects. With ``flat``
+        ``build`` returns a list of objects per number instead, and the
+        returned range is meaningless.
+        """
+
+        started = time.perf_counter()
+        first_id = get_next_id(model)
+        objects = (
+            build(number, first_id + number) for number in range(count)
+        )
+        if flat:
+            objects = itertools.chain.from_iterable(objects)
+        rows = 0
+        for batch in iter_batches(objects, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            rows += len(batch)
+        self.report(model._meta.db_table, rows, started)
+        return range(first_id, first_id + count)
+
+    def report(self, name: str, rows: int, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        rate = rows / elapsed if elapsed else rows
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{name}: {rows} rows in {elapsed:.2f}s ({rate:.0f} rows/s)'
+            )
+        )
+
+    def get_text(self, words: int) -> str:
+        return ' '.join(self.rng.choices(WORDS, k=words)).capitalize()
+
+    def build_category(self, number: int, pk: int) -> Category:
+        return Category(id=pk, name=f'Category {pk}', slug=f'category-{pk}')
+
+    def build_genre(self, number: int, pk: int) -> Genre:
+        return Genre(id=pk, name=f'Genre {pk}', slug=f'genre-{pk}')
+
+    def build_title(self, number: int, pk: int) -> Title:
+        return Title(
+            id=pk,
+            name=f'{self.get_text(3)} {pk}',
+            year=self.rng.randint(1900, 2020),
+            description=self.get_text(12),
+            category_id=self.rng.choice(self.categories),
+        )
+
+    def build_title_genres(self, number: int, pk: int) -> list:
+        genre_ids = self.rng.sample(
+            self.genres, k=min(len(self.genres), self.rng.randint(1, 3))
+        )
+        return [
+            Title.genre.through(
+                title_id=self.titles[number], genre_id=genre_id
+            )
+            for genre_id in genre_ids
+        ]
+
+    def build_user(self, number: int, pk: int) -> User:
+        return User(
+            id=pk,
+            username=f'user{pk}',
+            email=f'user{pk}@example.com',
+            password=UNUSABLE_PASSWORD_PREFIX,
+        )
+
+    def build_review(self, number: int, pk: int) -> Review:
+        # Reviews go round the titles, so each author reviews a title once.
+        return Review(
+            id=pk,
+            title_id=self.titles[number % len(self.titles)],
+            author_id=self.users[number // len(self.titles)],
+            text=self.get_text(20),
+            score=self.rng.randint(MIN_NUMB, MAX_NUMB),
+        )
+
+    def build_comment(self, number: int, pk: int) -> Comment:
+        review = self.rng.randrange(len(self.reviews))
+        return Comment(
+            id=pk,
+            review_id=self.reviews[review],
+            title_id=self.titles[review % len(self.titles)],
+            author_id=self.rng.choice(self.users),
+            text=self.get_text(10),
+        )
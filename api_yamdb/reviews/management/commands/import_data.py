@@ -1,11 +1,17 @@
+import json
 import os
+import time
+from typing import Iterator
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db import transaction
 
 import pandas as pd
 
+from reviews.constants import IMPORT_BATCH_SIZE, IMPORT_LOOKUP_BATCH_SIZE
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.ratings import recalculate_ratings
 from users.models import User
 
 
@@ -14,14 +20,142 @@ def get_data_frame(data_dir: str, filename: str) -> pd.DataFrame:
     return pd.read_csv(file_path)
 
 
+def iter_data_frames(
+    data_dir: str, filename: str, chunk_size: int = None, skip: int = 0
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield the rows of a CSV file as data frames of at most ``chunk_size``
+    rows, dropping the first ``skip`` rows. Without a chunk size the whole
+    file is yielded at once.
+    """
+
+    if not chunk_size:
+        yield get_data_frame(data_dir, filename).iloc[skip:]
+        return
+
+    file_path = os.path.join(data_dir, filename)
+    with pd.read_csv(file_path, chunksize=chunk_size) as reader:
+        for df in reader:
+            if skip >= len(df):
+                skip -= len(df)
+                continue
+            yield df.iloc[skip:]
+            skip = 0
+
+
+def get_text(value) -> str:
+    """Return a CSV cell as text, treating empty cells as blank strings."""
+
+    return '' if pd.isna(value) else value
+
+
+def iter_id_batches(ids: pd.Series) -> Iterator[list]:
+    """Yield the distinct ids of a column in query-sized batches."""
+
+    ids = [int(pk) for pk in pd.unique(ids.dropna())]
+    for start in range(0, len(ids), IMPORT_LOOKUP_BATCH_SIZE):
+        yield ids[start:start + IMPORT_LOOKUP_BATCH_SIZE]
+
+
+def get_ids(model, ids: pd.Series) -> set:
+    """Return which of the given primary keys are stored for the model."""
+
+    found = set()
+    for batch in iter_id_batches(ids):
+        found.update(
+            model.objects.filter(id__in=batch).values_list('id', flat=True)
+        )
+    return found
+
+
+def get_review_titles(ids: pd.Series) -> dict:
+    """Map the given review ids to the ids of their titles."""
+
+    review_titles = {}
+    for batch in iter_id_batches(ids):
+        review_titles.update(
+            Review.objects.filter(id__in=batch).values_list('id', 'title_id')
+        )
+    return review_titles
+
+
+class ImportCheckpoint:
+    """Number of committed rows per file, persisted between runs."""
+
+    def __init__(self, path: str, resume: bool) -> None:
+        self.path = path
+        self.rows = {}
+        if resume and os.path.exists(path):
+            with open(path) as file:
+                self.rows = json.load(file)
+
+    def get(self, filename: str) -> int:
+        return self.rows.get(filename, 0)
+
+    def save(self, filename: str, rows: int) -> None:
+        self.rows[filename] = rows
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump(self.rows, file)
+        os.replace(temp_path, self.path)
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
 class Command(BaseCommand):
     """Class implesments data parsing into a database."""
 
+    help = 'Import the CSV files from static/data into the database.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Insert rows with chunked bulk_create, one transaction per '
+            'file.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Number of rows per bulk_create batch.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Stream each file in chunks of this many rows, committing '
+            'every chunk separately. Implies --bulk.',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Skip the rows committed by a previous interrupted bulk '
+            'import.',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default=os.path.join(
+                settings.BASE_DIR, 'import_data.checkpoint.json'
+            ),
+            help='File storing the progress of a bulk import.',
+        )
+
     def handle(self, *args, **kwargs) -> None:
         """Method for release imports."""
 
         data_dir = os.path.join(settings.BASE_DIR, 'static/data')
 
+        if kwargs['bulk'] or kwargs['chunk_size']:
+            self.bulk_import(
+                data_dir,
+                kwargs['batch_size'],
+                kwargs['chunk_size'],
+                ImportCheckpoint(kwargs['checkpoint'], kwargs['resume']),
+            )
+            return
+
         self.import_categories(data_dir)
         self.import_genres(data_dir)
         self.import_titles(data_dir)
@@ -30,6 +164,150 @@ class Command(BaseCommand):
         self.import_reviews(data_dir)
         self.import_comments(data_dir)
 
+    def bulk_import(
+        self,
+        data_dir: str,
+        batch_size: int,
+        chunk_size: int,
+        checkpoint: ImportCheckpoint,
+    ) -> None:
+        """
+        Import every file with bulk inserts, resolving foreign keys from
+        id maps built per chunk. Each chunk is committed in its own
+        transaction and recorded in the checkpoint, so a crashed import can
+        be resumed; re-importing a chunk is harmless as conflicts are
+        ignored.
+        """
+
+        files = (
+            ('category.csv', Category, self.build_categories),
+            ('genre.csv', Genre, self.build_genres),
+            ('titles.csv', Title, self.build_titles),
+            ('genre_title.csv', Title.genre.through, self.build_genre_titles),
+            ('users.csv', User, self.build_users),
+            ('review.csv', Review, self.build_reviews),
+            ('comments.csv', Comment, self.build_comments),
+        )
+        for filename, model, build_objects in files:
+            started = time.perf_counter()
+            committed = checkpoint.get(filename)
+            total = imported = 0
+            for df in iter_data_frames(
+                data_dir, filename, chunk_size, skip=committed
+            ):
+                with transaction.atomic():
+                    objects = build_objects(df)
+                    model.objects.bulk_create(
+                        objects, batch_size=batch_size, ignore_conflicts=True
+                    )
+                total += len(df)
+                imported += len(objects)
+                checkpoint.save(filename, committed + total)
+            if model is Review:
+                # bulk_create skips the signals maintaining the ratings.
+                with transaction.atomic():
+                    recalculate_ratings()
+            self.report(filename, total, imported, started)
+        checkpoint.clear()
+
+    def report(
+        self, filename: str, total: int, imported: int, started: float
+    ) -> None:
+        """Print the import speed of a single file."""
+
+        elapsed = time.perf_counter() - started
+        rate = total / elapsed if elapsed else total
+        message = (
+            f'{filename}: {total} rows in {elapsed:.2f}s '
+            f'({rate:.0f} rows/s)'
+        )
+        skipped = total - imported
+        if skipped:
+            message += f', {skipped} rows with unknown references skipped'
+        self.stdout.write(self.style.SUCCESS(message))
+
+    def build_categories(self, df: pd.DataFrame) -> list:
+        return [
+            Category(id=row.id, name=row.name, slug=row.slug)
+            for row in df.itertuples(index=False)
+        ]
+
+    def build_genres(self, df: pd.DataFrame) -> list:
+        return [
+            Genre(id=row.id, name=row.name, slug=row.slug)
+            for row in df.itertuples(index=False)
+        ]
+
+    def build_titles(self, df: pd.DataFrame) -> list:
+        category_ids = get_ids(Category, df['category'])
+        return [
+            Title(
+                id=row.id,
+                name=row.name,
+                year=row.year,
+                category_id=row.category,
+            )
+            for row in df.itertuples(index=False)
+            if row.category in category_ids
+        ]
+
+    def build_genre_titles(self, df: pd.DataFrame) -> list:
+        title_ids = get_ids(Title, df['title_id'])
+        genre_ids = get_ids(Genre, df['genre_id'])
+        return [
+            Title.genre.through(title_id=row.title_id, genre_id=row.genre_id)
+            for row in df.itertuples(index=False)
+            if row.title_id in title_ids and row.genre_id in genre_ids
+        ]
+
+    def build_users(self, df: pd.DataFrame) -> list:
+        return [
+            User(
+                id=row.id,
+                username=row.username,
+                email=row.email,
+                role=row.role,
+                bio=get_text(row.bio),
+                first_name=get_text(row.first_name),
+                last_name=get_text(row.last_name),
+                is_staff=True,
+                is_superuser=True,
+            )
+            for row in df.itertuples(index=False)
+        ]
+
+    def build_reviews(self, df: pd.DataFrame) -> list:
+        title_ids = get_ids(Title, df['title_id'])
+        user_ids = get_ids(User, df['author'])
+        return [
+            Review(
+                id=row.id,
+                title_id=row.title_id,
+                text=row.text,
+                author_id=row.author,
+                score=row.score,
+                pub_date=row.pub_date,
+            )
+            for row in df.itertuples(index=False)
+            if row.title_id in title_ids and row.author in user_ids
+        ]
+
+    def build_comments(self, df: pd.DataFrame) -> list:
+        review_titles = get_review_titles(df['review_id'])
+        user_ids = get_ids(User, df['author'])
+        return [
+            Comment(
+                id=row.id,
+                review_id=row.review_id,
+                title_id=review_titles[row.review_id],
+                text=row.text,
+                author_id=row.author,
+                pub_date=row.pub_date,
+            )
+            for row in df.itertuples(index=False)
+            if row.review_id in review_titles and row.author in user_ids
+        ]
+
     def import_categories(self, data_dir: str) -> None:
         """Import categories into database."""
 
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.leaderboards import rebuild_leaderboards
+from reviews.ranking import rank_titles
+
+
+class Command(BaseCommand):
+    """
+    Recompute the Bayesian-weighted ratings of all titles and rebuild the
+    category and genre leaderboards.
+    """
+
+    help = 'Recompute weighted title ratings overall, per category and genre.'
+
+    def handle(self, *args, **options) -> None:
+        started = time.perf_counter()
+        with transaction.atomic():
+            ranked = rank_titles()
+            entries = rebuild_leaderboards()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{ranked["titles"]} title(s) updated, '
+                f'{ranked["genre_ratings"]} genre rating(s) and {entries} '
+                f'leaderboard entries stored in '
+                f'{time.perf_counter() - started:.2f}s.'
+            )
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from reviews.search import rebuild_indexes
+
+
+class Command(BaseCommand):
+    """Rebuild the full-text search indexes."""
+
+    help = 'Rebuild the SQLite FTS5 indexes used by ?search=.'
+
+    def handle(self, *args, **options) -> None:
+        if connection.vendor != 'sqlite':
+            raise CommandError(
+                'Full-text indexes are only available on SQLite.'
+            )
+
+        for index_table in rebuild_indexes():
+            self.stdout.write(f'{index_table} rebuilt.')
+        self.stdout.write(self.style.SUCCESS('Search indexes rebuilt.'))
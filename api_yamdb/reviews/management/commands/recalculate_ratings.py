@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.ratings import recalculate_ratings
+
+
+class Command(BaseCommand):
+    """Recompute stored title ratings and report any drift."""
+
+    help = 'Recompute stored title rating totals from reviews.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report drifted titles, do not fix them.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        with transaction.atomic():
+            drifted = recalculate_ratings(commit=not options['dry_run'])
+
+        for title, (old_sum, old_count) in drifted:
+            self.stdout.write(
+                f'Title #{title.pk} "{title}": '
+                f'sum {old_sum} -> {title.rating_sum}, '
+                f'count {old_count} -> {title.rating_count}'
+            )
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('No rating drift found.'))
+        elif options['dry_run']:
+            self.stdout.write(
+                self.style.WARNING(f'{len(drifted)} title(s) drifted.')
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f'{len(drifted)} title(s) fixed.')
+            )
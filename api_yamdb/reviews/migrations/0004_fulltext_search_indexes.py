@@ -0,0 +1,90 @@
+from django.db import migrations
+
+SEARCH_INDEXES = (
+    ('reviews_title', ('name',)),
+    ('reviews_genre', ('name',)),
+    ('reviews_category', ('name',)),
+    ('reviews_review', ('text',)),
+    ('reviews_comment', ('text',)),
+)
+
+
+def get_create_statements(table, columns):
+    index = f'{table}_fts'
+    names = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    delete_old = (
+        f"INSERT INTO {index}({index}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = (
+        f'INSERT INTO {index}(rowid, {names}) VALUES (new.id, {new_values});'
+    )
+    return (
+        f"CREATE VIRTUAL TABLE {index} USING fts5({names}, "
+        f"content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        f'CREATE TRIGGER {index}_ai AFTER INSERT ON {table} '
+        f'BEGIN {insert_new} END',
+        f'CREATE TRIGGER {index}_ad AFTER DELETE ON {table} '
+        f'BEGIN {delete_old} END',
+        f'CREATE TRIGGER {index}_au AFTER UPDATE OF {names} ON {table} '
+        f'BEGIN {delete_old} {insert_new} END',
+        f"INSERT INTO {index}({index}) VALUES ('rebuild')",
+    )
+
+
+def get_drop_statements(table, columns):
+    index = f'{table}_fts'
+    return (
+        f'DROP TRIGGER IF EXISTS {index}_ai',
+        f'DROP TRIGGER IF EXISTS {index}_ad',
+        f'DROP TRIGGER IF EXISTS {index}_au',
+        f'DROP TABLE IF EXISTS {index}',
+    )
+
+
+def get_trigger_statements(table, columns):
+    return (
+        *get_drop_statements(table, columns)[:3],
+        *get_create_statements(table, columns)[1:],
+    )
+
+
+def restore_triggers(schema_editor, tables):
+    # SQLite's AddField and RemoveField remake the table, which drops the
+    # triggers keeping its full-text index in sync.
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table, columns in SEARCH_INDEXES:
+        if table in tables:
+            for statement in get_trigger_statements(table, columns):
+                schema_editor.execute(statement)
+
+
+def run_statements(schema_editor, get_statements):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table, columns in SEARCH_INDEXES:
+        for statement in get_statements(table, columns):
+            schema_editor.execute(statement)
+
+
+def create_indexes(apps, schema_editor):
+    run_statements(schema_editor, get_create_statements)
+
+
+def drop_indexes(apps, schema_editor):
+    run_statements(schema_editor, get_drop_statements)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_pub_date_cursor_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
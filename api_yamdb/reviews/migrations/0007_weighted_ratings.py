@@ -0,0 +1,75 @@
+# Generated by Django 3.2 on 2026-10-18 03:03
+
+from importlib import import_module
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+search_indexes = import_module('reviews.migrations.0004_fulltext_search_indexes')
+
+
+def restore_search_triggers(apps, schema_editor):
+    search_indexes.restore_triggers(schema_editor, ('reviews_title',))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_change_events'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            migrations.RunPython.noop, restore_search_triggers
+        ),
+        migrations.CreateModel(
+            name='GenreRating',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weighted_rating', models.FloatField(verbose_name='Взвешенный рейтинг')),
+            ],
+            options={
+                'verbose_name': 'Рейтинг в жанре',
+                'verbose_name_plural': 'Рейтинги в жанрах',
+            },
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='category_weighted_rating',
+            field=models.FloatField(editable=False, null=True, verbose_name='Взвешенный рейтинг в категории'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='weighted_rating',
+            field=models.FloatField(editable=False, null=True, verbose_name='Взвешенный рейтинг'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-weighted_rating', 'id'], name='title_weighted_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', '-category_weighted_rating', 'id'], name='title_category_weighted_idx'),
+        ),
+        migrations.AddField(
+            model_name='genrerating',
+            name='genre',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='title_ratings', to='reviews.genre', verbose_name='Жанр'),
+        ),
+        migrations.AddField(
+            model_name='genrerating',
+            name='title',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='genre_ratings', to='reviews.title', verbose_name='Произведение'),
+        ),
+        migrations.AddIndex(
+            model_name='genrerating',
+            index=models.Index(fields=['genre', '-weighted_rating', 'title'], name='genre_rating_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='genrerating',
+            constraint=models.UniqueConstraint(fields=('genre', 'title'), name='unique_genre_rating'),
+        ),
+        migrations.RunPython(
+            restore_search_triggers, migrations.RunPython.noop
+        ),
+    ]
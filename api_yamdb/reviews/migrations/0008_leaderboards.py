@@ -0,0 +1,101 @@
+# Generated by Django 3.2 on 2026-10-18 03:05
+
+from importlib import import_module
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Sum
+
+search_indexes = import_module('reviews.migrations.0004_fulltext_search_indexes')
+
+
+def fill_scope_rating_totals(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    for model_name, lookup in (('Category', 'category'), ('Genre', 'genre')):
+        model = apps.get_model('reviews', model_name)
+        totals = (
+            Title.objects.filter(**{f'{lookup}__isnull': False})
+            .order_by()
+            .values(lookup)
+            .annotate(
+                score_sum=Sum('rating_sum'), score_count=Sum('rating_count')
+            )
+        )
+        for row in totals:
+            model.objects.filter(pk=row[lookup]).update(
+                rating_sum=row['score_sum'] or 0,
+                rating_count=row['score_count'] or 0,
+            )
+
+
+def restore_search_triggers(apps, schema_editor):
+    search_indexes.restore_triggers(
+        schema_editor, ('reviews_category', 'reviews_genre')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_weighted_ratings'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            migrations.RunPython.noop, restore_search_triggers
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(verbose_name='Место')),
+                ('weighted_rating', models.FloatField(verbose_name='Взвешенный рейтинг')),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard', to='reviews.category', verbose_name='Категория')),
+                ('genre', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard', to='reviews.genre', verbose_name='Жанр')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Место в рейтинге',
+                'verbose_name_plural': 'Места в рейтингах',
+                'ordering': ('position',),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('category__isnull', False), ('genre__isnull', True)), models.Q(('category__isnull', True), ('genre__isnull', False)), _connector='OR'), name='leaderboard_entry_scope'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('category', 'position'), name='unique_category_leaderboard_position'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('genre', 'position'), name='unique_genre_leaderboard_position'),
+        ),
+        migrations.RunPython(
+            fill_scope_rating_totals, migrations.RunPython.noop
+        ),
+        migrations.RunPython(
+            restore_search_triggers, migrations.RunPython.noop
+        ),
+    ]
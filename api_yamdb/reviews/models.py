@@ -1,8 +1,11 @@
+from typing import Optional
+
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 
 from reviews.constants import (
+    MAX_ENTITY_LENGTH,
     MAX_NAME_LENGTH,
     MAX_NUMB,
     MAX_TEXT_LENGTH,
@@ -25,9 +28,24 @@ class BaseModel(models.Model):
         unique=True,
         verbose_name='Слаг',
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок',
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок',
+    )
 
     class Meta:
         ordering = ('name',)
+        indexes = (
+            models.Index(
+                fields=('name',), name='%(app_label)s_%(class)s_name_idx'
+            ),
+        )
         abstract = True
 
     def __str__(self) -> str:
@@ -77,15 +95,156 @@ class Title(models.Model):
         verbose_name='Жанр',
         related_name='titles',
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок',
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок',
+    )
+    weighted_rating = models.FloatField(
+        null=True,
+        editable=False,
+        verbose_name='Взвешенный рейтинг',
+    )
+    category_weighted_rating = models.FloatField(
+        null=True,
+        editable=False,
+        verbose_name='Взвешенный рейтинг в категории',
+    )
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('name',)
+        indexes = (
+            models.Index(fields=('name',), name='title_name_idx'),
+            models.Index(
+                fields=('-weighted_rating', 'id'),
+                name='title_weighted_rating_idx',
+            ),
+            models.Index(
+                fields=('category', '-category_weighted_rating', 'id'),
+                name='title_category_weighted_idx',
+            ),
+            models.Index(
+                fields=('category', 'name'), name='title_category_name_idx'
+            ),
+            models.Index(fields=('year', 'name'), name='title_year_name_idx'),
+        )
 
     def __str__(self) -> str:
         return self.name[:MAX_NAME_LENGTH]
 
+    @classmethod
+    def from_db(cls, db, field_names, values) -> 'Title':
+        """Remember the stored category to move rating totals from it."""
+
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        if 'category_id' in loaded:
+            instance._loaded_category_id = loaded['category_id']
+        return instance
+
+    @property
+    def rating(self) -> Optional[float]:
+        """Average review score, maintained incrementally."""
+
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+
+class GenreRating(models.Model):
+    """Weighted rating of a title among the titles of one of its genres."""
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='genre_ratings',
+        verbose_name='Произведение',
+    )
+    genre = models.ForeignKey(
+        Genre,
+        on_delete=models.CASCADE,
+        related_name='title_ratings',
+        verbose_name='Жанр',
+    )
+    weighted_rating = models.FloatField(verbose_name='Взвешенный рейтинг')
+
+    class Meta:
+        verbose_name = 'Рейтинг в жанре'
+        verbose_name_plural = 'Рейтинги в жанрах'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('genre', 'title'), name='unique_genre_rating'
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('genre', '-weighted_rating', 'title'),
+                name='genre_rating_idx',
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f'{self.genre_id}: {self.title_id} {self.weighted_rating}'
+
+
+class LeaderboardEntry(models.Model):
+    """A place in the top titles of a category or of a genre."""
+
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name='leaderboard',
+        verbose_name='Категория',
+    )
+    genre = models.ForeignKey(
+        Genre,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name='leaderboard',
+        verbose_name='Жанр',
+    )
+    position = models.PositiveSmallIntegerField(verbose_name='Место')
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='leaderboard_entries',
+        verbose_name='Произведение',
+    )
+    weighted_rating = models.FloatField(verbose_name='Взвешенный рейтинг')
+
+    class Meta:
+        verbose_name = 'Место в рейтинге'
+        verbose_name_plural = 'Места в рейтингах'
+        ordering = ('position',)
+        constraints = (
+            models.CheckConstraint(
+                check=(
+                    models.Q(category__isnull=False, genre__isnull=True)
+                    | models.Q(category__isnull=True, genre__isnull=False)
+                ),
+                name='leaderboard_entry_scope',
+            ),
+            models.UniqueConstraint(
+                fields=('category', 'position'),
+                name='unique_category_leaderboard_position',
+            ),
+            models.UniqueConstraint(
+                fields=('genre', 'position'),
+                name='unique_genre_leaderboard_position',
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f'{self.category or self.genre}: {self.position}'
+
 
 class Review(models.Model):
     """Review model."""
@@ -122,6 +281,22 @@ class Review(models.Model):
     def __str__(self) -> str:
         return self.text[:MAX_TEXT_LENGTH]
 
+    @classmethod
+    def from_db(cls, db, field_names, values) -> 'Review':
+        """Remember the stored title and score to compute rating deltas."""
+
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        if 'title_id' in loaded and 'score' in loaded:
+            instance._loaded_rating = (loaded['title_id'], loaded['score'])
+        return instance
+
+    def save(self, *args, **kwargs) -> None:
+        """Save the review and update title totals in one transaction."""
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
@@ -130,6 +305,12 @@ class Review(models.Model):
                 fields=('title', 'author'), name='unique_review'
             ),
         )
+        indexes = (
+            models.Index(
+                fields=('title', '-pub_date', 'id'),
+                name='review_title_pub_date_idx',
+            ),
+        )
         ordering = ('-pub_date',)
 
 
@@ -162,7 +343,49 @@ class Comment(models.Model):
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(
+                fields=('review', '-pub_date', 'id'),
+                name='comment_review_pub_date_idx',
+            ),
+        )
         ordering = ('-pub_date',)
 
     def __str__(self) -> str:
         return self.text[:MAX_TEXT_LENGTH]
+
+
+class ChangeEvent(models.Model):
+    """
+    Append-only log of catalog writes.
+
+    Events are written in the transaction of the change itself, and SQLite
+    holds its write lock until commit, so ids grow in commit order and can be
+    used as a sync cursor.
+    """
+
+    class Action(models.TextChoices):
+        CREATED = 'created'
+        UPDATED = 'updated'
+        DELETED = 'deleted'
+
+    entity = models.CharField(
+        max_length=MAX_ENTITY_LENGTH, verbose_name='Сущность'
+    )
+    action = models.CharField(
+        max_length=max(map(len, Action.values)),
+        choices=Action.choices,
+        verbose_name='Действие',
+    )
+    key = models.JSONField(verbose_name='Ключ объекта')
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Время изменения'
+    )
+
+    class Meta:
+        verbose_name = 'Изменение'
+        verbose_name_plural = 'Изменения'
+        ordering = ('id',)
+
+    def __str__(self) -> str:
+        return f'{self.entity} {self.action} {self.key}'
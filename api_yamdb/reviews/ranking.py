@@ -0,0 +1,204 @@
+from django.db import transaction
+
+import numpy as np
+
+from reviews.constants import BAYESIAN_PRIOR_WEIGHT, RANKING_BATCH_SIZE
+from reviews.models import Category, Genre, GenreRating, Title
+from reviews.utils import titles_updated
+
+
+def get_group_totals(
+    sums: np.ndarray, counts: np.ndarray, groups: np.ndarray, size: int
+) -> tuple:
+    """
+    Score sums and counts of every group, given per-title totals and the
+    group index of every title.
+    """
+
+    return (
+        np.bincount(groups, weights=sums, minlength=size),
+        np.bincount(groups, weights=counts, minlength=size),
+    )
+
+
+def get_means(sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Mean scores; NaN where there are no reviews."""
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+
+def get_weighted_ratings(
+    sums: np.ndarray,
+    counts: np.ndarray,
+    prior_means: np.ndarray,
+    prior_weight: float = BAYESIAN_PRIOR_WEIGHT,
+) -> np.ndarray:
+    """
+    Bayesian averages of the titles: the mean score pulled towards the
+    prior mean ``C`` as if the title had ``m`` more reviews scoring it,
+    ``(rating_sum + m * C) / (rating_count + m)``.
+    """
+
+    return (sums + prior_weight * prior_means) / (counts + prior_weight)
+
+
+def to_optional(value: float):
+    return None if np.isnan(value) else float(value)
+
+
+def store_scope_totals(model, scope_ids, sums, counts) -> None:
+    """Replace the rating totals of all categories or genres."""
+
+    model.objects.update(rating_sum=0, rating_count=0)
+    model.objects.bulk_update(
+        [
+            model(pk=int(pk), rating_sum=int(total), rating_count=int(count))
+            for pk, total, count in zip(scope_ids, sums, counts)
+            if count
+        ],
+        ('rating_sum', 'rating_count'),
+        batch_size=RANKING_BATCH_SIZE,
+    )
+
+
+def rank_titles() -> dict:
+    """
+    Recompute the overall, per category and per genre weighted ratings of
+    every title and store the ones that changed. Titles without reviews get
+    no weighted rating. The rating totals of categories and genres, kept up
+    to date by review signals, are recomputed as well.
+
+    Returns the number of updated titles and stored genre ratings.
+    """
+
+    with transaction.atomic():
+        # Both reads see the same snapshot of the titles and their genres.
+        rows = list(
+            Title.objects.order_by('pk').values_list(
+                'pk',
+                'category_id',
+                'rating_sum',
+                'rating_count',
+                'weighted_rating',
+                'category_weighted_rating',
+            )
+        )
+        genre_rows = list(
+            Title.genre.through.objects.values_list('title_id', 'genre_id')
+        )
+    if not rows:
+        with transaction.atomic():
+            GenreRating.objects.all().delete()
+            store_scope_totals(Category, (), (), ())
+            store_scope_totals(Genre, (), (), ())
+        return {'titles': 0, 'genre_ratings': 0}
+
+    (
+        title_ids,
+        category_ids,
+        sums,
+        counts,
+        weighted_ratings,
+        category_weighted_ratings,
+    ) = zip(*rows)
+    title_ids = np.array(title_ids, dtype=np.int64)
+    sums = np.array(sums, dtype=np.float64)
+    counts = np.array(counts, dtype=np.float64)
+    # Ratings never computed are loaded as NaN.
+    stored = np.column_stack(
+        (
+            np.array(weighted_ratings, dtype=np.float64),
+            np.array(category_weighted_ratings, dtype=np.float64),
+        )
+    )
+
+    rated = counts > 0
+    overall = get_weighted_ratings(
+        sums, counts, get_means(sums.sum(), counts.sum())
+    )
+    overall[~rated] = np.nan
+
+    has_category = np.array([pk is not None for pk in category_ids])
+    category_ids, categories = np.unique(
+        np.array([pk or 0 for pk in category_ids], dtype=np.int64),
+        return_inverse=True,
+    )
+    category_sums, category_counts = get_group_totals(
+        sums, counts, categories, len(category_ids)
+    )
+    by_category = get_weighted_ratings(
+        sums,
+        counts,
+        get_means(category_sums, category_counts)[categories],
+    )
+    by_category[~(rated & has_category)] = np.nan
+    # Titles without a category are grouped under the id 0.
+    stored_categories = category_ids > 0
+
+    computed = np.column_stack((overall, by_category))
+    changed = ~(
+        np.isclose(computed, stored) | (np.isnan(computed) & np.isnan(stored))
+    ).all(axis=1)
+    titles = [
+        Title(
+            pk=int(title_ids[index]),
+            weighted_rating=to_optional(computed[index, 0]),
+            category_weighted_rating=to_optional(computed[index, 1]),
+        )
+        for index in np.flatnonzero(changed)
+    ]
+
+    genre_ratings = []
+    genre_ids = genre_sums = genre_counts = ()
+    pairs = np.array(genre_rows, dtype=np.int64).reshape(-1, 2)
+    title_indexes = np.searchsorted(title_ids, pairs[:, 0])
+    # Links to titles missing from the loaded ones are skipped.
+    known = title_indexes < len(title_ids)
+    known[known] = title_ids[title_indexes[known]] == pairs[known, 0]
+    pairs, title_indexes = pairs[known], title_indexes[known]
+    if len(pairs):
+        genre_ids, genres = np.unique(pairs[:, 1], return_inverse=True)
+        pair_sums, pair_counts = sums[title_indexes], counts[title_indexes]
+        genre_sums, genre_counts = get_group_totals(
+            pair_sums, pair_counts, genres, len(genre_ids)
+        )
+        by_genre = get_weighted_ratings(
+            pair_sums,
+            pair_counts,
+            get_means(genre_sums, genre_counts)[genres],
+        )
+        genre_ratings = [
+            GenreRating(
+                title_id=int(title_id),
+                genre_id=int(genre_id),
+                weighted_rating=float(rating),
+            )
+            for title_id, genre_id, rating in zip(
+                pairs[rated[title_indexes], 0],
+                pairs[rated[title_indexes], 1],
+                by_genre[rated[title_indexes]],
+            )
+        ]
+
+    with transaction.atomic():
+        Title.objects.bulk_update(
+            titles,
+            ('weighted_rating', 'category_weighted_rating'),
+            batch_size=RANKING_BATCH_SIZE,
+        )
+        GenreRating.objects.all().delete()
+        GenreRating.objects.bulk_create(
+            genre_ratings, batch_size=RANKING_BATCH_SIZE
+        )
+        store_scope_totals(
+            Category,
+            category_ids[stored_categories],
+            category_sums[stored_categories],
+            category_counts[stored_categories],
+        )
+        store_scope_totals(Genre, genre_ids, genre_sums, genre_counts)
+        titles_updated.send(
+            sender=Title, title_ids=[title.pk for title in titles]
+        )
+    return {'titles': len(titles), 'genre_ratings': len(genre_ratings)}
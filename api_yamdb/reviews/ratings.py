@@ -0,0 +1,269 @@
+import threading
+
+from django.db.models import Count, F, QuerySet, Sum
+
+from reviews.constants import RATING_BATCH_SIZE
+from reviews.leaderboards import schedule_refresh
+from reviews.ranking import store_scope_totals
+from reviews.models import (
+    Category,
+    ChangeEvent,
+    Genre,
+    LeaderboardEntry,
+    Review,
+    Title,
+)
+from reviews.utils import record_changes, titles_updated
+
+
+class DeletedRatings(threading.local):
+    """
+    Titles and reviews whose scores were already taken off the rating
+    totals by the delete of their title or author, so the cascaded review
+    deletes skip them.
+    """
+
+    def __init__(self) -> None:
+        self.title_ids = set()
+        self.review_ids = set()
+
+
+deleted_ratings = DeletedRatings()
+
+
+def get_score_totals(score) -> tuple:
+    """Return the (sum, count) contribution of a single review score."""
+
+    if score is None:
+        return 0, 0
+    return score, 1
+
+
+def add_deltas(totals: dict, key, score_delta: int, count_delta: int):
+    score_sum, score_count = totals.get(key, (0, 0))
+    totals[key] = (score_sum + score_delta, score_count + count_delta)
+
+
+def get_leaderboard_scopes(title_id: int) -> list:
+    """``(field, scope_id)`` of the leaderboards listing a title."""
+
+    return [
+        ('category', category_id) if category_id else ('genre', genre_id)
+        for category_id, genre_id in LeaderboardEntry.objects.filter(
+            title=title_id
+        ).values_list('category_id', 'genre_id')
+    ]
+
+
+def shift_totals(model, deltas: dict) -> None:
+    """
+    Add ``{pk: (score_delta, count_delta)}`` to the stored rating totals of
+    titles, categories or genres.
+    """
+
+    model.objects.bulk_update(
+        [
+            model(
+                pk=pk,
+                rating_sum=F('rating_sum') + score_delta,
+                rating_count=F('rating_count') + count_delta,
+            )
+            for pk, (score_delta, count_delta) in deltas.items()
+            if score_delta or count_delta
+        ],
+        ('rating_sum', 'rating_count'),
+        batch_size=RATING_BATCH_SIZE,
+    )
+
+
+def update_scope_totals(deltas: dict) -> None:
+    """Apply the rating deltas of titles to their categories and genres."""
+
+    if len(deltas) == 1:
+        [(title_id, (score_delta, count_delta))] = deltas.items()
+        for model in (Category, Genre):
+            model.objects.filter(titles=title_id).update(
+                rating_sum=F('rating_sum') + score_delta,
+                rating_count=F('rating_count') + count_delta,
+            )
+        return
+
+    category_deltas, genre_deltas = {}, {}
+    title_ids = list(deltas)
+    for start in range(0, len(title_ids), RATING_BATCH_SIZE):
+        batch = title_ids[start:start + RATING_BATCH_SIZE]
+        for title_id, category_id in Title.objects.filter(
+            pk__in=batch, category__isnull=False
+        ).values_list('pk', 'category_id'):
+            add_deltas(category_deltas, category_id, *deltas[title_id])
+        for title_id, genre_id in Title.genre.through.objects.filter(
+            title_id__in=batch
+        ).values_list('title_id', 'genre_id'):
+            add_deltas(genre_deltas, genre_id, *deltas[title_id])
+    shift_totals(Category, category_deltas)
+    shift_totals(Genre, genre_deltas)
+
+
+def ratings_changed(deltas: dict) -> None:
+    """
+    Follow up stored rating totals of titles that changed by ``deltas``:
+    move the totals of their categories and genres, log the titles as
+    updated and refresh their weighted ratings after the commit.
+    """
+
+    update_scope_totals(deltas)
+    record_changes(
+        ChangeEvent.Action.UPDATED, [Title(pk=pk) for pk in sorted(deltas)]
+    )
+    titles_updated.send(sender=Title, title_ids=list(deltas))
+    schedule_refresh(deltas)
+
+
+def update_title_ratings(deltas: dict) -> None:
+    """
+    Shift the stored rating totals of titles by
+    ``{title_id: (score_delta, count_delta)}``.
+    """
+
+    deltas = {
+        title_id: delta for title_id, delta in deltas.items() if any(delta)
+    }
+    if not deltas:
+        return
+    if len(deltas) == 1:
+        [(title_id, (score_delta, count_delta))] = deltas.items()
+        if not Title.objects.filter(pk=title_id).update(
+            rating_sum=F('rating_sum') + score_delta,
+            rating_count=F('rating_count') + count_delta,
+        ):
+            return
+    else:
+        shift_totals(Title, deltas)
+    ratings_changed(deltas)
+
+
+def update_category_totals(
+    title_id: int, old_category_id: int, new_category_id: int
+) -> None:
+    """Move the rating totals of a title to its new category."""
+
+    rating_sum, rating_count = Title.objects.values_list(
+        'rating_sum', 'rating_count'
+    ).get(pk=title_id)
+    deltas = {}
+    if old_category_id is not None:
+        add_deltas(deltas, old_category_id, -rating_sum, -rating_count)
+    if new_category_id is not None:
+        add_deltas(deltas, new_category_id, rating_sum, rating_count)
+    shift_totals(Category, deltas)
+    scopes = [('category', old_category_id)] if old_category_id else []
+    schedule_refresh([title_id], scopes)
+
+
+def recalculate_category_totals(title_id: int) -> None:
+    """
+    Rebuild the rating totals of all categories from their titles, for a
+    title whose previous category is unknown.
+    """
+
+    rows = list(
+        Title.objects.filter(category__isnull=False)
+        .order_by()
+        .values_list('category')
+        .annotate(Sum('rating_sum'), Sum('rating_count'))
+    )
+    category_ids, sums, counts = zip(*rows) if rows else ((), (), ())
+    store_scope_totals(Category, category_ids, sums, counts)
+    schedule_refresh([title_id], get_leaderboard_scopes(title_id))
+
+
+def update_genre_totals(links, sign: int) -> None:
+    """
+    Add (``sign=1``) or remove (``sign=-1``) the rating totals of titles to
+    or from the genres they were linked to or unlinked from, given as
+    ``(title_id, genre_id)`` pairs.
+    """
+
+    links = list(links)
+    if not links:
+        return
+    totals = {
+        title_id: (rating_sum, rating_count)
+        for title_id, rating_sum, rating_count in Title.objects.filter(
+            pk__in={title_id for title_id, _ in links}
+        ).values_list('pk', 'rating_sum', 'rating_count')
+    }
+    deltas = {}
+    for title_id, genre_id in links:
+        if title_id in totals:
+            rating_sum, rating_count = totals[title_id]
+            add_deltas(
+                deltas, genre_id, sign * rating_sum, sign * rating_count
+            )
+    shift_totals(Genre, deltas)
+    scopes = (
+        {('genre', genre_id) for _, genre_id in links} if sign < 0 else ()
+    )
+    schedule_refresh(totals, scopes)
+
+
+def recalculate_ratings(
+    titles: QuerySet = None, commit: bool = True
+) -> list:
+    """
+    Recompute stored rating totals from the reviews table.
+
+    Returns a list of ``(title, (old_sum, old_count))`` pairs for every title
+    whose stored totals drifted from the actual reviews. When ``commit`` is
+    set, the drifted titles are saved with the recomputed values, and the
+    drift is applied to their categories and genres like any rating change.
+    """
+
+    if titles is None:
+        titles = Title.objects.all()
+
+    reviews = Review.objects.filter(title__in=titles.values('pk'))
+    totals = {
+        row['title']: (row['score_sum'] or 0, row['score_count'])
+        for row in reviews.order_by()
+        .values('title')
+        .annotate(score_sum=Sum('score'), score_count=Count('score'))
+    }
+
+    drifted = []
+    for title in titles.order_by('pk').only(
+        'id', 'name', 'rating_sum', 'rating_count'
+    ).iterator(chunk_size=RATING_BATCH_SIZE):
+        actual = totals.get(title.pk, (0, 0))
+        stored = (title.rating_sum, title.rating_count)
+        if stored != actual:
+            title.rating_sum, title.rating_count = actual
+            drifted.append((title, stored))
+
+    if commit and drifted:
+        Title.objects.bulk_update(
+            [title for title, _ in drifted],
+            ('rating_sum', 'rating_count'),
+            batch_size=RATING_BATCH_SIZE,
+        )
+        ratings_changed(
+            {
+                title.pk: (
+                    title.rating_sum - old_sum,
+                    title.rating_count - old_count,
+                )
+                for title, (old_sum, old_count) in drifted
+            }
+        )
+
+    return drifted
+
+
+def get_review_deltas(reviews) -> dict:
+    """Rating deltas of titles losing the ``(title_id, score)`` reviews."""
+
+    deltas = {}
+    for title_id, score in reviews:
+        score_sum, score_count = get_score_totals(score)
+        add_deltas(deltas, title_id, -score_sum, -score_count)
+    return deltas
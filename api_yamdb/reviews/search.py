@@ -0,0 +1,106 @@
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, F, Func, QuerySet
+
+from reviews.models import Category, Comment, Genre, Review, Title
+
+# Columns covered by the SQLite FTS5 index of each model. The virtual
+# tables and the triggers keeping them in sync are created by migrations.
+SEARCH_INDEXES = {
+    Title: ('name',),
+    Genre: ('name',),
+    Category: ('name',),
+    Review: ('text',),
+    Comment: ('text',),
+}
+
+WORD_PATTERN = re.compile(r'\w', re.UNICODE)
+
+
+def get_index_table(model) -> str:
+    return f'{model._meta.db_table}_fts'
+
+
+def is_indexed(model) -> bool:
+    """Whether searches on the model can use a full-text index."""
+
+    return connection.vendor == 'sqlite' and model in SEARCH_INDEXES
+
+
+def build_match_query(terms) -> str:
+    """
+    Build an FTS5 query matching every term as a word prefix.
+
+    Terms are quoted, so FTS5 operators inside them are searched literally.
+    """
+
+    return ' '.join(
+        '"{}"*'.format(term.replace('"', '""'))
+        for term in terms
+        if WORD_PATTERN.search(term)
+    )
+
+
+class IndexMatch(Func):
+    """Condition joining rows to their ``rowid`` in a matching index."""
+
+    conditional = True
+    output_field = BooleanField()
+
+    def __init__(self, index_table: str, match: str) -> None:
+        super().__init__(F('pk'))
+        self.index_table = index_table
+        self.match = match
+
+    def as_sql(self, compiler, connection, **extra_context) -> tuple:
+        # The primary key is compiled like any column, so the condition
+        # follows the table alias when the queryset is nested in another
+        # query.
+        pk_sql, params = compiler.compile(self.get_source_expressions()[0])
+        return (
+            f'({self.index_table}.rowid = {pk_sql} '
+            f'AND {self.index_table} MATCH %s)',
+            [*params, self.match],
+        )
+
+
+def search(queryset: QuerySet, terms) -> QuerySet:
+    """
+    Restrict the queryset to rows matching all terms, best matches first.
+
+    The index is joined on ``rowid``, so a single ``MATCH`` both selects
+    the rows and ranks them. Terms match word prefixes: "dra" finds
+    "Drama", "ama" does not.
+
+    Returns ``None`` when the terms contain nothing to search for.
+    """
+
+    match = build_match_query(terms)
+    if not match:
+        return None
+
+    index_table = get_index_table(queryset.model)
+    # Only the index table is named in raw SQL: it is never aliased.
+    return (
+        queryset.extra(
+            select={'search_rank': f'bm25({index_table})'},
+            tables=[index_table],
+        )
+        .filter(IndexMatch(index_table, match))
+        .order_by('search_rank', 'pk')
+    )
+
+
+def rebuild_indexes() -> list:
+    """Rebuild every full-text index from its content table."""
+
+    rebuilt = []
+    with connection.cursor() as cursor:
+        for model in SEARCH_INDEXES:
+            index_table = get_index_table(model)
+            cursor.execute(
+                f"INSERT INTO {index_table}({index_table}) VALUES ('rebuild')"
+            )
+            rebuilt.append(index_table)
+    return rebuilt
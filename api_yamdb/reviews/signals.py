@@ -0,0 +1,245 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+
+from reviews.models import (
+    Category,
+    ChangeEvent,
+    Comment,
+    Genre,
+    Review,
+    Title,
+)
+from reviews.leaderboards import schedule_refresh
+from reviews.ratings import (
+    deleted_ratings,
+    get_leaderboard_scopes,
+    get_review_deltas,
+    get_score_totals,
+    recalculate_category_totals,
+    recalculate_ratings,
+    update_category_totals,
+    update_genre_totals,
+    update_scope_totals,
+    update_title_ratings,
+)
+from reviews.utils import record_changes, titles_updated
+from users.models import User
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance: Review, created: bool, raw: bool, **kwargs):
+    """Apply the score change of a created or edited review to its title."""
+
+    if raw:
+        return
+
+    loaded = getattr(instance, '_loaded_rating', None)
+    if not created and loaded is None:
+        # The previous score is unknown, so rebuild the totals from scratch.
+        recalculate_ratings(Title.objects.filter(pk=instance.title_id))
+    else:
+        new_sum, new_count = get_score_totals(instance.score)
+        if created:
+            update_title_ratings({instance.title_id: (new_sum, new_count)})
+        else:
+            old_title_id, old_score = loaded
+            old_sum, old_count = get_score_totals(old_score)
+            if old_title_id == instance.title_id:
+                update_title_ratings(
+                    {
+                        instance.title_id: (
+                            new_sum - old_sum,
+                            new_count - old_count,
+                        )
+                    }
+                )
+            else:
+                update_title_ratings(
+                    {
+                        old_title_id: (-old_sum, -old_count),
+                        instance.title_id: (new_sum, new_count),
+                    }
+                )
+
+    instance._loaded_rating = (instance.title_id, instance.score)
+
+
+@receiver(pre_delete, sender=Review)
+def review_deleting(sender, instance: Review, **kwargs) -> None:
+    # Reviews are deleted before their title or author, so marks left by
+    # a delete that failed after marking are dropped here.
+    deleted_ratings.title_ids.discard(instance.title_id)
+    deleted_ratings.review_ids.discard(instance.pk)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance: Review, **kwargs):
+    """Remove the score of a deleted review from its title."""
+
+    if instance.title_id in deleted_ratings.title_ids:
+        return
+    if instance.pk in deleted_ratings.review_ids:
+        deleted_ratings.review_ids.discard(instance.pk)
+        return
+    title_id, score = getattr(
+        instance, '_loaded_rating', (instance.title_id, instance.score)
+    )
+    update_title_ratings(get_review_deltas([(title_id, score)]))
+
+
+@receiver(pre_delete, sender=Title)
+def title_deleting(sender, instance: Title, **kwargs) -> None:
+    """
+    Take the whole rating totals of a title off its category and genres at
+    once, while its genre links still exist, instead of review by review.
+    """
+
+    rating_sum, rating_count = Title.objects.values_list(
+        'rating_sum', 'rating_count'
+    ).get(pk=instance.pk)
+    if rating_count:
+        update_scope_totals({instance.pk: (-rating_sum, -rating_count)})
+    # Its leaderboard entries are deleted with it and the gaps refilled.
+    schedule_refresh(scopes=get_leaderboard_scopes(instance.pk))
+    deleted_ratings.title_ids.add(instance.pk)
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance: Title, **kwargs) -> None:
+    deleted_ratings.title_ids.discard(instance.pk)
+
+
+@receiver(pre_delete, sender=User)
+def author_deleting(sender, instance: User, **kwargs) -> None:
+    """Take the scores of all reviews of a deleted user off at once."""
+
+    reviews = list(
+        Review.objects.filter(author=instance).values_list(
+            'pk', 'title_id', 'score'
+        )
+    )
+    deleted_ratings.review_ids.update(pk for pk, _, _ in reviews)
+    update_title_ratings(
+        get_review_deltas(
+            (title_id, score) for _, title_id, score in reviews
+        )
+    )
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance: Title, created: bool, raw: bool, **kwargs):
+    """Move the rating totals of a title whose category changed."""
+
+    if raw:
+        return
+    if created:
+        # A new title has no ratings to move or rank yet.
+        instance._loaded_category_id = instance.category_id
+        return
+    if '_loaded_category_id' in instance.__dict__:
+        old_category_id = instance._loaded_category_id
+    else:
+        recalculate_category_totals(instance.pk)
+        instance._loaded_category_id = instance.category_id
+        return
+    if old_category_id != instance.category_id:
+        update_category_totals(
+            instance.pk, old_category_id, instance.category_id
+        )
+    instance._loaded_category_id = instance.category_id
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def update_title_genre_totals(
+    sender, instance, action, reverse, pk_set, **kwargs
+) -> None:
+    """Move the rating totals of titles to the genres they enter or leave."""
+
+    if action in ('pre_remove', 'pre_clear'):
+        # Only links that exist are removed, and cleared ones are unknown
+        # once cleared.
+        links = Title.genre.through.objects.filter(
+            **{'genre_id' if reverse else 'title_id': instance.pk}
+        )
+        if action == 'pre_remove':
+            links = links.filter(
+                **{'title_id__in' if reverse else 'genre_id__in': pk_set}
+            )
+        instance._removed_genre_links = list(
+            links.values_list('title_id', 'genre_id')
+        )
+    elif action in ('post_remove', 'post_clear'):
+        update_genre_totals(
+            instance.__dict__.pop('_removed_genre_links', []), -1
+        )
+    elif action == 'post_add':
+        update_genre_totals(
+            [
+                (pk, instance.pk) if reverse else (instance.pk, pk)
+                for pk in pk_set
+            ],
+            1,
+        )
+
+
+@receiver(pre_delete, sender=Category)
+def category_deleting(sender, instance: Category, **kwargs) -> None:
+    """Titles left without a category lose their rating in it."""
+
+    titles = instance.titles.exclude(category_weighted_rating=None)
+    title_ids = list(titles.values_list('pk', flat=True))
+    titles.update(category_weighted_rating=None)
+    titles_updated.send(sender=Title, title_ids=title_ids)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+def log_saved(sender, instance, created: bool, raw: bool, **kwargs) -> None:
+    if raw:
+        return
+    if created:
+        record_changes(ChangeEvent.Action.CREATED, [instance])
+    else:
+        record_changes(ChangeEvent.Action.UPDATED, [instance])
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def log_deleted(sender, instance, **kwargs) -> None:
+    record_changes(ChangeEvent.Action.DELETED, [instance])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def log_title_genres_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+) -> None:
+    """Log an update of every title whose genres changed."""
+
+    if reverse and action == 'pre_clear':
+        # The titles of a cleared genre are unknown once it is cleared.
+        instance._cleared_title_ids = list(
+            instance.titles.values_list('pk', flat=True)
+        )
+    if not action.startswith('post_'):
+        return
+
+    if not reverse:
+        title_ids = [instance.pk] if pk_set or action == 'post_clear' else []
+    elif action == 'post_clear':
+        title_ids = instance.__dict__.pop('_cleared_title_ids', [])
+    else:
+        title_ids = pk_set
+    record_changes(
+        ChangeEvent.Action.UPDATED, [Title(pk=pk) for pk in sorted(title_ids)]
+    )
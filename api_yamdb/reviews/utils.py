@@ -0,0 +1,43 @@
+from django.db.models import Model
+from django.dispatch import Signal
+
+from reviews.models import (
+    Category,
+    ChangeEvent,
+    Comment,
+    Genre,
+    Review,
+)
+
+# Sent with the ``title_ids`` of titles changed by queryset or bulk updates,
+# which send no post_save.
+titles_updated = Signal()
+
+
+def get_change_key(instance: Model) -> dict:
+    """The values a client needs to build the API URL of an object."""
+
+    if isinstance(instance, (Genre, Category)):
+        return {'id': instance.pk, 'slug': instance.slug}
+    if isinstance(instance, Review):
+        return {'title_id': instance.title_id, 'id': instance.pk}
+    if isinstance(instance, Comment):
+        return {
+            'title_id': instance.title_id,
+            'review_id': instance.review_id,
+            'id': instance.pk,
+        }
+    return {'id': instance.pk}
+
+
+def record_changes(action: str, instances) -> None:
+    """Append one change event per instance to the change log."""
+
+    ChangeEvent.objects.bulk_create(
+        ChangeEvent(
+            entity=instance._meta.model_name,
+            action=action,
+            key=get_change_key(instance),
+        )
+        for instance in instances
+    )
@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import Group
 
-from .models import User
+from .models import OutgoingEmail, User
 
 
 @admin.register(User)
@@ -20,4 +20,18 @@ class UserAdmin(BaseUserAdmin):
     empty_value_display = '-пусто-'
 
 
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'recipient',
+        'subject',
+        'created_at',
+        'attempts',
+        'sent_at',
+    )
+    search_fields = ('recipient',)
+    list_filter = ('sent_at',)
+
+
 admin.site.unregister(Group)
@@ -0,0 +1,185 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+from users.constants import (
+    BLOOM_BUILD_CHUNK_SIZE,
+    BLOOM_CAPACITY_FACTOR,
+    BLOOM_FALSE_POSITIVE_RATE,
+    BLOOM_MIN_CAPACITY,
+)
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bloom')
+
+
+class BloomFilter:
+    """
+    Set of strings that can answer "definitely absent" or "possibly
+    present", with ``false_positive_rate`` chance of a wrong "present".
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        false_positive_rate: float = BLOOM_FALSE_POSITIVE_RATE,
+    ) -> None:
+        self.size = max(
+            8,
+            math.ceil(
+                -capacity * math.log(false_positive_rate) / math.log(2) ** 2
+            ),
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def get_positions(self, value: str):
+        # Double hashing: the two halves of one digest give every position.
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return (
+            (first + index * second) % self.size
+            for index in range(self.hash_count)
+        )
+
+    def add(self, value: str) -> None:
+        for position in self.get_positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self.get_positions(value)
+        )
+
+
+class UserBloomFilter:
+    """
+    Process-local Bloom filter of registered usernames and emails.
+
+    It is built from the whole table on first use, and rebuilt in the
+    background after ``USERS_BLOOM_FILTER_TTL`` seconds to pick up users
+    created by other processes, while the old filter keeps answering;
+    users saved in this process are added right away. A name it does not
+    contain may still have been registered by another process since the
+    last rebuild, so callers must keep relying on the unique constraints.
+    """
+
+    def __init__(self) -> None:
+        self._filter = None
+        self._built_at = 0.0
+        # Bumped by invalidate(), so builds started before it are dropped.
+        self._generation = 0
+        self._added = None
+        self._rebuild = None
+        # Guards the fields above and is only held briefly; the table is
+        # read under the build lock, one build at a time.
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    @staticmethod
+    def make_keys(username=None, email=None) -> list:
+        return [
+            f'{field}:{value}'
+            for field, value in (('username', username), ('email', email))
+            if value is not None
+        ]
+
+    def get_filter(self) -> BloomFilter:
+        bloom = self._filter
+        if bloom is None:
+            with self._build_lock:
+                bloom = self._filter
+                if bloom is None:
+                    bloom = self.build()
+            return bloom
+        expired = (
+            time.monotonic() - self._built_at
+            > settings.USERS_BLOOM_FILTER_TTL
+        )
+        if expired and self._build_lock.acquire(blocking=False):
+            self._rebuild = executor.submit(self.rebuild_in_background)
+        return bloom
+
+    def rebuild_in_background(self) -> None:
+        try:
+            self.build()
+        except Exception:
+            logger.exception('Rebuilding the user Bloom filter failed')
+        finally:
+            self._build_lock.release()
+            connections.close_all()
+
+    def read_users(self) -> BloomFilter:
+        bloom = BloomFilter(
+            max(
+                BLOOM_MIN_CAPACITY,
+                User.objects.count() * 2 * BLOOM_CAPACITY_FACTOR,
+            )
+        )
+        for username, email in User.objects.values_list(
+            'username', 'email'
+        ).iterator(chunk_size=BLOOM_BUILD_CHUNK_SIZE):
+            for key in self.make_keys(username, email):
+                bloom.add(key)
+        return bloom
+
+    def build(self) -> BloomFilter:
+        """Build a filter from the table, and use it unless invalidated."""
+
+        with self._lock:
+            generation = self._generation
+            self._added = []
+        bloom = None
+        try:
+            bloom = self.read_users()
+        finally:
+            with self._lock:
+                # Users saved while the table was read may be missing from
+                # the result.
+                if bloom is not None:
+                    for key in self._added:
+                        bloom.add(key)
+                    if self._generation == generation:
+                        self._filter = bloom
+                        self._built_at = time.monotonic()
+                self._added = None
+        return bloom
+
+    def add(self, username: str, email: str) -> None:
+        keys = self.make_keys(username, email)
+        with self._lock:
+            if self._added is not None:
+                self._added.extend(keys)
+            if self._filter is not None:
+                for key in keys:
+                    self._filter.add(key)
+
+    def might_exist(self, username=None, email=None) -> dict:
+        """
+        Map each given field to ``False`` if no user has that value, or
+        ``True`` if one possibly has.
+        """
+
+        bloom = self.get_filter()
+        return {
+            key.split(':', 1)[0]: key in bloom
+            for key in self.make_keys(username, email)
+        }
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._filter = None
+            self._generation += 1
+
+
+user_bloom_filter = UserBloomFilter()
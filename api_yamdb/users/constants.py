@@ -3,3 +3,26 @@
 MAX_USERNAME_LENGTH = 150
 
 MAX_EMAIL_LENGTH = 254
+
+MAX_SUBJECT_LENGTH = 255
+
+# Constants for the email outbox
+
+OUTBOX_BATCH_SIZE = 100
+
+OUTBOX_MAX_ATTEMPTS = 5
+
+OUTBOX_RETRY_DELAY = 60
+
+OUTBOX_LEASE_SECONDS = 300
+
+# Constants for the username and email Bloom filter
+
+BLOOM_FALSE_POSITIVE_RATE = 0.01
+
+BLOOM_MIN_CAPACITY = 1024
+
+# Room left for users registered between two rebuilds
+BLOOM_CAPACITY_FACTOR = 2
+
+BLOOM_BUILD_CHUNK_SIZE = 2000
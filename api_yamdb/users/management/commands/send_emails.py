@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from users.constants import OUTBOX_BATCH_SIZE
+from users.outbox import send_pending
+
+
+class Command(BaseCommand):
+    """Deliver the emails queued in the outbox."""
+
+    help = 'Send queued outbox emails in batches.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=OUTBOX_BATCH_SIZE,
+            help='Number of emails sent over one connection.',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling the outbox instead of exiting when it is '
+            'empty.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Seconds to wait between polls of an empty outbox.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        while True:
+            close_old_connections()
+            sent, failed = send_pending(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(f'Sent {sent}, failed {failed}.')
+            elif not options['loop']:
+                break
+            else:
+                time.sleep(options['interval'])
@@ -1,7 +1,12 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
-from users.constants import MAX_EMAIL_LENGTH, MAX_USERNAME_LENGTH
+from users.constants import (
+    MAX_EMAIL_LENGTH,
+    MAX_SUBJECT_LENGTH,
+    MAX_USERNAME_LENGTH,
+)
 from users.validators import validate_username
 
 
@@ -48,3 +53,43 @@ class User(AbstractUser):
 
     def __str__(self) -> str:
         return self.username
+
+
+class OutgoingEmail(models.Model):
+    """Email waiting in the outbox to be sent by a delivery worker."""
+
+    recipient = models.EmailField(
+        max_length=MAX_EMAIL_LENGTH, verbose_name='Recipient'
+    )
+    subject = models.CharField(
+        max_length=MAX_SUBJECT_LENGTH, verbose_name='Subject'
+    )
+    body = models.TextField(verbose_name='Body')
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Created at'
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now, verbose_name='Next attempt at'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Attempts'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Last error')
+    sent_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Sent at'
+    )
+
+    class Meta:
+        ordering = ('next_attempt_at',)
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = (
+            models.Index(
+                fields=('next_attempt_at',),
+                condition=models.Q(sent_at__isnull=True),
+                name='outgoing_email_pending_idx',
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f'{self.subject} -> {self.recipient}'
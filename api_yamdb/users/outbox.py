@@ -0,0 +1,142 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connections, transaction
+from django.utils import timezone
+
+from users.constants import (
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_LEASE_SECONDS,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_RETRY_DELAY,
+)
+from users.models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='outbox')
+
+
+def queue_email(recipient: str, subject: str, body: str) -> OutgoingEmail:
+    """
+    Store an email in the outbox and schedule its delivery once the current
+    transaction commits, according to ``EMAIL_OUTBOX_DELIVERY``:
+
+    * ``'worker'`` leaves it to the ``send_emails`` management command;
+    * ``'thread'`` sends it from a background thread of this process;
+    * ``'immediate'`` sends it right after the commit, in this thread.
+    """
+
+    email = OutgoingEmail.objects.create(
+        recipient=recipient, subject=subject, body=body
+    )
+    delivery = settings.EMAIL_OUTBOX_DELIVERY
+    if delivery == 'thread':
+        transaction.on_commit(lambda: executor.submit(send_in_thread))
+    elif delivery == 'immediate':
+        transaction.on_commit(deliver_pending)
+    return email
+
+
+def deliver_pending() -> None:
+    """
+    Send due emails after a commit. Errors are only logged: the change is
+    committed already, and the emails stay in the outbox for a later
+    delivery.
+    """
+
+    try:
+        send_pending()
+    except Exception:
+        logger.exception('Outbox delivery failed')
+
+
+def send_in_thread() -> None:
+    try:
+        deliver_pending()
+    finally:
+        connections.close_all()
+
+
+def claim_pending(batch_size: int) -> list:
+    """
+    Lease a batch of due emails so concurrent workers skip them until
+    ``OUTBOX_LEASE_SECONDS`` pass.
+    """
+
+    now = timezone.now()
+    due = OutgoingEmail.objects.filter(
+        sent_at__isnull=True,
+        attempts__lt=OUTBOX_MAX_ATTEMPTS,
+        next_attempt_at__lte=now,
+    )
+    ids = list(due.values_list('pk', flat=True)[:batch_size])
+    if not ids:
+        return []
+
+    leased_until = now + timedelta(seconds=OUTBOX_LEASE_SECONDS)
+    due.filter(pk__in=ids).update(next_attempt_at=leased_until)
+    return list(
+        OutgoingEmail.objects.filter(
+            pk__in=ids, next_attempt_at=leased_until
+        )
+    )
+
+
+def send_pending(batch_size: int = OUTBOX_BATCH_SIZE) -> tuple:
+    """
+    Send one batch of due emails over a single connection.
+
+    Failed emails, including a whole batch the connection could not be
+    opened for, are retried with an exponential delay until they reach
+    ``OUTBOX_MAX_ATTEMPTS``. Returns the numbers of sent and failed emails.
+    """
+
+    emails = claim_pending(batch_size)
+    if not emails:
+        return 0, 0
+
+    mail_connection = get_connection(fail_silently=False)
+    connection_error = None
+    try:
+        mail_connection.open()
+    except Exception as error:
+        connection_error = error
+
+    sent = failed = 0
+    for email in emails:
+        email.attempts += 1
+        error = connection_error
+        if error is None:
+            try:
+                EmailMessage(
+                    email.subject,
+                    email.body,
+                    settings.DEFAULT_FROM_EMAIL,
+                    [email.recipient],
+                    connection=mail_connection,
+                ).send()
+            except Exception as send_error:
+                error = send_error
+        if error is None:
+            email.sent_at = timezone.now()
+            sent += 1
+        else:
+            email.last_error = str(error)
+            email.next_attempt_at = timezone.now() + timedelta(
+                seconds=OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1)
+            )
+            failed += 1
+    if connection_error is None:
+        # The emails are sent already, a failed QUIT must not resend them.
+        with suppress(Exception):
+            mail_connection.close()
+
+    OutgoingEmail.objects.bulk_update(
+        emails, ('attempts', 'last_error', 'next_attempt_at', 'sent_at')
+    )
+    return sent, failed
@@ -0,0 +1,15 @@
+import pytest
+from django.core.cache import cache
+
+from api.cache import slug_caches
+from users.bloom import user_bloom_filter
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    for slug_cache in slug_caches.values():
+        slug_cache.invalidate()
+    user_bloom_filter.invalidate()
+    yield
+    cache.clear()
@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def immediate_email_delivery(settings):
+    settings.EMAIL_OUTBOX_DELIVERY = 'immediate'
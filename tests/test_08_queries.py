@@ -0,0 +1,387 @@
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from api.authentication import RoleAccessToken
+from api.permissions import IsModeratorOrReadOnly
+from api.serializers import UserSignUpSerializer
+from api.views import TitleViewSet
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.bloom import user_bloom_filter
+
+
+def create_titles_bulk(count):
+    category = Category.objects.create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx}', year=2000, category=category)
+        for idx in range(count)
+    )
+    titles = list(Title.objects.order_by('id'))
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(title_id=title.id, genre_id=genre.id)
+        for title in titles
+        for genre in genres
+    )
+    return titles
+
+
+def create_reviews_bulk(django_user_model, count):
+    title = create_titles_bulk(1)[0]
+    django_user_model.objects.bulk_create(
+        django_user_model(username=f'user{idx}', email=f'user{idx}@yamdb.fake')
+        for idx in range(count)
+    )
+    authors = list(django_user_model.objects.order_by('id'))
+    Review.objects.bulk_create(
+        Review(title=title, author=author, text='Текст', score=5)
+        for author in authors
+    )
+    review = Review.objects.order_by('id').first()
+    Comment.objects.bulk_create(
+        Comment(title=title, review=review, author=author, text='Текст')
+        for author in authors
+    )
+    return title, review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    MAX_LIST_QUERIES = 3
+    MAX_DETAIL_QUERIES = 2
+
+    def get_query_count(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return len(context.captured_queries), response.json()
+
+    @pytest.mark.parametrize('page_size', (10, 100, 1000))
+    def test_01_title_list_query_count(self, client, monkeypatch, page_size):
+        monkeypatch.setattr(
+            TitleViewSet.pagination_class, 'page_size', page_size
+        )
+        create_titles_bulk(page_size)
+
+        query_count, data = self.get_query_count(client, self.TITLES_URL)
+
+        assert len(data['results']) == page_size
+        assert all(len(title['genre']) == 2 for title in data['results'])
+        assert query_count <= self.MAX_LIST_QUERIES, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` выполняет '
+            f'не более {self.MAX_LIST_QUERIES} SQL-запросов независимо от '
+            f'размера страницы. Сейчас для страницы из {page_size} '
+            f'произведений выполнено {query_count} запросов.'
+        )
+
+    def test_02_title_detail_query_count(self, client):
+        title = create_titles_bulk(1)[0]
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+
+        query_count, data = self.get_query_count(client, url)
+
+        assert data['category']['slug'] == 'films'
+        assert query_count <= self.MAX_DETAIL_QUERIES, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_DETAIL_URL_TEMPLATE}` '
+            f'выполняет не более {self.MAX_DETAIL_QUERIES} SQL-запросов. '
+            f'Сейчас выполнено {query_count} запросов.'
+        )
+
+    def test_03_title_create_uses_slug_cache(self, admin_client):
+        create_titles_bulk(1)
+        data = {
+            'name': 'Новое произведение',
+            'year': 2000,
+            'genre': ['drama', 'comedy'],
+            'category': 'films',
+        }
+        admin_client.post(self.TITLES_URL, data=data)
+
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(self.TITLES_URL, data=data)
+
+        assert response.status_code == HTTPStatus.CREATED
+        slug_queries = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'reviews_title_genre' not in query['sql']
+            and ('FROM "reviews_genre"' in query['sql']
+                 or 'FROM "reviews_category"' in query['sql'])
+        ]
+        assert not slug_queries, (
+            f'Проверьте, что POST-запрос к `{self.TITLES_URL}` не '
+            'запрашивает жанры и категорию по slug из базы данных, если '
+            'кеш slug уже заполнен.'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08ReviewCommentQueries:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+    MAX_LIST_QUERIES = 2
+    # Review lookup, comment insert and the change log write in its
+    # transaction.
+    MAX_COMMENT_CREATE_QUERIES = 4
+
+    def get_query_count(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return len(context.captured_queries), response.json()
+
+    @pytest.mark.parametrize('count', (10, 100))
+    @pytest.mark.parametrize('pagination', ('', '?pagination=cursor'))
+    def test_01_list_query_count(
+        self, client, django_user_model, count, pagination
+    ):
+        title, review = create_reviews_bulk(django_user_model, count)
+        urls = (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title.id, review_id=review.id
+            ),
+        )
+
+        for url in urls:
+            query_count, data = self.get_query_count(client, url + pagination)
+
+            assert len(data['results']) == count
+            assert {item['author'] for item in data['results']} == {
+                f'user{idx}' for idx in range(count)
+            }
+            assert query_count <= self.MAX_LIST_QUERIES, (
+                f'Проверьте, что GET-запрос к `{url}` выполняет не более '
+                f'{self.MAX_LIST_QUERIES} SQL-запросов независимо от '
+                f'количества авторов на странице. Сейчас для страницы из '
+                f'{count} объектов выполнено {query_count} запросов.'
+            )
+
+    def test_02_comment_create_query_count(self, user):
+        title, review = create_reviews_bulk(type(user), 1)
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.id, review_id=review.id
+        )
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+        )
+
+        # The first request caches the role flags checked against the token.
+        client.post(url, data={'text': 'Комментарий'})
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(url, data={'text': 'Комментарий'})
+
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        assert len(context.captured_queries) <= (
+            self.MAX_COMMENT_CREATE_QUERIES
+        ), (
+            f'Проверьте, что POST-запрос к `{self.COMMENTS_URL_TEMPLATE}` '
+            'загружает отзыв один раз и не запрашивает произведение и '
+            f'автора. Сейчас выполнено {len(context.captured_queries)} '
+            'запросов.'
+        )
+
+    def test_03_renamed_author(self, user):
+        title, review = create_reviews_bulk(type(user), 1)
+        token = RoleAccessToken.for_user(user)
+        user.username = 'RenamedUser'
+        user.save()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        response = client.post(
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title.id, review_id=review.id
+            ),
+            data={'text': 'Комментарий'},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == 'RenamedUser', (
+            'Проверьте, что автор нового комментария показан под текущим '
+            'именем пользователя, а не под именем из токена.'
+        )
+
+    def test_04_review_parent_without_annotation(self, user, monkeypatch):
+        title, _ = create_reviews_bulk(type(user), 1)
+        monkeypatch.setattr(
+            'api.views.ReviewViewSet.get_parent_queryset',
+            lambda view: Title.objects.only('id'),
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+
+        response = client.post(url, data={'text': 'Текст', 'score': 5})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв отклоняется и тогда, когда '
+            'произведение загружено без аннотации `is_reviewed`.'
+        )
+        response = client.get(self.REVIEWS_URL_TEMPLATE.format(title_id=0))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08ModerationQueries:
+
+    REVIEW_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    COMMENT_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        '{comment_id}/'
+    )
+
+    @staticmethod
+    def get_client(user):
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+        )
+        return client
+
+    @staticmethod
+    def get_user_queries(context):
+        return [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "users_user"' in query['sql']
+        ]
+
+    def test_01_author_and_moderator_writes(self, user, moderator):
+        title, review = create_reviews_bulk(type(user), 1)
+        # The helper gives every existing user a review.
+        own_review = Review.objects.get(author=user)
+        comment = Comment.objects.create(
+            title=title, review=review, author=user, text='Комментарий'
+        )
+        review_url = self.REVIEW_URL_TEMPLATE.format(
+            title_id=title.id, review_id=own_review.id
+        )
+        comment_url = self.COMMENT_URL_TEMPLATE.format(
+            title_id=title.id, review_id=review.id, comment_id=comment.id
+        )
+        user_client = self.get_client(user)
+        moderator_client = self.get_client(moderator)
+        # The first requests cache the role flags checked against the token.
+        user_client.patch(review_url, data={'text': 'Новый текст'})
+        moderator_client.patch(comment_url, data={'text': 'Новый текст'})
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.patch(review_url, data={'score': 7})
+        assert response.status_code == HTTPStatus.OK
+        assert not self.get_user_queries(context), (
+            'Проверьте, что PATCH-запрос автора к отзыву не загружает '
+            'пользователей из базы данных.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = moderator_client.delete(comment_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert not self.get_user_queries(context), (
+            'Проверьте, что DELETE-запрос модератора к комментарию не '
+            'загружает пользователей из базы данных.'
+        )
+
+    def test_02_bulk_moderation(self, django_user_model, user, moderator):
+        create_reviews_bulk(django_user_model, 20)
+        own_review = Review.objects.get(author=user)
+        reviews = list(Review.objects.only('id', 'author_id'))
+        permission = IsModeratorOrReadOnly()
+
+        for request_user, expected in (
+            (moderator, set(review.id for review in reviews)),
+            (user, {own_review.id}),
+        ):
+            request = SimpleNamespace(method='DELETE', user=request_user)
+            with CaptureQueriesContext(connection) as context:
+                allowed = {
+                    review.id for review in reviews
+                    if permission.has_object_permission(
+                        request, None, review
+                    )
+                }
+            assert allowed == expected
+            assert not context.captured_queries, (
+                'Проверьте, что проверка прав на отзывы не выполняет '
+                'SQL-запросов для каждого объекта.'
+            )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08SignupQueries:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    @staticmethod
+    def get_user_lookups(context):
+        return [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "users_user"' in query['sql']
+        ]
+
+    def test_01_signup_looks_users_up_once(self, client, django_user_model):
+        user_bloom_filter.get_filter()
+        data = {'username': 'new_user', 'email': 'new_user@yamdb.fake'}
+        django_user_model.objects.create(
+            username='other', email='other@yamdb.fake'
+        )
+
+        # A new user first, then a repeated signup of the same user.
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as context:
+                response = client.post(self.URL_SIGNUP, data=data)
+            assert response.status_code == HTTPStatus.OK
+            assert len(self.get_user_lookups(context)) <= 1, (
+                f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` ищет '
+                'пользователя по username и email не более чем одним '
+                'SQL-запросом.'
+            )
+        assert django_user_model.objects.filter(
+            username=data['username']
+        ).count() == 1
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(
+                self.URL_SIGNUP,
+                data={'username': 'other', 'email': data['email']},
+            )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert set(response.json()) == {'username', 'email'}
+        assert len(self.get_user_lookups(context)) <= 1
+
+    def test_02_signup_race_is_reported(self, django_user_model):
+        serializer = UserSignUpSerializer(
+            data={'username': 'racer', 'email': 'racer@yamdb.fake'}
+        )
+        assert serializer.is_valid()
+        django_user_model.objects.create(
+            username='racer', email='another@yamdb.fake'
+        )
+
+        with pytest.raises(ValidationError) as error:
+            serializer.save()
+        assert set(error.value.detail) == {'username'}, (
+            'Проверьте, что пользователь, зарегистрированный после проверки '
+            'данных, приводит к ошибке валидации, а не к ошибке сервера.'
+        )
@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.pagination import PubDateCursorPagination
+from reviews.models import Category, Comment, Review, Title
+
+
+@pytest.fixture
+def title_with_reviews(django_user_model, monkeypatch):
+    monkeypatch.setattr(PubDateCursorPagination, 'page_size', 2)
+    category = Category.objects.create(name='Фильм', slug='films')
+    title = Title.objects.create(
+        name='Терминатор', year=1984, category=category
+    )
+    reviews = []
+    for idx in range(5):
+        author = django_user_model.objects.create_user(
+            username=f'reviewer{idx}', email=f'reviewer{idx}@yamdb.fake'
+        )
+        reviews.append(Review.objects.create(
+            title=title, author=author, text=f'review {idx}', score=5
+        ))
+        Comment.objects.create(
+            title=title, review=reviews[0], author=author,
+            text=f'comment {idx}'
+        )
+    return title, reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CursorPagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def collect_pages(self, client, url):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+                'статусом 200.'
+            )
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в режиме `?pagination=cursor` ответ не '
+                'содержит ключ `count`.'
+            )
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+        return ids
+
+    def test_01_reviews_cursor_pages(self, client, title_with_reviews):
+        title, reviews = title_with_reviews
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+
+        ids = self.collect_pages(client, f'{url}?pagination=cursor')
+
+        assert sorted(ids) == sorted(review.id for review in reviews), (
+            f'Проверьте, что при обходе `{url}?pagination=cursor` по ссылкам '
+            '`next` возвращается каждый отзыв ровно один раз.'
+        )
+
+    def test_02_comments_cursor_pages(self, client, title_with_reviews):
+        title, reviews = title_with_reviews
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.id, review_id=reviews[0].id
+        )
+
+        ids = self.collect_pages(client, f'{url}?pagination=cursor')
+
+        assert sorted(ids) == sorted(
+            reviews[0].comments.values_list('id', flat=True)
+        ), (
+            f'Проверьте, что при обходе `{url}?pagination=cursor` по ссылкам '
+            '`next` возвращается каждый комментарий ровно один раз.'
+        )
+
+    def test_03_page_number_is_default(self, client, title_with_reviews):
+        title, reviews = title_with_reviews
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+
+        data = client.get(url).json()
+
+        assert data['count'] == len(reviews), (
+            f'Проверьте, что по умолчанию `{url}` использует постраничную '
+            'пагинацию с ключом `count`.'
+        )
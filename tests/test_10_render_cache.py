@@ -0,0 +1,112 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+
+from api.cache import title_render_cache
+from reviews.models import Review, Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitleRenderCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def get_title(self, client, title_id):
+        response = client.get(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_list_reuses_cached_titles(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        hits = title_render_cache.hits
+
+        response = client.get(self.TITLES_URL)
+
+        assert response.status_code == HTTPStatus.OK
+        assert title_render_cache.hits == hits + len(titles), (
+            f'Проверьте, что повторный GET-запрос к `{self.TITLES_URL}` '
+            'собирает ответ из закешированных представлений произведений.'
+        )
+
+    def test_02_cache_invalidation(self, client, admin_client, user_client):
+        titles, _, genres = create_titles(admin_client)
+        title_id = titles[0]['id']
+        self.get_title(client, title_id)
+
+        create_single_review(user_client, title_id, 'Отлично', 8)
+        assert self.get_title(client, title_id)['rating'] == 8, (
+            'Проверьте, что после добавления отзыва рейтинг произведения '
+            'в ответе обновляется.'
+        )
+
+        admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title_id),
+            data={'genre': [genres[2]['slug']]},
+        )
+        assert [
+            genre['slug'] for genre in self.get_title(client, title_id)['genre']
+        ] == [genres[2]['slug']], (
+            'Проверьте, что после изменения жанров произведения ответ '
+            'содержит новый список жанров.'
+        )
+
+        admin_client.delete(f'/api/v1/genres/{genres[2]["slug"]}/')
+        assert self.get_title(client, title_id)['genre'] == [], (
+            'Проверьте, что после удаления жанра он пропадает из ответа '
+            'для связанных произведений.'
+        )
+
+    def test_03_invalidation_on_commit(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        self.get_title(client, title_id)
+        title = Title.objects.get(pk=title_id)
+
+        with transaction.atomic():
+            title.name = 'Отменённое название'
+            title.save()
+            assert title_render_cache.get_many([title_id]), (
+                'Проверьте, что кеш произведения очищается только после '
+                'фиксации транзакции.'
+            )
+            transaction.set_rollback(True)
+        assert self.get_title(client, title_id)['name'] == titles[0]['name']
+        assert title_render_cache.get_many([title_id]), (
+            'Проверьте, что откат транзакции не очищает кеш произведения.'
+        )
+
+        with transaction.atomic():
+            title.name = 'Новое название'
+            title.save()
+        assert self.get_title(client, title_id)['name'] == 'Новое название'
+
+    def test_04_bulk_updates_invalidate(self, client, admin_client, user):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        # bulk_create skips the signals maintaining the rating totals.
+        Review.objects.bulk_create(
+            [Review(title_id=title_id, author=user, text='Текст', score=9)]
+        )
+        self.get_title(client, title_id)
+
+        call_command('recalculate_ratings', stdout=StringIO())
+        assert self.get_title(client, title_id)['rating'] == 9, (
+            'Проверьте, что `recalculate_ratings` очищает кеш исправленных '
+            'произведений.'
+        )
+
+        Title.objects.filter(pk=title_id).update(weighted_rating=5)
+        self.get_title(client, title_id)
+        call_command('rank_titles', stdout=StringIO())
+        assert not title_render_cache.get_many([title_id]), (
+            'Проверьте, что `rank_titles` очищает кеш обновлённых '
+            'произведений.'
+        )
@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def get_token_client(client, user):
+    response = client.post('/api/v1/auth/token/', data={
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    })
+    assert response.status_code == HTTPStatus.OK
+    token_client = APIClient()
+    token_client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}'
+    )
+    return token_client
+
+
+def count_user_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return sum(
+        'users_user' in query['sql'] for query in context.captured_queries
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11StatelessAuth:
+
+    TITLES_URL = '/api/v1/titles/'
+    USERS_URL = '/api/v1/users/'
+    CATEGORY_URL = '/api/v1/categories/'
+
+    def test_01_authenticated_read_skips_user_lookup(self, client, user):
+        user_client = get_token_client(client, user)
+        count_user_queries(user_client, self.TITLES_URL)
+
+        assert count_user_queries(user_client, self.TITLES_URL) == 0, (
+            'Проверьте, что при повторном GET-запросе с токеном, выданным '
+            '`/api/v1/auth/token/`, пользователь не загружается из базы.'
+        )
+
+    def test_02_role_change_revokes_claims(self, client, admin,
+                                           user_superuser_client):
+        admin_client = get_token_client(client, admin)
+        response = admin_client.post(
+            self.CATEGORY_URL, data={'name': 'Фильм', 'slug': 'films'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+        user_superuser_client.patch(
+            f'{self.USERS_URL}{admin.username}/', data={'role': 'user'}
+        )
+        response = admin_client.post(
+            self.CATEGORY_URL, data={'name': 'Книги', 'slug': 'books'}
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что после смены роли пользователя права из старого '
+            'токена больше не действуют.'
+        )
+
+    def test_03_me_with_stateless_user(self, client, user):
+        user_client = get_token_client(client, user)
+
+        response = user_client.get(f'{self.USERS_URL}me/')
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == user.email
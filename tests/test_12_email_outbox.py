@@ -0,0 +1,84 @@
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.core import mail
+
+from users.models import OutgoingEmail
+from users.outbox import send_pending
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_queues_email(self, client, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'worker'
+        outbox_before_count = len(mail.outbox)
+        data = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+
+        response = client.post(self.URL_SIGNUP, data=data)
+
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что при доставке через воркер письмо не '
+            'отправляется во время запроса к `/api/v1/auth/signup/`.'
+        )
+        assert OutgoingEmail.objects.filter(
+            recipient=data['email'], sent_at__isnull=True
+        ).exists()
+
+        assert send_pending() == (1, 0)
+        assert len(mail.outbox) == outbox_before_count + 1
+        assert mail.outbox[-1].to == [data['email']]
+        assert send_pending() == (0, 0)
+
+    def test_02_failed_email_is_retried(self, settings):
+        settings.EMAIL_OUTBOX_DELIVERY = 'worker'
+        email = OutgoingEmail.objects.create(
+            recipient='retry@yamdb.fake', subject='Subject', body='Body'
+        )
+
+        with mock.patch(
+            'users.outbox.EmailMessage.send', side_effect=OSError('down')
+        ):
+            assert send_pending() == (0, 1)
+
+        email.refresh_from_db()
+        assert email.attempts == 1
+        assert email.last_error == 'down'
+        assert email.sent_at is None
+        assert send_pending() == (0, 0), (
+            'Проверьте, что повторная отправка письма откладывается.'
+        )
+
+    def test_03_connection_failure(self, client):
+        data = {'email': 'offline@yamdb.fake', 'username': 'offline'}
+
+        with mock.patch(
+            'django.core.mail.backends.locmem.EmailBackend.open',
+            side_effect=OSError('refused'),
+        ):
+            response = client.post(self.URL_SIGNUP, data=data)
+
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что сбой почтового сервера не ломает запрос к '
+            '`/api/v1/auth/signup/`.'
+        )
+        email = OutgoingEmail.objects.get(recipient=data['email'])
+        assert email.attempts == 1, (
+            'Проверьте, что письмо, для которого не удалось открыть '
+            'соединение, считается неудачной попыткой отправки.'
+        )
+        assert email.last_error == 'refused'
+        assert email.sent_at is None
+
+        with mock.patch(
+            'users.outbox.claim_pending', side_effect=OSError('locked')
+        ):
+            response = client.post(
+                self.URL_SIGNUP,
+                data={'email': 'locked@yamdb.fake', 'username': 'locked'},
+            )
+        assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,37 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13Metrics:
+
+    METRICS_URL = '/api/v1/metrics/'
+
+    def test_01_metrics_not_auth(self, client):
+        response = client.get(self.METRICS_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что GET-запрос неавторизованного пользователя к '
+            f'`{self.METRICS_URL}` возвращает ответ со статусом 401.'
+        )
+
+    def test_02_metrics_per_route(self, client, admin_client):
+        client.get('/api/v1/titles/')
+
+        response = admin_client.get(self.METRICS_URL)
+
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain')
+        body = response.content.decode()
+        for line in (
+            'http_requests_total{route="TitleViewSet.list",method="GET",'
+            'status="200"}',
+            'http_request_duration_seconds_count'
+            '{route="TitleViewSet.list"}',
+            'db_queries_total{route="TitleViewSet.list"}',
+            'db_query_duration_seconds_total{route="TitleViewSet.list"}',
+        ):
+            assert line in body, (
+                f'Проверьте, что `{self.METRICS_URL}` содержит метрику '
+                f'`{line}`.'
+            )
@@ -0,0 +1,171 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.models import Title
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleBulk:
+
+    TITLES_BULK_URL = '/api/v1/titles/bulk/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def get_payload(self, admin_client, count):
+        categories = create_categories(admin_client)
+        genres = create_genre(admin_client)
+        return [
+            {
+                'name': f'Произведение {number}',
+                'year': 1900 + number,
+                'genre': [genres[0]['slug'], genres[number % 2 + 1]['slug']],
+                'category': categories[number % 2]['slug'],
+                'description': 'Описание',
+            }
+            for number in range(count)
+        ]
+
+    def test_01_bulk_create(self, client, admin_client):
+        payload = self.get_payload(admin_client, 50)
+
+        response = admin_client.post(
+            self.TITLES_BULK_URL, data=payload, format='json'
+        )
+
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что POST-запрос администратора со списком '
+            f'произведений к `{self.TITLES_BULK_URL}` возвращает ответ со '
+            'статусом 201.'
+        )
+        data = response.json()
+        assert Title.objects.count() == len(payload) == len(data), (
+            f'Проверьте, что POST-запрос к `{self.TITLES_BULK_URL}` создаёт '
+            'все переданные произведения и возвращает их в ответе.'
+        )
+        for item, title in zip(payload, data):
+            detail = client.get(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title['id'])
+            ).json()
+            assert detail == title, (
+                f'Проверьте, что ответ `{self.TITLES_BULK_URL}` содержит '
+                'id созданных произведений.'
+            )
+            assert detail['name'] == item['name']
+            assert sorted(genre['slug'] for genre in detail['genre']) == (
+                sorted(item['genre'])
+            ), (
+                f'Проверьте, что POST-запрос к `{self.TITLES_BULK_URL}` '
+                'сохраняет жанры каждого произведения.'
+            )
+            assert detail['category']['slug'] == item['category']
+
+    def test_02_bulk_errors_per_item(self, admin_client):
+        payload = self.get_payload(admin_client, 3)
+        payload[1]['category'] = 'unknown'
+        del payload[2]['name']
+
+        response = admin_client.post(
+            self.TITLES_BULK_URL, data=payload, format='json'
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что POST-запрос к `{self.TITLES_BULK_URL}` с '
+            'некорректными данными возвращает ответ со статусом 400.'
+        )
+        errors = response.json()
+        assert len(errors) == len(payload), (
+            'Проверьте, что ошибки валидации возвращаются списком, по '
+            'одному элементу на каждое переданное произведение.'
+        )
+        assert errors[0] == {}
+        assert 'category' in errors[1]
+        assert 'name' in errors[2]
+        assert not Title.objects.exists(), (
+            'Проверьте, что при ошибке валидации ни одно произведение не '
+            'создаётся.'
+        )
+
+    def test_03_bulk_permissions(self, user_client, admin_client):
+        payload = self.get_payload(admin_client, 1)
+
+        response = APIClient().post(
+            self.TITLES_BULK_URL, data=payload, format='json'
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        response = user_client.post(
+            self.TITLES_BULK_URL, data=payload, format='json'
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что POST-запрос к `{self.TITLES_BULK_URL}` '
+            'доступен только администратору.'
+        )
+        assert not Title.objects.exists()
+
+    def test_04_concurrent_inserts(self, client, admin_client, monkeypatch):
+        payload = self.get_payload(admin_client, 5)
+        intruders = []
+        # Only databases without bulk insert ids or SQLite's write lock
+        # insert titles one by one.
+        monkeypatch.setattr(connections['default'], 'vendor', 'other')
+
+        def insert_between(execute, sql, params, many, context):
+            result = execute(sql, params, many, context)
+            is_title_insert = sql.startswith('INSERT INTO "reviews_title" ')
+            if is_title_insert and not intruders:
+                # Another writer takes the next id, bypassing this wrapper.
+                cursor = context['connection'].connection.execute(
+                    "INSERT INTO reviews_title "
+                    "(name, year, description, rating_sum, rating_count) "
+                    "VALUES ('Чужое произведение', 2000, '', 0, 0)"
+                )
+                intruders.append(cursor.lastrowid)
+            return result
+
+        with connection.execute_wrapper(insert_between):
+            response = admin_client.post(
+                self.TITLES_BULK_URL, data=payload, format='json'
+            )
+
+        assert response.status_code == HTTPStatus.CREATED
+        assert intruders
+        data = response.json()
+        assert intruders[0] not in {title['id'] for title in data}
+        for item, title in zip(payload, data):
+            detail = client.get(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title['id'])
+            ).json()
+            assert detail['name'] == item['name'], (
+                f'Проверьте, что `{self.TITLES_BULK_URL}` возвращает id, '
+                'полученные созданными произведениями, даже если между '
+                'ними вставлены другие строки.'
+            )
+            assert sorted(genre['slug'] for genre in detail['genre']) == (
+                sorted(item['genre'])
+            )
+
+    def test_05_bulk_query_count(self, admin_client):
+        payload = self.get_payload(admin_client, 50)
+        # The first request fills the genre and category slug caches.
+        admin_client.post(
+            self.TITLES_BULK_URL, data=payload[:1], format='json'
+        )
+        Title.objects.all().delete()
+        query_counts = []
+        for count in (5, 50):
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post(
+                    self.TITLES_BULK_URL, data=payload[:count], format='json'
+                )
+            assert response.status_code == HTTPStatus.CREATED
+            query_counts.append(len(context.captured_queries))
+            Title.objects.all().delete()
+
+        assert query_counts[0] == query_counts[1], (
+            f'Проверьте, что POST-запрос к `{self.TITLES_BULK_URL}` '
+            'создаёт произведения массово и число запросов не зависит от '
+            f'их количества. Сейчас выполнено {query_counts} запросов.'
+        )
@@ -0,0 +1,53 @@
+import datetime
+from collections import OrderedDict
+from decimal import Decimal
+from io import BytesIO
+
+import pytest
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+
+
+class Test15ORJSON:
+
+    DATA = OrderedDict(
+        (
+            ('id', 1),
+            ('name', 'Произведение\u2028\u2029'),
+            ('created', timezone.now()),
+            ('naive', datetime.datetime(2024, 1, 2, 3, 4, 5, 678901)),
+            ('date', datetime.date(2024, 1, 2)),
+            ('time', datetime.time(3, 4, 5, 678901)),
+            ('price', Decimal('1.50')),
+            ('keys', {1: 'one'}),
+            ('empty', None),
+            ('items', [OrderedDict((('slug', 'x'),))]),
+        )
+    )
+
+    def test_01_render_matches_json_renderer(self):
+        assert ORJSONRenderer().render(self.DATA) == (
+            JSONRenderer().render(self.DATA)
+        ), (
+            'Проверьте, что `ORJSONRenderer` выдаёт тот же JSON, что и '
+            '`JSONRenderer` из DRF.'
+        )
+        assert ORJSONRenderer().render(None) == b''
+
+    def test_02_render_indent(self):
+        assert ORJSONRenderer().render(
+            self.DATA, 'application/json; indent=4'
+        ) == JSONRenderer().render(self.DATA, 'application/json; indent=4')
+
+    def test_03_parse(self):
+        content = JSONRenderer().render({'name': 'Произведение', 'year': 1})
+        assert ORJSONParser().parse(BytesIO(content)) == {
+            'name': 'Произведение',
+            'year': 1,
+        }
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(BytesIO(b'{"name": NaN}'))
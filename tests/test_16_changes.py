@@ -0,0 +1,128 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import (
+    create_categories,
+    create_genre,
+    create_single_review,
+    create_titles,
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16Changes:
+
+    CHANGES_URL = '/api/v1/changes/'
+
+    def get_changes(self, client, since=0, **params):
+        response = client.get(self.CHANGES_URL, {'since': since, **params})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.CHANGES_URL}` возвращает '
+            'ответ со статусом 200.'
+        )
+        return response.json()
+
+    def test_01_changes_since_cursor(self, client, admin_client, user_client):
+        titles, _, genres = create_titles(admin_client)
+        data = self.get_changes(client)
+        created = {
+            (event['entity'], event['key'].get('slug', event['key']['id']))
+            for event in data['results']
+            if event['action'] == 'created'
+        }
+        assert {('title', title['id']) for title in titles} <= created, (
+            f'Проверьте, что `{self.CHANGES_URL}` содержит события о '
+            'создании произведений.'
+        )
+        assert {('genre', genre['slug']) for genre in genres} <= created, (
+            f'Проверьте, что `{self.CHANGES_URL}` содержит события о '
+            'создании жанров.'
+        )
+        cursor = data['cursor']
+
+        title_id = titles[0]['id']
+        review = create_single_review(user_client, title_id, 'Текст', 5)
+        data = self.get_changes(client, cursor)
+        assert {
+            (event['entity'], event['action'])
+            for event in data['results']
+        } == {('review', 'created'), ('title', 'updated')}, (
+            f'Проверьте, что `{self.CHANGES_URL}?since=<cursor>` возвращает '
+            'только события, произошедшие после курсора.'
+        )
+        review_event = next(
+            event for event in data['results'] if event['entity'] == 'review'
+        )
+        assert review_event['key'] == {
+            'title_id': title_id,
+            'id': review.json()['id'],
+        }
+        cursor = data['cursor']
+
+        admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        data = self.get_changes(client, cursor)
+        assert ('genre', 'deleted') in {
+            (event['entity'], event['action'])
+            for event in data['results']
+        }, (
+            f'Проверьте, что `{self.CHANGES_URL}` содержит события об '
+            'удалении объектов.'
+        )
+        assert self.get_changes(client, data['cursor']) == {
+            'cursor': data['cursor'],
+            'has_more': False,
+            'next': (
+                f'http://testserver{self.CHANGES_URL}'
+                f'?since={data["cursor"]}'
+            ),
+            'results': [],
+        }
+
+    def test_02_changes_limit(self, client, admin_client):
+        create_titles(admin_client)
+        events = self.get_changes(client)['results']
+
+        data = self.get_changes(client, limit=2)
+        assert data['results'] == events[:2]
+        assert data['has_more'] is True
+        assert data['cursor'] == events[1]['id']
+        assert self.get_changes(client, data['cursor'])['results'] == (
+            events[2:]
+        ), (
+            f'Проверьте, что `{self.CHANGES_URL}` можно читать частями, '
+            'передавая курсор из предыдущего ответа.'
+        )
+
+        response = client.get(self.CHANGES_URL, {'since': 'abc'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_bulk_titles_logged(self, client, admin_client):
+        categories = create_categories(admin_client)
+        genres = create_genre(admin_client)
+        cursor = self.get_changes(client)['cursor']
+        response = admin_client.post(
+            '/api/v1/titles/bulk/',
+            data=[
+                {
+                    'name': f'Произведение {number}',
+                    'year': 2000,
+                    'genre': [genres[0]['slug']],
+                    'category': categories[0]['slug'],
+                }
+                for number in range(3)
+            ],
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+        events = self.get_changes(client, cursor)['results']
+        assert [
+            (event['entity'], event['action'], event['key']['id'])
+            for event in events
+        ] == [
+            ('title', 'created', title['id']) for title in response.json()
+        ], (
+            'Проверьте, что массовое создание произведений записывает '
+            'события об их создании.'
+        )
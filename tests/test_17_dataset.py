@@ -0,0 +1,97 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import F
+
+from reviews.models import Comment, Review, Title
+from users.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17Dataset:
+
+    def test_01_generate_dataset(self):
+        call_command(
+            'generate_dataset',
+            titles=20,
+            reviews=100,
+            comments=150,
+            batch_size=30,
+            stdout=StringIO(),
+        )
+
+        assert Title.objects.count() == 20
+        assert Review.objects.count() == 100
+        assert Comment.objects.count() == 150
+        assert not Comment.objects.exclude(
+            title_id=F('review__title_id')
+        ).exists(), (
+            'Проверьте, что комментарии относятся к произведению своего '
+            'отзыва.'
+        )
+        for title in Title.objects.all():
+            scores = list(title.reviews.values_list('score', flat=True))
+            assert title.rating_count == len(scores) == 5, (
+                'Проверьте, что `generate_dataset` пересчитывает рейтинги '
+                'созданных произведений.'
+            )
+            assert title.rating_sum == sum(scores)
+
+    def test_02_benchmark_endpoints(self, tmp_path):
+        call_command(
+            'generate_dataset',
+            titles=5,
+            reviews=10,
+            comments=10,
+            stdout=StringIO(),
+        )
+        users = User.objects.count()
+        output = tmp_path / 'benchmark.json'
+
+        call_command(
+            'benchmark_endpoints',
+            requests=3,
+            warmup=0,
+            output=str(output),
+            stdout=StringIO(),
+        )
+
+        report = json.loads(output.read_text())
+        assert report['rows']['review'] == 10
+        for route in (
+            'TitleViewSet.list',
+            'TitleViewSet.list?facets=',
+            'TitleViewSet.create',
+            'TitleViewSet.bulk',
+            'ReviewViewSet.create',
+            'ReviewViewSet.partial_update',
+            'CommentViewSet.destroy',
+            'GenreViewSet.leaderboard',
+            'UserViewSet.me',
+            'signup',
+            'get_jwt_token',
+            'check_availability',
+        ):
+            assert route in report['routes'], (
+                f'Проверьте, что `benchmark_endpoints` измеряет маршрут '
+                f'{route}.'
+            )
+        for route, result in report['routes'].items():
+            assert result['errors'] == 0, (
+                f'Проверьте, что маршрут {route} отвечает без ошибок.'
+            )
+            assert result['p50_ms'] <= result['p95_ms'] <= result['p99_ms']
+            if route != 'check_availability':
+                # The Bloom filter answers unseen names without queries.
+                assert result['queries'] >= 1
+        assert (
+            Title.objects.count(),
+            Review.objects.count(),
+            Comment.objects.count(),
+            User.objects.count(),
+        ) == (5, 10, 10, users), (
+            'Проверьте, что `benchmark_endpoints` откатывает изменения, '
+            'сделанные запросами на запись.'
+        )
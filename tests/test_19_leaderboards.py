@@ -0,0 +1,85 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Genre, Review, Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Leaderboards:
+
+    LEADERBOARD_URL_TEMPLATE = '/api/v1/{scopes}/{slug}/leaderboard/'
+
+    def get_leaderboard(self, client, scopes, slug):
+        url = self.LEADERBOARD_URL_TEMPLATE.format(scopes=scopes, slug=slug)
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return [
+            (entry['position'], entry['title']['id'])
+            for entry in response.json()
+        ]
+
+    def review(self, django_user_model, title_id, score):
+        number = Review.objects.count()
+        author = django_user_model.objects.create(
+            username=f'reviewer{number}', email=f'reviewer{number}@yamdb.fake'
+        )
+        Review.objects.create(
+            title_id=title_id, author=author, text='Текст', score=score
+        )
+
+    def test_01_leaderboards(self, client, admin_client, django_user_model):
+        titles, categories, genres = create_titles(admin_client)
+        category, genre = categories[0]['slug'], genres[0]['slug']
+        title_id = titles[0]['id']
+        assert self.get_leaderboard(client, 'categories', category) == []
+
+        self.review(django_user_model, title_id, 8)
+        assert self.get_leaderboard(client, 'categories', category) == [
+            (1, title_id)
+        ], (
+            'Проверьте, что после добавления отзыва произведение попадает '
+            'в рейтинг своей категории без пересчёта всех рейтингов.'
+        )
+        assert self.get_leaderboard(client, 'genres', genre) == [
+            (1, title_id)
+        ], (
+            'Проверьте, что после добавления отзыва произведение попадает '
+            'в рейтинг своих жанров.'
+        )
+
+        better = Title.objects.create(
+            name='Лучшее',
+            year=2000,
+            category=Category.objects.get(slug=category),
+        )
+        better.genre.add(Genre.objects.get(slug=genre))
+        self.review(django_user_model, better.pk, 10)
+        expected = [(1, better.pk), (2, title_id)]
+        assert self.get_leaderboard(client, 'categories', category) == (
+            expected
+        )
+        assert self.get_leaderboard(client, 'genres', genre) == expected
+
+        call_command('rank_titles', stdout=StringIO())
+        assert self.get_leaderboard(client, 'categories', category) == (
+            expected
+        ), (
+            'Проверьте, что `rank_titles` пересобирает рейтинги категорий.'
+        )
+        assert self.get_leaderboard(
+            client, 'genres', genres[2]['slug']
+        ) == [], 'В рейтинг не должны попадать произведения без отзывов.'
+
+        response = client.get(
+            self.LEADERBOARD_URL_TEMPLATE.format(
+                scopes='genres', slug='unknown'
+            )
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,118 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Facets:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_facet_counts(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+
+        response = client.get(
+            self.TITLES_URL, {'facets': 'genre,category,year'}
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['count'] == len(titles)
+        assert data['facets'] == {
+            'genre': [
+                {'name': genre['name'], 'slug': genre['slug'], 'count': 1}
+                for genre in sorted(genres, key=lambda genre: genre['slug'])
+            ],
+            'category': [
+                {
+                    'name': category['name'],
+                    'slug': category['slug'],
+                    'count': 1,
+                }
+                for category in sorted(
+                    categories, key=lambda category: category['slug']
+                )
+            ],
+            'year': [{'year': 1988, 'count': 1}, {'year': 1984, 'count': 1}],
+        }, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}?facets=...` '
+            'возвращает количество произведений для каждого значения фасета.'
+        )
+
+    def test_02_facets_follow_filters(self, client, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        genre = genres[0]['slug']
+
+        with CaptureQueriesContext(connection) as all_facets:
+            response = client.get(
+                self.TITLES_URL,
+                {'genre': genre, 'facets': 'genre,category,year'},
+            )
+        with CaptureQueriesContext(connection) as no_facets:
+            client.get(self.TITLES_URL, {'genre': genre})
+
+        facets = response.json()['facets']
+        assert facets['category'] == [
+            {
+                'name': categories[0]['name'],
+                'slug': categories[0]['slug'],
+                'count': 1,
+            }
+        ], (
+            'Проверьте, что количество по фасетам считается с учётом '
+            'фильтров запроса.'
+        )
+        assert {item['slug'] for item in facets['genre']} == {
+            genres[0]['slug'],
+            genres[1]['slug'],
+        }
+        assert len(all_facets) == len(no_facets) + 3, (
+            'Проверьте, что каждый фасет считается одним групповым '
+            'запросом.'
+        )
+
+    def test_03_facets_follow_search(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        title = next(
+            title for title in titles if title['name'] == 'Терминатор'
+        )
+        category = next(
+            category for category in categories
+            if category['slug'] == title['category']
+        )
+
+        with CaptureQueriesContext(connection) as all_facets:
+            response = client.get(
+                self.TITLES_URL,
+                {'search': 'Терм', 'facets': 'genre,category,year'},
+            )
+        with CaptureQueriesContext(connection) as no_facets:
+            client.get(self.TITLES_URL, {'search': 'Терм'})
+
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с `?search=` '
+            'и `?facets=` возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert [item['id'] for item in data['results']] == [title['id']]
+        assert data['facets'] == {
+            'genre': [
+                {'name': genre['name'], 'slug': genre['slug'], 'count': 1}
+                for genre in sorted(genres, key=lambda genre: genre['slug'])
+                if genre['slug'] in title['genre']
+            ],
+            'category': [{**category, 'count': 1}],
+            'year': [{'year': title['year'], 'count': 1}],
+        }, (
+            'Проверьте, что количество по фасетам считается только по '
+            'найденным произведениям.'
+        )
+        assert len(all_facets) == len(no_facets) + 3
+
+    def test_04_unknown_facet(self, client):
+        response = client.get(self.TITLES_URL, {'facets': 'author'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
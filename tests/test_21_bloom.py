@@ -0,0 +1,162 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from users.bloom import BloomFilter, user_bloom_filter
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000)
+    added = [f'user{idx}' for idx in range(1000)]
+    for value in added:
+        bloom.add(value)
+
+    assert all(value in bloom for value in added), (
+        'Проверьте, что фильтр Блума содержит все добавленные значения.'
+    )
+    false_positives = sum(f'other{idx}' in bloom for idx in range(10000))
+    assert false_positives < 300, (
+        'Проверьте, что доля ложноположительных ответов фильтра Блума '
+        'близка к заданной.'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21UsernameAvailability:
+
+    URL_CHECK = '/api/v1/auth/check/'
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    @staticmethod
+    def get_user_lookups(context):
+        return [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "users_user"' in query['sql']
+        ]
+
+    def test_01_check(self, client, user):
+        response = client.get(
+            self.URL_CHECK,
+            {'username': user.username, 'email': 'free@yamdb.fake'},
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.URL_CHECK}` возвращает '
+            'ответ со статусом 200.'
+        )
+        assert response.json() == {'username': False, 'email': True}
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                self.URL_CHECK,
+                {'username': 'free_name', 'email': 'free@yamdb.fake'},
+            )
+        assert response.json() == {'username': True, 'email': True}
+        assert not self.get_user_lookups(context), (
+            f'Проверьте, что GET-запрос к `{self.URL_CHECK}` не обращается '
+            'к базе данных для новых username и email.'
+        )
+
+        response = client.get(self.URL_CHECK, {'email': user.email})
+        assert response.json() == {'email': False}
+
+        for params in ({}, {'username': 'me'}, {'email': 'invalid'}):
+            response = client.get(self.URL_CHECK, params)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что GET-запрос к `{self.URL_CHECK}` без данных '
+                'или с некорректными данными возвращает ответ со статусом '
+                '400.'
+            )
+
+    def test_02_signup_skips_lookup_for_new_names(
+        self, client, django_user_model
+    ):
+        user_bloom_filter.get_filter()
+        data = {'username': 'new_user', 'email': 'new_user@yamdb.fake'}
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.URL_SIGNUP, data=data)
+
+        assert response.status_code == HTTPStatus.OK
+        assert django_user_model.objects.filter(**data).exists()
+        assert not self.get_user_lookups(context), (
+            f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` не ищет '
+            'пользователя в базе данных, если username и email новые.'
+        )
+
+        response = client.get(self.URL_CHECK, data)
+        assert response.json() == {'username': False, 'email': False}, (
+            'Проверьте, что зарегистрированный пользователь сразу '
+            'добавляется в фильтр Блума.'
+        )
+
+    def test_03_stale_filter_keeps_constraints(
+        self, client, django_user_model
+    ):
+        user_bloom_filter.get_filter()
+        # Bulk inserts send no signals, like a signup in another process.
+        django_user_model.objects.bulk_create(
+            [django_user_model(username='racer', email='racer@yamdb.fake')]
+        )
+
+        response = client.post(
+            self.URL_SIGNUP,
+            data={'username': 'racer', 'email': 'other@yamdb.fake'},
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` с уже занятым '
+            'username возвращает ответ со статусом 400, даже если фильтр '
+            'Блума ещё не перестроен.'
+        )
+        assert 'username' in response.json()
+
+        response = client.post(
+            self.URL_SIGNUP,
+            data={'username': 'racer', 'email': 'racer@yamdb.fake'},
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_04_background_rebuild(self, client, django_user_model, settings):
+        user_bloom_filter.get_filter()
+        django_user_model.objects.bulk_create(
+            [django_user_model(username='outsider', email='out@yamdb.fake')]
+        )
+        settings.USERS_BLOOM_FILTER_TTL = -1
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.URL_CHECK, {'username': 'outsider'})
+        assert response.json() == {'username': True}
+        assert not self.get_user_lookups(context), (
+            f'Проверьте, что GET-запрос к `{self.URL_CHECK}` не перестраивает '
+            'устаревший фильтр Блума сам, а отвечает по старому.'
+        )
+
+        user_bloom_filter._rebuild.result(timeout=10)
+        settings.USERS_BLOOM_FILTER_TTL = 300
+        response = client.get(self.URL_CHECK, {'username': 'outsider'})
+        assert response.json() == {'username': False}, (
+            'Проверьте, что устаревший фильтр Блума перестраивается в '
+            'фоне.'
+        )
+
+    def test_05_users_saved_during_build(self, monkeypatch, django_user_model):
+        read_users = type(user_bloom_filter).read_users
+
+        def read_then_signup(bloom_filter):
+            bloom = read_users(bloom_filter)
+            django_user_model.objects.create(
+                username='late', email='late@yamdb.fake'
+            )
+            return bloom
+
+        monkeypatch.setattr(
+            type(user_bloom_filter), 'read_users', read_then_signup
+        )
+        bloom = user_bloom_filter.get_filter()
+
+        assert 'username:late' in bloom, (
+            'Проверьте, что пользователи, сохранённые во время построения '
+            'фильтра Блума, попадают в него.'
+        )
@@ -0,0 +1,154 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22RatingTotals:
+
+    @pytest.fixture
+    def titles(self):
+        return (
+            Title.objects.create(name='Первое', year=2000),
+            Title.objects.create(name='Второе', year=2000),
+        )
+
+    @pytest.fixture
+    def authors(self, django_user_model):
+        return [
+            django_user_model.objects.create(
+                username=f'reviewer{number}',
+                email=f'reviewer{number}@yamdb.fake',
+            )
+            for number in range(3)
+        ]
+
+    @staticmethod
+    def get_totals(title):
+        title.refresh_from_db()
+        return title.rating_sum, title.rating_count
+
+    def test_01_create_edit_delete(self, titles, authors):
+        title = titles[0]
+        review = Review.objects.create(
+            title=title, author=authors[0], text='Текст', score=7
+        )
+        Review.objects.create(
+            title=title, author=authors[1], text='Текст', score=4
+        )
+        assert self.get_totals(title) == (11, 2), (
+            'Проверьте, что при создании отзыва его оценка добавляется к '
+            'сумме и количеству оценок произведения.'
+        )
+
+        review.score = 9
+        review.save()
+        assert self.get_totals(title) == (13, 2), (
+            'Проверьте, что при изменении оценки сумма оценок произведения '
+            'меняется на разницу оценок.'
+        )
+
+        review = Review.objects.get(pk=review.pk)
+        review.score = 2
+        review.save()
+        assert self.get_totals(title) == (6, 2)
+
+        review.delete()
+        assert self.get_totals(title) == (4, 1), (
+            'Проверьте, что при удалении отзыва его оценка вычитается из '
+            'оценок произведения.'
+        )
+
+    def test_02_move_review_to_another_title(self, titles, authors):
+        review = Review.objects.create(
+            title=titles[0], author=authors[0], text='Текст', score=6
+        )
+
+        review.title = titles[1]
+        review.save()
+
+        assert self.get_totals(titles[0]) == (0, 0)
+        assert self.get_totals(titles[1]) == (6, 1), (
+            'Проверьте, что при переносе отзыва к другому произведению его '
+            'оценка переходит вместе с ним.'
+        )
+
+    def test_03_null_score(self, titles, authors):
+        title = titles[0]
+        Review.objects.create(
+            title=title, author=authors[0], text='Текст', score=8
+        )
+        review = Review.objects.create(
+            title=title, author=authors[1], text='Текст', score=None
+        )
+        assert self.get_totals(title) == (8, 1), (
+            'Проверьте, что отзыв без оценки не учитывается в рейтинге '
+            'произведения.'
+        )
+        assert title.rating == 8
+
+        review.score = 4
+        review.save()
+        assert self.get_totals(title) == (12, 2)
+
+        review.score = None
+        review.save()
+        assert self.get_totals(title) == (8, 1)
+
+        review.delete()
+        assert self.get_totals(title) == (8, 1)
+
+    def test_04_cascade_delete(self, titles, authors):
+        for title in titles:
+            for number, author in enumerate(authors):
+                Review.objects.create(
+                    title=title, author=author, text='Текст', score=number + 1
+                )
+        assert self.get_totals(titles[0]) == (6, 3)
+
+        authors[2].delete()
+
+        for title in titles:
+            assert self.get_totals(title) == (3, 2), (
+                'Проверьте, что при каскадном удалении отзывов вместе с '
+                'автором их оценки вычитаются из рейтинга произведений.'
+            )
+
+        titles[1].delete()
+        assert self.get_totals(titles[0]) == (3, 2)
+
+    def test_05_recalculate_ratings(self, titles, authors):
+        for number, author in enumerate(authors):
+            Review.objects.create(
+                title=titles[0], author=author, text='Текст', score=number + 5
+            )
+        Title.objects.filter(pk=titles[0].pk).update(
+            rating_sum=100, rating_count=1
+        )
+        Title.objects.filter(pk=titles[1].pk).update(
+            rating_sum=3, rating_count=1
+        )
+
+        output = StringIO()
+        call_command('recalculate_ratings', dry_run=True, stdout=output)
+        assert '2 title(s) drifted' in output.getvalue()
+        assert self.get_totals(titles[0]) == (100, 1), (
+            'Проверьте, что `recalculate_ratings --dry-run` не исправляет '
+            'рейтинги.'
+        )
+
+        output = StringIO()
+        call_command('recalculate_ratings', stdout=output)
+        assert '2 title(s) fixed' in output.getvalue()
+        assert self.get_totals(titles[0]) == (18, 3), (
+            'Проверьте, что `recalculate_ratings` пересчитывает сумму и '
+            'количество оценок по отзывам.'
+        )
+        assert self.get_totals(titles[1]) == (0, 0)
+
+        output = StringIO()
+        call_command('recalculate_ratings', stdout=output)
+        assert 'No rating drift found.' in output.getvalue()
@@ -0,0 +1,175 @@
+import json
+import os
+from io import StringIO
+
+import pandas as pd
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from reviews.management.commands.import_data import Command
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+DATA_DIR = os.path.join(settings.BASE_DIR, 'static/data')
+
+IMPORTED_MODELS = (
+    ('category.csv', Category),
+    ('genre.csv', Genre),
+    ('titles.csv', Title),
+    ('genre_title.csv', Title.genre.through),
+    ('users.csv', User),
+    ('review.csv', Review),
+    ('comments.csv', Comment),
+)
+
+
+def get_rows(model) -> list:
+    """Stored rows of a model, by a key that does not depend on insertion."""
+
+    if model is Title.genre.through:
+        return sorted(model.objects.values_list('title_id', 'genre_id'))
+    return sorted(model.objects.values_list('pk', flat=True))
+
+
+def get_csv_rows(filename):
+    return len(pd.read_csv(os.path.join(DATA_DIR, filename)))
+
+
+def assert_imported():
+    for filename, model in IMPORTED_MODELS:
+        assert model.objects.count() == get_csv_rows(filename), (
+            f'Проверьте, что `import_data` загружает все строки {filename}.'
+        )
+    reviews = pd.read_csv(os.path.join(DATA_DIR, 'review.csv'))
+    totals = reviews.groupby('title_id')['score'].agg(['sum', 'count'])
+    for title in Title.objects.all():
+        expected = (
+            tuple(int(value) for value in totals.loc[title.pk])
+            if title.pk in totals.index
+            else (0, 0)
+        )
+        assert (title.rating_sum, title.rating_count) == expected, (
+            'Проверьте, что после импорта рейтинги произведений '
+            'пересчитываются по загруженным отзывам.'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23ImportData:
+
+    def test_01_bulk_import(self, tmp_path):
+        checkpoint = tmp_path / 'checkpoint.json'
+
+        call_command(
+            'import_data',
+            bulk=True,
+            batch_size=7,
+            checkpoint=str(checkpoint),
+            stdout=StringIO(),
+        )
+
+        assert_imported()
+        assert not checkpoint.exists(), (
+            'Проверьте, что после успешного импорта файл с прогрессом '
+            'удаляется.'
+        )
+
+        call_command(
+            'import_data',
+            bulk=True,
+            checkpoint=str(checkpoint),
+            stdout=StringIO(),
+        )
+        assert_imported()
+
+    def test_02_bulk_import_matches_row_import(self, tmp_path):
+        call_command('import_data', stdout=StringIO())
+        rows = {model: get_rows(model) for _, model in IMPORTED_MODELS}
+        ratings = list(
+            Title.objects.order_by('pk').values_list(
+                'pk', 'rating_sum', 'rating_count'
+            )
+        )
+        for _, model in reversed(IMPORTED_MODELS):
+            model.objects.all().delete()
+
+        call_command(
+            'import_data',
+            bulk=True,
+            checkpoint=str(tmp_path / 'checkpoint.json'),
+            stdout=StringIO(),
+        )
+
+        for _, model in IMPORTED_MODELS:
+            assert get_rows(model) == rows[model], (
+                'Проверьте, что импорт с `--bulk` загружает те же строки, '
+                'что и построчный импорт.'
+            )
+        assert list(
+            Title.objects.order_by('pk').values_list(
+                'pk', 'rating_sum', 'rating_count'
+            )
+        ) == ratings
+
+    def test_03_chunked_import(self, tmp_path):
+        call_command(
+            'import_data',
+            chunk_size=10,
+            batch_size=4,
+            checkpoint=str(tmp_path / 'checkpoint.json'),
+            stdout=StringIO(),
+        )
+
+        assert_imported()
+
+    def test_04_resume_interrupted_import(self, tmp_path, monkeypatch):
+        checkpoint = tmp_path / 'checkpoint.json'
+        build_reviews = Command.build_reviews
+        chunks = []
+
+        def interrupt(command, df):
+            if len(chunks) == 2:
+                raise KeyboardInterrupt
+            chunks.append(len(df))
+            return build_reviews(command, df)
+
+        monkeypatch.setattr(Command, 'build_reviews', interrupt)
+        with pytest.raises(KeyboardInterrupt):
+            call_command(
+                'import_data',
+                chunk_size=20,
+                checkpoint=str(checkpoint),
+                stdout=StringIO(),
+            )
+        monkeypatch.undo()
+
+        assert Review.objects.count() == 40
+        assert not Comment.objects.exists()
+        assert json.loads(checkpoint.read_text())['review.csv'] == 40, (
+            'Проверьте, что `import_data` сохраняет число загруженных строк '
+            'после каждой порции.'
+        )
+
+        output = StringIO()
+        call_command(
+            'import_data',
+            chunk_size=20,
+            resume=True,
+            checkpoint=str(checkpoint),
+            stdout=output,
+        )
+
+        assert_imported()
+        assert 'titles.csv: 0 rows' in output.getvalue(), (
+            'Проверьте, что при `--resume` уже загруженные файлы '
+            'пропускаются.'
+        )
+        assert (
+            f'review.csv: {get_csv_rows("review.csv") - 40} rows'
+            in output.getvalue()
+        ), (
+            'Проверьте, что при `--resume` загрузка продолжается с первой '
+            'незагруженной строки.'
+        )
+        assert not checkpoint.exists()
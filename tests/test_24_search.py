@@ -0,0 +1,107 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Search:
+
+    TITLES_URL = '/api/v1/titles/'
+    GENRES_URL = '/api/v1/genres/'
+
+    def search(self, client, url, terms):
+        response = client.get(url, {'search': terms})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}?search=` возвращает ответ '
+            'со статусом 200.'
+        )
+        return [item['name'] for item in response.json()['results']]
+
+    def test_01_search_results(self, client):
+        for name in ('Драма', 'Комедия', 'Документальное'):
+            Genre.objects.create(name=name, slug=f'genre{len(name)}')
+
+        assert self.search(client, self.GENRES_URL, 'драма') == ['Драма']
+        assert self.search(client, self.GENRES_URL, 'до') == [
+            'Документальное'
+        ], 'Проверьте, что поиск находит слова по началу.'
+        assert self.search(client, self.GENRES_URL, 'рама') == [], (
+            'Поиск по `?search=` ищет начало слов, а не подстроку.'
+        )
+
+        Title.objects.create(name='Война и мир', year=1869)
+        Title.objects.create(name='Мир приключений', year=2000)
+        assert self.search(client, self.TITLES_URL, 'мир войн') == [
+            'Война и мир'
+        ], 'Проверьте, что поиск находит произведения со всеми словами.'
+
+    def test_02_ranking(self, client):
+        Title.objects.create(
+            name='Звезда и много других слов в названии', year=2000
+        )
+        Title.objects.create(name='Звезда звезда', year=2000)
+        Title.objects.create(name='Звезда', year=2000)
+
+        with CaptureQueriesContext(connection) as context:
+            names = self.search(client, self.TITLES_URL, 'звезда')
+
+        assert names == [
+            'Звезда звезда',
+            'Звезда',
+            'Звезда и много других слов в названии',
+        ], (
+            'Проверьте, что результаты поиска отсортированы по '
+            'релевантности.'
+        )
+        page_query = [
+            query['sql'] for query in context.captured_queries
+            if 'bm25' in query['sql']
+        ]
+        assert len(page_query) == 1 and page_query[0].count('MATCH') == 1, (
+            'Проверьте, что выборка и ранжирование выполняются одним '
+            'обращением к полнотекстовому индексу.'
+        )
+
+    def test_03_index_follows_changes(self, client):
+        title = Title.objects.create(name='Старое название', year=2000)
+        assert self.search(client, self.TITLES_URL, 'старое') == [
+            'Старое название'
+        ], 'Проверьте, что новое произведение сразу находится поиском.'
+
+        title.name = 'Новое название'
+        title.save()
+        assert self.search(client, self.TITLES_URL, 'старое') == []
+        assert self.search(client, self.TITLES_URL, 'новое') == [
+            'Новое название'
+        ], 'Проверьте, что поиск учитывает изменение названия.'
+
+        title.delete()
+        assert self.search(client, self.TITLES_URL, 'название') == [], (
+            'Проверьте, что удалённое произведение не находится поиском.'
+        )
+
+    def test_04_rebuild_search_index(self, client):
+        Title.objects.create(name='Потерянный индекс', year=2000)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO reviews_title_fts(reviews_title_fts) "
+                "VALUES ('delete-all')"
+            )
+        assert self.search(client, self.TITLES_URL, 'индекс') == []
+
+        output = StringIO()
+        call_command('rebuild_search_index', stdout=output)
+
+        assert 'reviews_title_fts rebuilt.' in output.getvalue()
+        assert self.search(client, self.TITLES_URL, 'индекс') == [
+            'Потерянный индекс'
+        ], (
+            'Проверьте, что `rebuild_search_index` заново заполняет '
+            'полнотекстовые индексы.'
+        )
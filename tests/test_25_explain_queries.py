@@ -0,0 +1,42 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.management.commands.explain_queries import get_querysets
+from tests.test_08_queries import create_reviews_bulk
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25ExplainQueries:
+
+    def test_01_explain_queries(self):
+        output = StringIO()
+
+        call_command('explain_queries', stdout=output)
+
+        assert 'No full table scans found.' in output.getvalue(), (
+            'Проверьте, что запросы API не сканируют таблицы целиком.'
+        )
+        assert 'CommentViewSet.list?pagination=cursor' in output.getvalue()
+
+    def test_02_querysets_match_requests(self, client, django_user_model):
+        title, review = create_reviews_bulk(django_user_model, 1)
+        querysets = dict(get_querysets())
+        with CaptureQueriesContext(connection) as context:
+            client.get(
+                f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+            )
+        expected = str(
+            querysets['CommentViewSet.list'].query
+        ).split(' WHERE ')[0]
+
+        assert any(
+            query['sql'].startswith(expected)
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что `explain_queries` проверяет те же запросы, '
+            'которые выполняют представления API.'
+        )
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.db import connections
+
+PRAGMAS = settings.DATABASES['default']['OPTIONS']['pragmas']
+
+
+class Test26SqlitePragmas:
+
+    def get_pragma(self, cursor, name):
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+    def test_01_pragmas_applied(self, tmp_path, django_db_blocker):
+        connection = connections['default']
+        settings_dict = {
+            **connection.settings_dict,
+            'NAME': str(tmp_path / 'pragmas.sqlite3'),
+            'OPTIONS': {'pragmas': PRAGMAS},
+        }
+        wrapper = connection.__class__(settings_dict, alias='pragmas')
+        try:
+            with django_db_blocker.unblock(), wrapper.cursor() as cursor:
+                assert self.get_pragma(cursor, 'journal_mode') == 'wal', (
+                    'Проверьте, что новое соединение с базой данных '
+                    'использует журнал WAL из `OPTIONS["pragmas"]`.'
+                )
+                assert self.get_pragma(cursor, 'synchronous') == 1, (
+                    'Проверьте, что новое соединение с базой данных '
+                    'использует `synchronous = NORMAL` из '
+                    '`OPTIONS["pragmas"]`.'
+                )
+                assert self.get_pragma(cursor, 'busy_timeout') == (
+                    PRAGMAS['busy_timeout']
+                )
+                assert self.get_pragma(cursor, 'cache_size') == (
+                    PRAGMAS['cache_size']
+                )
+        finally:
+            wrapper.close()
+
+    def test_02_default_connection_uses_backend(self):
+        connection = connections['default']
+        assert connection.vendor == 'sqlite'
+        assert connection.__class__.__module__ == 'api_yamdb.db.base', (
+            'Проверьте, что `DATABASES["default"]["ENGINE"]` указывает на '
+            'бэкенд `api_yamdb.db`, применяющий `OPTIONS["pragmas"]`.'
+        )
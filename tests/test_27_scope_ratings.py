@@ -0,0 +1,398 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from reviews.leaderboards import (
+    SCOPE_MODELS,
+    get_top_titles,
+    rebuild_leaderboards,
+)
+from reviews.models import (
+    Category,
+    Genre,
+    GenreRating,
+    LeaderboardEntry,
+    Review,
+    Title,
+)
+from reviews.ranking import rank_titles
+from reviews.ratings import recalculate_ratings
+
+
+def get_scope_totals():
+    return {
+        (model._meta.model_name, pk): (rating_sum, rating_count)
+        for model in (Category, Genre)
+        for pk, rating_sum, rating_count in model.objects.values_list(
+            'pk', 'rating_sum', 'rating_count'
+        )
+    }
+
+
+def get_expected_scope_totals():
+    """Scope totals summed from the stored totals of their titles."""
+
+    totals = {key: (0, 0) for key in get_scope_totals()}
+    links = [
+        (('category', category_id), title_id)
+        for title_id, category_id in Title.objects.filter(
+            category__isnull=False
+        ).values_list('pk', 'category_id')
+    ] + [
+        (('genre', genre_id), title_id)
+        for title_id, genre_id in Title.genre.through.objects.values_list(
+            'title_id', 'genre_id'
+        )
+    ]
+    title_totals = {
+        pk: (rating_sum, rating_count)
+        for pk, rating_sum, rating_count in Title.objects.values_list(
+            'pk', 'rating_sum', 'rating_count'
+        )
+    }
+    for scope, title_id in links:
+        scope_sum, scope_count = totals[scope]
+        rating_sum, rating_count = title_totals[title_id]
+        totals[scope] = (scope_sum + rating_sum, scope_count + rating_count)
+    return totals
+
+
+def get_ranking_state():
+    """Everything a full ranking run stores, apart from overall ratings."""
+
+    return (
+        get_scope_totals(),
+        sorted(
+            (pk, round(rating, 9) if rating is not None else None)
+            for pk, rating in Title.objects.values_list(
+                'pk', 'category_weighted_rating'
+            )
+        ),
+        sorted(
+            (title_id, genre_id, round(rating, 9))
+            for title_id, genre_id, rating in GenreRating.objects.values_list(
+                'title_id', 'genre_id', 'weighted_rating'
+            )
+        ),
+        sorted(
+            (category_id or 0, genre_id or 0, position, title_id)
+            for category_id, genre_id, position, title_id in (
+                LeaderboardEntry.objects.values_list(
+                    'category_id', 'genre_id', 'position', 'title_id'
+                )
+            )
+        ),
+    )
+
+
+def assert_scope_totals():
+    assert get_scope_totals() == get_expected_scope_totals(), (
+        'Проверьте, что суммы и количества оценок категорий и жанров '
+        'совпадают с суммами по их произведениям.'
+    )
+
+
+def assert_ranked():
+    """Stored ratings and leaderboards match a full ranking run."""
+
+    state = get_ranking_state()
+    with transaction.atomic():
+        rank_titles()
+        rebuild_leaderboards()
+    assert state == get_ranking_state(), (
+        'Проверьте, что рейтинги категорий и жанров, рейтинги '
+        'произведений в них и таблицы лидеров совпадают с результатом '
+        '`rank_titles`.'
+    )
+
+
+def assert_leaderboards():
+    """Stored leaderboards list the best titles by their stored ratings."""
+
+    for field, model in SCOPE_MODELS.items():
+        for scope_id in model.objects.values_list('pk', flat=True):
+            assert list(
+                LeaderboardEntry.objects.filter(**{field: scope_id})
+                .order_by('position')
+                .values_list('title_id', 'weighted_rating')
+            ) == get_top_titles(field, scope_id), (
+                'Проверьте, что таблицы лидеров совпадают с лучшими '
+                'произведениями по сохранённым рейтингам.'
+            )
+
+
+def get_leaderboard_titles(field, scope):
+    return list(
+        LeaderboardEntry.objects.filter(**{field: scope})
+        .order_by('position')
+        .values_list('title_id', flat=True)
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27ScopeRatings:
+
+    MAX_REVIEW_WRITE_QUERIES = 6
+
+    @pytest.fixture
+    def catalog(self):
+        categories = [
+            Category.objects.create(
+                name=f'Категория {number}', slug=f'c{number}'
+            )
+            for number in range(2)
+        ]
+        genres = [
+            Genre.objects.create(name=f'Жанр {number}', slug=f'g{number}')
+            for number in range(3)
+        ]
+        titles = [
+            Title.objects.create(
+                name=f'Произведение {number}',
+                year=2000,
+                category=categories[number % 2],
+            )
+            for number in range(4)
+        ]
+        for number, title in enumerate(titles):
+            title.genre.set(genres[number % 3:number % 3 + 2])
+        return categories, genres, titles
+
+    @pytest.fixture
+    def authors(self, django_user_model):
+        return [
+            django_user_model.objects.create(
+                username=f'reviewer{number}',
+                email=f'reviewer{number}@yamdb.fake',
+            )
+            for number in range(3)
+        ]
+
+    def review_all(self, titles, authors):
+        for number, title in enumerate(titles):
+            for author in authors:
+                Review.objects.create(
+                    title=title,
+                    author=author,
+                    text='Текст',
+                    score=(number + author.pk) % 10 + 1,
+                )
+
+    def test_01_review_write_is_incremental(self, catalog, authors):
+        categories, genres, titles = catalog
+        title = titles[0]
+
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as context:
+                Review.objects.create(
+                    title=title, author=authors[0], text='Текст', score=8
+                )
+            assert not GenreRating.objects.exists()
+
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if not query['sql'].startswith(('SAVEPOINT', 'RELEASE'))
+        ]
+        assert len(queries) <= self.MAX_REVIEW_WRITE_QUERIES, (
+            'Проверьте, что запись отзыва в своей транзакции только сдвигает '
+            'суммы оценок произведения, его категории и жанров. Сейчас '
+            f'выполнено {len(queries)} запросов.'
+        )
+        assert not any(
+            'reviews_leaderboardentry' in sql or 'reviews_genrerating' in sql
+            for sql in queries
+        ), (
+            'Проверьте, что рейтинги в жанрах и таблицы лидеров '
+            'обновляются после фиксации транзакции отзыва.'
+        )
+        assert_scope_totals()
+        assert get_leaderboard_titles('category', categories[0]) == [
+            title.pk
+        ]
+        assert get_leaderboard_titles('genre', genres[0]) == [title.pk]
+        assert GenreRating.objects.filter(title=title).count() == 2
+
+    def test_02_cascade_deletes(self, catalog, authors):
+        categories, genres, titles = catalog
+        self.review_all(titles, authors)
+        assert_scope_totals()
+
+        authors[0].delete()
+        assert_scope_totals()
+        assert Title.objects.get(pk=titles[0].pk).rating_count == 2
+
+        titles[0].delete()
+        assert_scope_totals()
+        assert titles[0].pk not in get_leaderboard_titles(
+            'genre', genres[0]
+        ), 'Удалённое произведение должно пропасть из таблиц лидеров.'
+        assert get_leaderboard_titles('category', categories[0]) == [
+            title_id for title_id, _ in get_top_titles(
+                'category', categories[0].pk
+            )
+        ]
+
+        categories[1].delete()
+        assert not Title.objects.filter(
+            category=None, category_weighted_rating__isnull=False
+        ).exists(), (
+            'Проверьте, что произведения удалённой категории теряют рейтинг '
+            'в ней.'
+        )
+        assert_scope_totals()
+
+    def test_03_recalculate_and_fallback(self, catalog, authors):
+        categories, genres, titles = catalog
+        # bulk_create skips the signals maintaining the ratings.
+        Review.objects.bulk_create(
+            Review(title=title, author=author, text='Текст', score=7)
+            for title in titles
+            for author in authors
+        )
+
+        call_command('recalculate_ratings', stdout=StringIO())
+        assert_scope_totals()
+        assert_ranked()
+
+        review = Review.objects.only('text').get(
+            title=titles[1], author=authors[0]
+        )
+        review.score = 1
+        review.save()
+        assert Title.objects.get(pk=titles[1].pk).rating_sum == 15
+        assert_scope_totals()
+        assert GenreRating.objects.filter(title=titles[1]).count() == 2
+
+    def test_04_category_and_genre_changes(
+        self, admin_client, catalog, authors
+    ):
+        categories, genres, titles = catalog
+        self.review_all(titles, authors)
+        title = titles[0]
+
+        response = admin_client.patch(
+            f'/api/v1/titles/{title.pk}/',
+            data={'category': categories[1].slug},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert_scope_totals()
+        assert title.pk not in get_leaderboard_titles(
+            'category', categories[0]
+        )
+        assert title.pk in get_leaderboard_titles('category', categories[1])
+
+        title.genre.remove(genres[0], genres[2])
+        assert_scope_totals()
+        assert title.pk not in get_leaderboard_titles('genre', genres[0])
+        assert set(
+            GenreRating.objects.filter(title=title).values_list(
+                'genre', flat=True
+            )
+        ) == {genres[1].pk}
+
+        title.genre.add(genres[2])
+        genres[1].titles.remove(title)
+        assert_scope_totals()
+        genres[2].titles.clear()
+        assert_scope_totals()
+        genres[0].titles.add(*titles)
+        title.genre.clear()
+        assert_scope_totals()
+        assert not GenreRating.objects.filter(title=title).exists()
+
+        Title.objects.only('name').get(pk=title.pk).save()
+        assert_scope_totals()
+
+    def test_05_bulk_loaders(self, monkeypatch):
+        call_command(
+            'generate_dataset',
+            categories=2,
+            genres=4,
+            titles=20,
+            reviews=100,
+            comments=0,
+            stdout=StringIO(),
+        )
+        assert_scope_totals()
+        assert LeaderboardEntry.objects.exists(), (
+            'Проверьте, что `generate_dataset` заполняет таблицы лидеров.'
+        )
+        assert_ranked()
+
+        monkeypatch.setattr(
+            'reviews.leaderboards.RATING_REFRESH_MAX_TITLES', 5
+        )
+        Title.objects.update(rating_sum=0, rating_count=0)
+        Category.objects.update(rating_sum=0, rating_count=0)
+        Genre.objects.update(rating_sum=0, rating_count=0)
+        recalculate_ratings()
+        assert_scope_totals()
+        assert_ranked()
+
+    def test_06_import_data_bulk(self):
+        call_command('import_data', bulk=True, stdout=StringIO())
+
+        assert_scope_totals()
+        assert LeaderboardEntry.objects.exists(), (
+            'Проверьте, что `import_data --bulk` заполняет таблицы лидеров.'
+        )
+        assert_ranked()
+
+    def test_07_leaderboard_moves(self, catalog, authors, monkeypatch):
+        categories, genres, titles = catalog
+        monkeypatch.setattr('reviews.leaderboards.LEADERBOARD_SIZE', 2)
+        self.review_all(titles, authors)
+        assert_leaderboards()
+
+        leader = LeaderboardEntry.objects.get(
+            category=categories[0], position=1
+        ).title_id
+        # The leader only gets better, so no title changes places.
+        review = Review.objects.filter(title=leader).order_by('score')[0]
+        assert review.score < 10
+        review.score = 10
+        with CaptureQueriesContext(connection) as context:
+            review.save()
+        leaderboard_writes = [
+            query['sql'] for query in context.captured_queries
+            if 'reviews_leaderboardentry' in query['sql']
+            and not query['sql'].startswith('SELECT')
+        ]
+        assert all(
+            sql.startswith('UPDATE') for sql in leaderboard_writes
+        ), (
+            'Проверьте, что новый рейтинг произведения обновляет только '
+            'изменившиеся места в таблицах лидеров.'
+        )
+        assert_leaderboards()
+
+        for score in (1, 10, 1):
+            for review in Review.objects.filter(title=titles[1]):
+                review.score = score
+                review.save()
+            assert_leaderboards()
+        Review.objects.filter(title=titles[2]).first().delete()
+        assert_leaderboards()
+
+    def test_08_refresh_failure(self, user_client, catalog, monkeypatch):
+        categories, genres, titles = catalog
+
+        def fail(*args, **kwargs):
+            raise RuntimeError('refresh failed')
+
+        monkeypatch.setattr('reviews.leaderboards.refresh_titles', fail)
+        response = user_client.post(
+            f'/api/v1/titles/{titles[0].pk}/reviews/',
+            data={'text': 'Текст', 'score': 7},
+        )
+
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что сбой обновления таблиц лидеров после фиксации '
+            'не ломает запрос, который записал отзыв.'
+        )
+        assert Title.objects.get(pk=titles[0].pk).rating_sum == 7
+        assert_scope_totals()
@@ -0,0 +1,55 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+SEARCH_TABLES = (
+    'reviews_title',
+    'reviews_genre',
+    'reviews_category',
+    'reviews_review',
+    'reviews_comment',
+)
+
+
+def get_search_triggers():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+        )
+        return {name for name, in cursor.fetchall()}
+
+
+def assert_search_triggers(migration):
+    missing = {
+        f'{table}_fts_{suffix}'
+        for table in SEARCH_TABLES
+        for suffix in ('ai', 'ad', 'au')
+    } - get_search_triggers()
+    assert not missing, (
+        f'Проверьте, что после миграции `{migration}` таблицы, '
+        'пересозданные SQLite, снова обновляют полнотекстовые индексы. '
+        f'Нет триггеров: {sorted(missing)}.'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28SearchMigrations:
+
+    def migrate(self, *args):
+        call_command('migrate', *args, verbosity=0, stdout=StringIO())
+
+    def test_01_triggers_survive_table_remakes(self):
+        assert_search_triggers('0008_leaderboards')
+        try:
+            for migration in (
+                '0007_weighted_ratings',
+                '0006_change_events',
+                '0007_weighted_ratings',
+            ):
+                self.migrate('reviews', migration)
+                assert_search_triggers(migration)
+        finally:
+            self.migrate()
+        assert_search_triggers('0008_leaderboards')